@@ -0,0 +1,12 @@
+"""
+Microbenchmarks for the hot paths that decide our latency.
+
+Each case is timed against in-memory SQLite and compared with the stored
+baseline in baselines.json; a case more than twice as slow (or whatever
+--threshold says) fails the run. Times are stored relative to a fixed
+calibration loop, so a baseline recorded on one machine still means
+something on another.
+
+    uv run python -m benchmarks                     # check against baselines
+    uv run python -m benchmarks --update-baselines  # after an intended change
+"""
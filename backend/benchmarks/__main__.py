@@ -0,0 +1,114 @@
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+from benchmarks.cases import CASES, Case
+
+BASELINES_PATH = Path(__file__).with_name("baselines.json")
+DEFAULT_THRESHOLD = 1.0  # fail a case that got more than twice as slow
+MIN_ROUND_TIME = 0.1  # seconds, per timing round
+ROUNDS = 5
+
+
+def calibrate() -> float:
+    """Seconds taken by a fixed pure-Python workload on this machine."""
+
+    def workload():
+        total = 0
+        for i in range(200_000):
+            total += i * i % 7
+        return total
+
+    return min(measure(workload, number=1) for _ in range(ROUNDS))
+
+
+def measure(fn, number: int) -> float:
+    start = time.perf_counter()
+    for _ in range(number):
+        fn()
+    return (time.perf_counter() - start) / number
+
+
+def time_case(case: Case) -> float:
+    """Best seconds per call over ROUNDS rounds of enough calls to be stable."""
+    setup = case.setup()
+    fn = next(setup)
+    try:
+        fn()  # warm up
+        number = 1
+        while measure(fn, number) * number < MIN_ROUND_TIME:
+            number *= 2
+        return min(measure(fn, number) for _ in range(ROUNDS))
+    finally:
+        setup.close()
+
+
+def format_seconds(seconds: float) -> str:
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f} {unit}"
+    return f"{seconds / 1e-9:.0f} ns"
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="benchmarks")
+    parser.add_argument("--filter", default="", help="only cases containing this")
+    parser.add_argument("--large", action="store_true", help="include slow cases")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument("--update-baselines", action="store_true")
+    args = parser.parse_args()
+
+    baselines = (
+        json.loads(BASELINES_PATH.read_text()) if BASELINES_PATH.exists() else {}
+    )
+    cases = [
+        case
+        for case in CASES
+        if args.filter in case.name and (args.large or not case.large)
+    ]
+
+    calibration = calibrate()
+    print(f"Calibration: {format_seconds(calibration)}\n")
+    print(f"{'case':<56}{'time':>12}{'relative':>12}{'baseline':>12}{'change':>9}")
+
+    regressions = []
+    for case in cases:
+        seconds = time_case(case)
+        relative = seconds / calibration
+        baseline = baselines.get(case.name)
+        if baseline is None:
+            change, status = "", "new"
+        else:
+            ratio = relative / baseline
+            change = f"{(ratio - 1) * 100:+.0f}%"
+            status = "SLOWER" if ratio > 1 + args.threshold else ""
+            if status:
+                regressions.append(case.name)
+        print(
+            f"{case.name:<56}{format_seconds(seconds):>12}{relative:>12.4g}"
+            f"{baseline if baseline is not None else '-':>12}{change:>9} {status}"
+        )
+        if args.update_baselines:
+            baselines[case.name] = float(f"{relative:.4g}")
+
+    if args.update_baselines:
+        BASELINES_PATH.write_text(
+            json.dumps(baselines, indent=2, sort_keys=True) + "\n"
+        )
+        print(f"\nUpdated {BASELINES_PATH.name}")
+        return
+
+    if regressions:
+        print(
+            f"\n{len(regressions)} case(s) more than {args.threshold:.0%} slower than"
+            " their baseline:"
+        )
+        for name in regressions:
+            print(f"  {name}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,249 @@
+import uuid
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+from poly_party.api.events import process_payouts
+from poly_party.candles import candle_buffer
+from poly_party.counters import rebuild_counters
+from poly_party.market_state import market_state
+from poly_party.models import (
+    Event,
+    EventReadWithShares,
+    Outcome,
+    Share,
+    User,
+    eventType,
+    pricingEngine,
+)
+from poly_party.rendering import SHARE_COLUMNS, render_event
+from poly_party.security import create_access_token, decode_token_subject
+from poly_party.trading import execute_bet
+from poly_party.user_cache import user_cache
+from sqlalchemy import insert
+from sqlmodel import Session, SQLModel, create_engine, select
+from sqlmodel.pool import StaticPool
+
+
+@dataclass
+class Case:
+    name: str
+    # Builds the fixture and yields the function to time, cleaning up after
+    setup: Callable[[], Iterator[Callable[[], object]]]
+    large: bool = False  # only run with --large
+
+
+# --- Fixtures ---
+
+
+@contextmanager
+def memory_session():
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    SQLModel.metadata.create_all(engine)
+    try:
+        with Session(engine) as session:
+            yield session
+    finally:
+        market_state.clear()
+        # Fills queue their price moves for a flush the benchmarks never run
+        candle_buffer.clear()
+        engine.dispose()
+
+
+def create_market(
+    session: Session,
+    num_outcomes: int = 2,
+    engine: pricingEngine = pricingEngine.SHARE_RATIO,
+) -> Event:
+    now = datetime(2026, 1, 1, 10)
+    event = Event(
+        title="Benchmark",
+        description="Benchmark market",
+        type=eventType.MULTIPLE_CHOICE,
+        pricing_engine=engine,
+        start_time=now,
+        end_time=now + timedelta(hours=2),
+        value=1,
+        outcomes=[
+            Outcome(description=f"Outcome {i}", value=i) for i in range(num_outcomes)
+        ],
+    )
+    session.add(event)
+    session.commit()
+    session.refresh(event)
+    return event
+
+
+def add_shares(session: Session, event: Event, outcome: Outcome, rows: int, users: int):
+    """Bulk-inserts `rows` one-share fills spread over `users` bettors."""
+    user_ids = [str(uuid.uuid4()) for _ in range(users)]
+    session.execute(
+        insert(User),
+        [
+            {"id": user_id, "username": f"bettor{i}", "hashed_password": ""}
+            for i, user_id in enumerate(user_ids)
+        ],
+    )
+    session.execute(
+        insert(Share),
+        [
+            {
+                "id": str(uuid.uuid4()),
+                "timestamp": datetime(2026, 1, 1, 10),
+                "value": 1,
+                "quantity": 1,
+                "wager": 0.5,
+                "price": 0.5,
+                "tiers": [],
+                "event_id": event.id,
+                "outcome_id": outcome.id,
+                "user_id": user_ids[i % users],
+            }
+            for i in range(rows)
+        ],
+    )
+    # The bulk insert skips the fill path, so bring the counters up to date
+    rebuild_counters(session)
+    session.commit()
+
+
+# --- Cases ---
+
+
+def quote(quantity: int, num_outcomes: int, market_shares: int):
+    def setup():
+        with memory_session() as session:
+            event = create_market(session, num_outcomes)
+            outcome = event.outcomes[0]
+            market = market_state.get(event.id, session)
+            # Spread the existing volume over every outcome
+            for other in event.outcomes:
+                market.apply_fill(other.id, market_shares // num_outcomes)
+            yield lambda: market.quote(outcome.id, quantity)
+
+    return Case(f"quote[q={quantity},n={num_outcomes},s={market_shares}]", setup)
+
+
+def large_bet(quantity: int):
+    def setup():
+        with memory_session() as session:
+            event = create_market(session)
+            user = User(username="whale", hashed_password="", balance=1e12)
+            session.add(user)
+            session.commit()
+            outcome_id = event.outcomes[0].id
+            yield lambda: execute_bet(
+                event.id, outcome_id, quantity, 1.0, session, user
+            )
+
+    return Case(f"place_bet[q={quantity}]", setup)
+
+
+def ladder_bet(engine: pricingEngine, num_outcomes: int):
+    def setup():
+        with memory_session() as session:
+            event = create_market(session, num_outcomes, engine)
+            user = User(username="ladder", hashed_password="", balance=1e12)
+            session.add(user)
+            session.commit()
+            outcome_id = event.outcomes[num_outcomes // 2].id
+            yield lambda: execute_bet(event.id, outcome_id, 10, 1.0, session, user)
+
+    return Case(f"place_bet[{engine.value},n={num_outcomes}]", setup)
+
+
+def payouts(winning_shares: int, large: bool = False):
+    def setup():
+        with memory_session() as session:
+            event = create_market(session)
+            winner = event.outcomes[0]
+            add_shares(
+                session, event, winner, winning_shares, min(winning_shares, 1000)
+            )
+
+            def run():
+                process_payouts(event, winner, session)
+                # Undo the credits so every round pays out the same shares
+                session.rollback()
+
+            yield run
+
+    return Case(f"process_payouts[shares={winning_shares}]", setup, large)
+
+
+def event_serialization(num_shares: int):
+    def setup():
+        with memory_session() as session:
+            event = create_market(session)
+            add_shares(session, event, event.outcomes[0], num_shares, 100)
+            session.refresh(event)
+            _ = event.outcomes, event.shares
+            yield lambda: EventReadWithShares.model_validate(event).model_dump_json()
+
+    return Case(f"EventReadWithShares[shares={num_shares}]", setup)
+
+
+def event_rendering(num_shares: int):
+    def setup():
+        with memory_session() as session:
+            event = create_market(session)
+            add_shares(session, event, event.outcomes[0], num_shares, 100)
+            session.refresh(event)
+            outcomes = event.outcomes
+            shares = (
+                session.execute(
+                    select(*SHARE_COLUMNS).where(Share.event_id == event.id)
+                )
+                .mappings()
+                .all()
+            )
+            yield lambda: render_event(event, outcomes, shares)
+
+    return Case(f"render_event[shares={num_shares}]", setup)
+
+
+def jwt_decode(cached: bool):
+    def setup():
+        token = create_access_token({"sub": "benchmark"})
+        if cached:
+            decode_token_subject(token)
+            yield lambda: decode_token_subject(token)
+        else:
+
+            def run():
+                user_cache.clear()
+                return decode_token_subject(token)
+
+            yield run
+        user_cache.clear()
+
+    return Case(f"decode_token_subject[{'cached' if cached else 'cold'}]", setup)
+
+
+CASES = [
+    *(
+        quote(quantity, num_outcomes, market_shares)
+        for quantity in (1, 100, 10_000)
+        for num_outcomes, market_shares in ((2, 0), (10, 100_000))
+    ),
+    large_bet(1_000),
+    large_bet(1_000_000),
+    *(
+        ladder_bet(engine, num_outcomes)
+        for engine in pricingEngine
+        for num_outcomes in (10, 500)
+    ),
+    payouts(1_000),
+    payouts(10_000),
+    payouts(100_000),
+    payouts(1_000_000, large=True),
+    event_serialization(100),
+    event_serialization(10_000),
+    event_rendering(100),
+    event_rendering(10_000),
+    jwt_decode(cached=False),
+    jwt_decode(cached=True),
+]
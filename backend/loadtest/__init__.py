@@ -0,0 +1,10 @@
+"""
+Load-testing harness for the trading API.
+
+Seeds a throwaway database, starts a local uvicorn on it and drives a
+weighted mix of logins, lobby reads, quotes, bets and closes at a fixed
+concurrency, then reports throughput and latency percentiles per route.
+
+    uv run python -m loadtest run --users 200 --events 20 --concurrency 50
+    uv run python -m loadtest compare before.json after.json
+"""
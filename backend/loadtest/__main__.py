@@ -0,0 +1,155 @@
+import argparse
+import asyncio
+import json
+import socket
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+
+from loadtest.harness import DEFAULT_MIX, ROUTES, RunConfig, drive, local_server
+from loadtest.seed import seed_database
+
+
+def parse_mix(text: str) -> dict[str, int]:
+    """Parses "login=5,bet=40" into route weights."""
+    mix = {}
+    for part in text.split(","):
+        route, _, weight = part.partition("=")
+        if route not in ROUTES or not weight.isdigit():
+            raise argparse.ArgumentTypeError(f"Bad mix entry: {part!r}")
+        mix[route] = int(weight)
+    return mix
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def run(args: argparse.Namespace):
+    config = RunConfig(
+        concurrency=args.concurrency,
+        duration=args.duration,
+        mix=args.mix,
+        max_quantity=args.max_quantity,
+        seed=args.seed,
+    )
+
+    with tempfile.TemporaryDirectory(prefix="polyparty-load-") as workdir:
+        workdir = Path(workdir)
+        print(f"Seeding {args.users} users and {args.events} events...")
+        seeded = seed_database(
+            workdir / "database.db",
+            num_users=args.users,
+            num_events=args.events,
+            outcomes_per_event=args.outcomes,
+            balance=args.balance,
+            password=args.password,
+        )
+
+        env = {"ADMIN_PASS": args.admin_password}
+        with local_server(workdir, args.port or free_port(), args.workers, env) as url:
+            print(f"Driving {url} for {args.duration:g}s at {args.concurrency}...")
+            results, elapsed = asyncio.run(
+                drive(url, config, seeded.usernames, args.password, args.admin_password)
+            )
+
+    report = {
+        "started_at": datetime.now(timezone.utc).isoformat(),
+        "label": args.label,
+        "config": {
+            "users": args.users,
+            "events": args.events,
+            "outcomes": args.outcomes,
+            "concurrency": args.concurrency,
+            "duration_s": args.duration,
+            "workers": args.workers,
+            "mix": args.mix,
+            "max_quantity": args.max_quantity,
+        },
+        "elapsed_s": elapsed,
+        **results,
+    }
+    print_report(report)
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2))
+        print(f"Saved to {args.output}")
+
+
+def print_report(report: dict):
+    print(
+        f"\n{'route':<8}{'reqs':>8}{'rejected':>10}{'errors':>8}"
+        f"{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+    )
+    rows = [*report["routes"].items(), ("total", report["total"])]
+    for route, stats in rows:
+        print(
+            f"{route:<8}{stats['requests']:>8}{stats['rejected']:>10}"
+            f"{stats['errors']:>8}{stats['throughput_rps']:>10.1f}"
+            f"{stats['p50_ms']:>10.1f}{stats['p95_ms']:>10.1f}{stats['p99_ms']:>10.1f}"
+        )
+
+
+def change(before: float, after: float) -> str:
+    if not before:
+        return "n/a"
+    return f"{(after - before) / before * 100:+.1f}%"
+
+
+def compare(args: argparse.Namespace):
+    before = json.loads(args.before.read_text())
+    after = json.loads(args.after.read_text())
+
+    print(f"{'route':<8}{'req/s':>22}{'p50 ms':>24}{'p99 ms':>24}")
+    routes = [*before["routes"], "total"]
+    for route in routes:
+        old = before["total"] if route == "total" else before["routes"].get(route)
+        new = after["total"] if route == "total" else after["routes"].get(route)
+        if not old or not new:
+            continue
+        cells = [
+            f"{old[key]:>8.1f} -> {new[key]:>8.1f} {change(old[key], new[key]):>7}"
+            for key in ("throughput_rps", "p50_ms", "p99_ms")
+        ]
+        print(f"{route:<8}" + "".join(f"{cell:>24}" for cell in cells))
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="loadtest", description=__doc__)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="seed, start a server and load it")
+    run_parser.add_argument("--users", type=int, default=100)
+    run_parser.add_argument("--events", type=int, default=10)
+    run_parser.add_argument("--outcomes", type=int, default=2)
+    run_parser.add_argument("--concurrency", type=int, default=20)
+    run_parser.add_argument("--duration", type=float, default=30.0)
+    run_parser.add_argument(
+        "--mix",
+        type=parse_mix,
+        default=DEFAULT_MIX,
+        help="route weights, e.g. login=5,events=25,cost=35,bet=34,close=1",
+    )
+    run_parser.add_argument("--max-quantity", type=int, default=10)
+    run_parser.add_argument("--balance", type=float, default=1_000_000.0)
+    run_parser.add_argument("--password", default="loadtest")
+    run_parser.add_argument("--admin-password", default="hunter2")
+    run_parser.add_argument("--workers", type=int, default=1)
+    run_parser.add_argument("--port", type=int, default=0)
+    run_parser.add_argument("--seed", type=int, default=None)
+    run_parser.add_argument("--label", default="")
+    run_parser.add_argument("--output", type=Path, default=None)
+    run_parser.set_defaults(handler=run)
+
+    compare_parser = commands.add_parser("compare", help="diff two saved runs")
+    compare_parser.add_argument("before", type=Path)
+    compare_parser.add_argument("after", type=Path)
+    compare_parser.set_defaults(handler=compare)
+
+    args = parser.parse_args()
+    args.handler(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,287 @@
+import asyncio
+import os
+import random
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import httpx
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+# The routes a run can exercise, in report order
+ROUTES = ("login", "events", "cost", "bet", "close")
+DEFAULT_MIX = {"login": 5, "events": 25, "cost": 35, "bet": 34, "close": 1}
+
+# Seeded by poly_party.db_initialization on startup
+ADMIN_USERNAME = "admin"
+
+
+@dataclass
+class RunConfig:
+    concurrency: int = 20
+    duration: float = 30.0  # seconds
+    mix: dict[str, int] = field(default_factory=lambda: dict(DEFAULT_MIX))
+    max_quantity: int = 10
+    seed: int | None = None
+
+
+class RouteStats:
+    def __init__(self):
+        self.latencies: list[float] = []
+        self.ok = 0
+        self.rejected = 0  # 4xx/5xx answers, e.g. a bet on an event just closed
+        self.errors = 0  # no answer at all
+
+    def record(self, latency: float, status_code: int | None):
+        self.latencies.append(latency)
+        if status_code is None:
+            self.errors += 1
+        elif status_code < 400:
+            self.ok += 1
+        else:
+            self.rejected += 1
+
+    def summary(self, elapsed: float) -> dict:
+        latencies = sorted(self.latencies)
+        return {
+            "requests": len(latencies),
+            "ok": self.ok,
+            "rejected": self.rejected,
+            "errors": self.errors,
+            "throughput_rps": len(latencies) / elapsed if elapsed else 0.0,
+            "p50_ms": percentile(latencies, 50) * 1000,
+            "p95_ms": percentile(latencies, 95) * 1000,
+            "p99_ms": percentile(latencies, 99) * 1000,
+            "max_ms": (latencies[-1] if latencies else 0.0) * 1000,
+        }
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, round(pct / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+# --- Server ---
+
+
+@contextmanager
+def local_server(workdir: Path, port: int, workers: int, env: dict[str, str]):
+    """Runs uvicorn against the database in `workdir` until the block exits."""
+    server_env = {
+        **os.environ,
+        **env,
+        "PYTHONPATH": os.pathsep.join(
+            filter(None, [str(BACKEND_DIR), os.environ.get("PYTHONPATH")])
+        ),
+    }
+    process = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "poly_party.main:app",
+            "--port",
+            str(port),
+            "--workers",
+            str(workers),
+            "--log-level",
+            "warning",
+        ],
+        cwd=workdir,
+        env=server_env,
+    )
+    try:
+        wait_until_up(f"http://127.0.0.1:{port}/", process)
+        yield f"http://127.0.0.1:{port}"
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+def wait_until_up(url: str, process: subprocess.Popen, timeout: float = 60.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"Server exited with code {process.returncode}")
+        try:
+            if httpx.get(url).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"Server did not come up within {timeout}s")
+
+
+# --- Load ---
+
+
+class LoadRun:
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        config: RunConfig,
+        usernames: list[str],
+        password: str,
+        admin_password: str,
+    ):
+        self.client = client
+        self.config = config
+        self.usernames = usernames
+        self.password = password
+        self.admin_password = admin_password
+        self.random = random.Random(config.seed)
+        self.stats = {route: RouteStats() for route in ROUTES}
+        self.markets: dict[str, list[dict]] = {}  # open event id -> outcomes
+        self.admin_token = ""
+
+    async def timed(self, route: str, request) -> httpx.Response | None:
+        start = time.perf_counter()
+        try:
+            response = await request
+        except httpx.HTTPError:
+            response = None
+        self.stats[route].record(
+            time.perf_counter() - start,
+            response.status_code if response is not None else None,
+        )
+        return response
+
+    async def login(self, username: str, password: str) -> str | None:
+        response = await self.timed(
+            "login",
+            self.client.post(
+                "/auth/login", data={"username": username, "password": password}
+            ),
+        )
+        if response is None or response.status_code != 200:
+            return None
+        return response.json()["access_token"]
+
+    async def prepare(self):
+        self.admin_token = await self.login(ADMIN_USERNAME, self.admin_password)
+        if not self.admin_token:
+            raise RuntimeError("Could not log in as the seeded admin")
+
+        headers = {"Authorization": f"Bearer {self.admin_token}"}
+        cursor = None
+        while True:
+            params = {"finalized": False, "limit": 200}
+            if cursor:
+                params["cursor"] = cursor
+            page = (
+                await self.client.get("/events/", params=params, headers=headers)
+            ).json()
+            for event in page["items"]:
+                self.markets[event["id"]] = event["outcomes"]
+            cursor = page["next_cursor"]
+            if not cursor:
+                break
+        # Stats cover the run itself, not the setup
+        self.stats = {route: RouteStats() for route in ROUTES}
+
+    def pick_market(self) -> tuple[str, dict] | None:
+        if not self.markets:
+            return None
+        event_id = self.random.choice(list(self.markets))
+        return event_id, self.random.choice(self.markets[event_id])
+
+    async def step(self, route: str, headers: dict):
+        if route == "login":
+            await self.login(self.random.choice(self.usernames), self.password)
+        elif route == "events":
+            await self.timed("events", self.client.get("/events/", headers=headers))
+        elif route in ("cost", "bet"):
+            market = self.pick_market()
+            if market is None:
+                return
+            event_id, outcome = market
+            quantity = self.random.randint(1, self.config.max_quantity)
+            if route == "cost":
+                request = self.client.post(
+                    "/events/bet/cost",
+                    params={
+                        "event_id": event_id,
+                        "outcome_id": outcome["id"],
+                        "num_shares": quantity,
+                    },
+                    headers=headers,
+                )
+            else:
+                request = self.client.post(
+                    "/events/bet",
+                    params={"event_id": event_id, "outcome_id": outcome["id"]},
+                    json={"quantity": quantity, "expected_price": 1.0},
+                    headers=headers,
+                )
+            await self.timed(route, request)
+        elif route == "close":
+            # Always leave one market open to trade on
+            if len(self.markets) < 2:
+                return
+            event_id, outcome = self.pick_market()
+            del self.markets[event_id]
+            await self.timed(
+                "close",
+                self.client.post(
+                    f"/events/{event_id}/close",
+                    json={"winning_value": outcome["value"]},
+                    headers={"Authorization": f"Bearer {self.admin_token}"},
+                ),
+            )
+
+    async def bettor(self, deadline: float):
+        token = None
+        while token is None and time.monotonic() < deadline:
+            token = await self.login(self.random.choice(self.usernames), self.password)
+        headers = {"Authorization": f"Bearer {token}"}
+
+        routes = [route for route in ROUTES if self.config.mix.get(route)]
+        weights = [self.config.mix[route] for route in routes]
+        while time.monotonic() < deadline:
+            await self.step(self.random.choices(routes, weights)[0], headers)
+
+    async def run(self) -> tuple[dict, float]:
+        await self.prepare()
+        start = time.monotonic()
+        deadline = start + self.config.duration
+        await asyncio.gather(
+            *(self.bettor(deadline) for _ in range(self.config.concurrency))
+        )
+        elapsed = time.monotonic() - start
+
+        routes = {
+            route: stats.summary(elapsed)
+            for route, stats in self.stats.items()
+            if stats.latencies
+        }
+        combined = RouteStats()
+        for stats in self.stats.values():
+            combined.latencies += stats.latencies
+            combined.ok += stats.ok
+            combined.rejected += stats.rejected
+            combined.errors += stats.errors
+        return {"routes": routes, "total": combined.summary(elapsed)}, elapsed
+
+
+async def drive(
+    base_url: str,
+    config: RunConfig,
+    usernames: list[str],
+    password: str,
+    admin_password: str,
+) -> tuple[dict, float]:
+    limits = httpx.Limits(max_connections=config.concurrency + 1)
+    async with httpx.AsyncClient(
+        base_url=base_url, limits=limits, timeout=30.0
+    ) as client:
+        return await LoadRun(client, config, usernames, password, admin_password).run()
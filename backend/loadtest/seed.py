@@ -0,0 +1,62 @@
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from poly_party.api.auth import create_user_locally
+from poly_party.api.events import create_event
+from poly_party.models import EventCreate, OutcomeBase, User, eventType
+from sqlmodel import Session, SQLModel, create_engine, update
+
+USERNAME_PREFIX = "load"
+
+
+@dataclass
+class SeedData:
+    usernames: list[str]
+    password: str
+
+
+def seed_database(
+    database_path: Path,
+    num_users: int,
+    num_events: int,
+    outcomes_per_event: int,
+    balance: float,
+    password: str,
+) -> SeedData:
+    """Creates the bettors and events a run trades on, through the app's own helpers."""
+    engine = create_engine(f"sqlite:///{database_path}")
+    SQLModel.metadata.create_all(engine)
+
+    with Session(engine) as session:
+        usernames = [f"{USERNAME_PREFIX}{i}" for i in range(num_users)]
+        for username in usernames:
+            create_user_locally(username, password, False, session)
+
+        # Deep pockets, so a long run measures trading rather than bankruptcies
+        session.exec(
+            update(User).where(User.username.in_(usernames)).values(balance=balance)
+        )
+        session.commit()
+
+        now = datetime.utcnow()
+        for i in range(num_events):
+            create_event(
+                EventCreate(
+                    title=f"Load event {i}",
+                    description="Created by the load-testing harness",
+                    start_time=now,
+                    end_time=now + timedelta(hours=1),
+                    type=eventType.MULTIPLE_CHOICE,
+                    value=1,
+                    outcomes=[
+                        OutcomeBase(description=f"Outcome {k}", value=k)
+                        for k in range(outcomes_per_event)
+                    ],
+                ),
+                session=session,
+                current_user=None,
+            )
+
+    engine.dispose()
+    return SeedData(usernames=usernames, password=password)
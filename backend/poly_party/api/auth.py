@@ -1,41 +1,67 @@
-import random
-import string
+from datetime import datetime
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
-from poly_party.db import get_session
-from poly_party.models import User, UserCreate, UserRead, Token, TokenBase
+from poly_party.db import get_async_session, get_session
+from poly_party.leaderboard import leaderboard
+from poly_party.models import (
+    Token,
+    TokenBase,
+    TokenBatch,
+    TokenMintRequest,
+    TokenRevokeReport,
+    TokenRevokeRequest,
+    User,
+    UserCreate,
+    UserRead,
+)
 from poly_party.security import (
     create_access_token,
     get_current_user,
     get_current_user_optional,
     hash_password,
-    verify_password,
+    hash_password_async,
+    verify_password_async,
 )
-from sqlmodel import Session, select
+from poly_party.tokens import mint_tokens, redeemable, revoke_tokens
+from poly_party.user_cache import user_cache
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session, select, update
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 router = APIRouter()
 
-def check_and_update_registration_token(user_data: UserCreate, session: Session):
-    existing_token = session.exec(
-        select(Token).where(
-            (Token.token == user_data.token) & (Token.used == False)
+def check_registration_token(code: str, session: Session):
+    # Revoked and expired tokens are as good as used
+    if not session.exec(select(Token).where(redeemable(code, datetime.utcnow()))).first():
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Register token is invalid",
         )
-    ).first()
-    if not existing_token:
+
+
+def consume_registration_token(code: str, session: Session):
+    """Marks the token used, unless another sign-up got to it first."""
+    result = session.execute(
+        update(Token)
+        .where(redeemable(code, datetime.utcnow()))
+        .values(used=True)
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount != 1:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Register token is invalid",
         )
-        return
-    existing_token.used = True
-    session.add(existing_token)
-    session.commit()
-    session.refresh(existing_token)
 
-def create_new_user(user_data: UserCreate, session: Session) -> User:
-    hashed = hash_password(user_data.password)
 
+def create_new_user(
+    user_data: UserCreate, hashed: str, session: Session, token: str | None = None
+) -> User:
+    # The invite is spent in the same transaction that adds the user, so a
+    # sign-up that fails leaves it unused
+    if token is not None:
+        consume_registration_token(token, session)
     new_user = User(
         username=user_data.username,
         hashed_password=hashed,
@@ -44,35 +70,48 @@ def create_new_user(user_data: UserCreate, session: Session) -> User:
         admin=False,
     )
     session.add(new_user)
-    session.commit()
-    session.refresh(new_user)
+    with leaderboard.writing():
+        try:
+            session.commit()
+        except IntegrityError:
+            # Taken by a concurrent sign-up since the check
+            session.rollback()
+            raise HTTPException(status_code=400, detail="Username already registered")
+        session.refresh(new_user)
+        leaderboard.add_user(new_user)
     return new_user
 
 
 @router.post("/register", response_model=UserRead)
-def register_user(
+async def register_user(
     user_data: UserCreate,
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_async_session),
     current_user: User | None = Depends(get_current_user_optional),
 ) -> User:
     admin = check_admin(current_user) if current_user else False
+    token = None if admin else user_data.token
 
-    if not admin:
-        check_and_update_registration_token(user_data, session)
+    # 1. Turn away bad invites and taken names before paying for a hash
+    def check_registration(session: Session):
+        if token is not None:
+            check_registration_token(token, session)
 
-    existing_user = session.exec(
-        select(User).where(User.username == user_data.username)
-    ).first()
-    if existing_user:
-        raise HTTPException(status_code=400, detail="Username already registered")
+        existing_user = session.exec(
+            select(User).where(User.username == user_data.username)
+        ).first()
+        if existing_user:
+            raise HTTPException(status_code=400, detail="Username already registered")
 
-    
-    return create_new_user(user_data, session)
+    await session.run_sync(check_registration)
 
+    # 2. Hash in the pool, so a wave of sign-ups can't tie up the request
+    # workers. This can turn the request away (503) with nothing spent yet
+    hashed = await hash_password_async(user_data.password)
 
-def random_token(length=4):
-    chars = string.ascii_letters + string.digits
-    return "".join(random.choice(chars) for _ in range(length))
+    # 3. Spend the invite and add the user in one transaction
+    return await session.run_sync(
+        lambda session: create_new_user(user_data, hashed, session, token)
+    )
 
 
 @router.get("/register/token", response_model=TokenBase)
@@ -82,41 +121,64 @@ def register_new_token(
 ):
     raise_not_admin(current_user)
 
-    unique = False
-    token = ""
+    # A batch of one, so it never expires
+    (token,) = mint_tokens(session, 1).tokens
+    return TokenBase(token=token, used=False)
 
-    while not unique:
-        new_token = random_token()
 
-        existing_token = session.exec(
-            select(Token).where(Token.token == new_token)
-        ).first()
-        print(existing_token)
-        if not existing_token:
-            token = new_token
-            unique = True
+@router.post("/register/tokens", response_model=TokenBatch)
+def mint_registration_tokens(
+    request: TokenMintRequest,
+    session: Session = Depends(get_session),
+    current_user: User = Depends(get_current_user),
+):
+    """Issues up to 1000 tokens at once, e.g. to print invites before a party."""
+    raise_not_admin(current_user)
+    return mint_tokens(
+        session, request.count, request.length, request.expires_in_minutes
+    )
 
-    new_token = Token(token=token, used=False)
-    session.add(new_token)
-    session.commit()
-    session.refresh(new_token)
-    return new_token
+
+@router.post("/register/tokens/revoke", response_model=TokenRevokeReport)
+def revoke_registration_tokens(
+    request: TokenRevokeRequest,
+    session: Session = Depends(get_session),
+    current_user: User = Depends(get_current_user),
+):
+    """Revokes a minted batch's unused tokens, or the listed ones."""
+    raise_not_admin(current_user)
+    revoked = revoke_tokens(session, request.batch_id, request.tokens)
+    return TokenRevokeReport(revoked=revoked)
 
 
 @router.post("/login")
-def login(
+async def login(
     # Change user_data to form_data using OAuth2PasswordRequestForm
     form_data: OAuth2PasswordRequestForm = Depends(),
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_async_session),
 ):
     # Access credentials via form_data.username and form_data.password
-    user = session.exec(select(User).where(User.username == form_data.username)).first()
+    user = (
+        await session.exec(select(User).where(User.username == form_data.username))
+    ).first()
 
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    valid, updated_hash = (
+        await verify_password_async(form_data.password, user.hashed_password)
+        if user
+        else (False, None)
+    )
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials"
         )
 
+    # The Argon2 parameters changed since this password was stored
+    if updated_hash is not None:
+        user.hashed_password = updated_hash
+        session.add(user)
+        await session.commit()
+        user_cache.invalidate(user.id)
+
     access_token = create_access_token(data={"sub": user.username})
 
     return {"access_token": access_token, "token_type": "bearer", "user_id": user.id}
@@ -137,8 +199,10 @@ def create_user_locally(username: str, password: str, admin: bool, session: Sess
     )
 
     session.add(new_user)
-    session.commit()
-    session.refresh(new_user)
+    with leaderboard.writing():
+        session.commit()
+        session.refresh(new_user)
+        leaderboard.add_user(new_user)
     return new_user
 
 
@@ -1,44 +1,290 @@
-from typing import Literal
-
-from fastapi import APIRouter, Body, Depends, HTTPException
-from poly_party.db import get_session
+import asyncio
+from contextlib import AsyncExitStack
+from datetime import datetime, timedelta
+
+from fastapi import (
+    APIRouter,
+    Body,
+    Depends,
+    Header,
+    HTTPException,
+    Query,
+    WebSocket,
+    WebSocketDisconnect,
+    status,
+)
+from poly_party.candles import candle_buffer, load_candles, naive_utc
+from poly_party.conditional import (
+    cache_headers,
+    etag_matches,
+    not_modified,
+    version_etag,
+)
+from poly_party.counters import rebuild_counters, verify_counters
+from poly_party.db import get_async_session, get_session
 from poly_party.models import (
+    BatchBetRequest,
+    CandleSeries,
+    CounterReport,
     Event,
     EventCreate,
     EventReadWithShares,
+    EventSummary,
+    EventSummaryPage,
     Outcome,
+    OutcomeQuote,
+    OutcomeSummary,
+    PayoutRead,
+    QuoteRead,
+    QuoteRequest,
     Share,
+    SharePage,
+    ShareRead,
     User,
+    eventType,
+)
+from poly_party.leaderboard import leaderboard
+from poly_party.market_state import EventMarket, market_state
+from poly_party.rendering import (
+    SHARE_COLUMNS,
+    encode,
+    event_responses,
+    model_response,
+    render_event,
+    render_shares,
 )
-from poly_party.security import get_current_user
+from poly_party.price_feed import (
+    MAX_SUBSCRIPTIONS,
+    SEND_TIMEOUT,
+    Subscriber,
+    price_feed,
+)
+from poly_party.pagination import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    decode_cursor,
+    encode_cursor,
+)
+from poly_party.security import decode_token_subject, get_current_user
+from poly_party.trading import event_locks, execute_batch, execute_bet
+from poly_party.user_cache import user_cache
 from sqlalchemy.orm import selectinload
-from sqlmodel import Session, func, select
+from sqlmodel import Session, func, select, update
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 router = APIRouter()
 
-
-@router.get("/", response_model=list[EventReadWithShares])  # 1. Update response model
-def get_events(
-    session: Session = Depends(get_session),
+MAX_QUOTE_BATCH = 500
+MAX_BATCH_LEGS = 100
+MAX_CANDLES = 1000
+MAX_PRICE_LADDER = 10_000  # Per-share prices sent per request
+PAYOUT_PER_SHARE = 1.0
+
+
+@router.get("/", response_model=EventSummaryPage)
+async def get_events(
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    finalized: bool | None = None,
+    type: eventType | None = None,
+    starts_after: datetime | None = None,
+    starts_before: datetime | None = None,
+    ends_after: datetime | None = None,
+    ends_before: datetime | None = None,
+    if_none_match: str | None = Header(default=None),
+    accept_encoding: str | None = Header(default=None),
+    session: AsyncSession = Depends(get_async_session),
     current_user: User = Depends(get_current_user),
 ):
-    statement = select(Event).options(
-        selectinload(Event.shares), selectinload(Event.outcomes)
-    )
-    return session.exec(statement).all()
+    """
+    Lists events newest first as summaries: outcomes with their current
+    prices and share totals, plus participant counts, but no raw shares.
+    The page's ETag covers the version of every event on it.
+    """
+    # 1. Filters, each backed by an index
+    statement = select(Event.id, Event.start_time, Event.version, Event.updated_at)
+    if finalized is not None:
+        statement = statement.where(Event.finalized == finalized)
+    if type is not None:
+        statement = statement.where(Event.type == type)
+    if starts_after is not None:
+        statement = statement.where(Event.start_time >= starts_after)
+    if starts_before is not None:
+        statement = statement.where(Event.start_time < starts_before)
+    if ends_after is not None:
+        statement = statement.where(Event.end_time >= ends_after)
+    if ends_before is not None:
+        statement = statement.where(Event.end_time < ends_before)
+
+    # 2. Keyset pagination on (start_time, id), continuing after the cursor
+    if cursor:
+        start_time, event_id = decode_cursor(cursor, datetime, str)
+        statement = statement.where(
+            (Event.start_time < start_time)
+            | ((Event.start_time == start_time) & (Event.id < event_id))
+        )
+    statement = statement.order_by(Event.start_time.desc(), Event.id.desc())
+    page = (await session.exec(statement.limit(limit + 1))).all()
+
+    next_cursor = None
+    if len(page) > limit:
+        page = page[:limit]
+        next_cursor = encode_cursor(page[-1].start_time, page[-1].id)
+
+    # 3. Answer from the versions alone if the client has this page already
+    etag = version_etag(next_cursor, *(f"{row.id}@{row.version}" for row in page))
+    headers = cache_headers(etag, max((row.updated_at for row in page), default=None))
+    if etag_matches(if_none_match, etag):
+        return not_modified(headers)
+
+    loaded = (
+        await session.exec(
+            select(Event)
+            .where(Event.id.in_([row.id for row in page]))
+            .options(selectinload(Event.outcomes))
+        )
+    ).all()
+    by_id = {event.id: event for event in loaded}
+    events = [by_id[row.id] for row in page if row.id in by_id]
+
+    # 4. Totals and participant counts are the rows' own counters, and the
+    # prices the costs every fill stores with them. Not the in-memory market
+    # state: it misses fills made by other worker processes
+    items: list[EventSummary] = []
+    for event in events:
+        items.append(
+            EventSummary(
+                **event.model_dump(),
+                outcomes=[
+                    OutcomeSummary(
+                        **outcome.model_dump(),
+                        share_total=outcome.share_count,
+                    )
+                    for outcome in event.outcomes
+                ],
+                share_total=event.share_count,
+            )
+        )
+
+    page = EventSummaryPage(items=items, next_cursor=next_cursor)
+    return model_response(page, accept_encoding, headers)
 
 
 # 2. View a specific Event and all its tied Shares
 @router.get("/{event_id}", response_model=EventReadWithShares)
-def get_event_details(
+async def get_event_details(
     event_id: str,
-    session: Session = Depends(get_session),
+    if_none_match: str | None = Header(default=None),
+    accept_encoding: str | None = Header(default=None),
+    session: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(get_current_user),
+):
+    # 1. The version alone decides whether the client's copy is current
+    stamp = (
+        await session.exec(
+            select(Event.version, Event.updated_at).where(Event.id == event_id)
+        )
+    ).first()
+    if not stamp:
+        raise HTTPException(status_code=404, detail="Event not found")
+    headers = cache_headers(version_etag(event_id, stamp.version), stamp.updated_at)
+    if etag_matches(if_none_match, headers["ETag"]):
+        return not_modified(headers)
+
+    # 2. Otherwise render this version, unless someone already has. The reads
+    # aren't one snapshot (pysqlite starts no transaction for a SELECT), so a
+    # fill may land between them: the render is cached and stamped with the
+    # version of the event row it read, and the outcomes and shares read
+    # after it are at least that new. A fill in between only shows up early,
+    # and its own version bump makes the next request render again
+    rendered = event_responses.get(event_id, stamp.version)
+    if rendered is None:
+        event = await session.get(Event, event_id)
+        if not event:
+            raise HTTPException(status_code=404, detail="Event not found")
+        headers = cache_headers(version_etag(event_id, event.version), event.updated_at)
+        outcomes = (
+            await session.exec(select(Outcome).where(Outcome.event_id == event_id))
+        ).all()
+        shares = (
+            await session.execute(
+                select(*SHARE_COLUMNS)
+                .where(Share.event_id == event_id)
+                .order_by(Share.timestamp, Share.id)
+            )
+        ).mappings()
+        body = render_event(event, outcomes, shares)
+        rendered = event_responses.put(event_id, event.version, body)
+    return rendered.response(accept_encoding, headers)
+
+
+@router.get("/{event_id}/shares", response_model=SharePage)
+async def get_event_shares(
+    event_id: str,
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    accept_encoding: str | None = Header(default=None),
+    session: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(get_current_user),
+):
+    """An event's fills, oldest first, one page at a time."""
+    if not await session.get(Event, event_id):
+        raise HTTPException(status_code=404, detail="Event not found")
+
+    statement = select(*SHARE_COLUMNS).where(Share.event_id == event_id)
+    if cursor:
+        timestamp, share_id = decode_cursor(cursor, datetime, str)
+        statement = statement.where(
+            (Share.timestamp > timestamp)
+            | ((Share.timestamp == timestamp) & (Share.id > share_id))
+        )
+    statement = statement.order_by(Share.timestamp, Share.id)
+    shares = (await session.execute(statement.limit(limit + 1))).mappings().all()
+
+    next_cursor = None
+    if len(shares) > limit:
+        shares = shares[:limit]
+        next_cursor = encode_cursor(shares[-1]["timestamp"], shares[-1]["id"])
+
+    return encode(render_shares(shares, next_cursor), accept_encoding)
+
+
+@router.get("/{event_id}/candles", response_model=CandleSeries)
+async def get_event_candles(
+    event_id: str,
+    resolution: int = Query(default=60, ge=1),
+    outcome_id: str | None = None,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    limit: int = Query(default=500, ge=1, le=MAX_CANDLES),
+    accept_encoding: str | None = Header(default=None),
+    session: AsyncSession = Depends(get_async_session),
+    sync_session: Session = Depends(get_session),
     current_user: User = Depends(get_current_user),
 ):
-    event = session.get(Event, event_id)
-    if not event:
+    """
+    Price history per outcome, in `resolution`-second candles from `start`
+    up to `end` (now by default), or the last `limit` buckets. Buckets
+    without a fill are left out; the price held at the previous close.
+    """
+    if not await session.get(Event, event_id):
         raise HTTPException(status_code=404, detail="Event not found")
-    return event
+
+    start, end = naive_utc(start), naive_utc(end) or datetime.utcnow()
+    if start is None or (end - start).total_seconds() > limit * resolution:
+        start = end - timedelta(seconds=limit * resolution)
+
+    # Write out this worker's queued fills first, so its own bets show. On a
+    # thread: a flush waits for any flush already running, and the event loop
+    # must never wait on a lock held across database IO
+    await asyncio.to_thread(candle_buffer.flush, sync_session)
+    candles = await session.run_sync(
+        lambda sync_session: load_candles(
+            sync_session, event_id, resolution, start, end, outcome_id
+        )
+    )
+    series = CandleSeries(event_id=event_id, resolution=resolution, outcomes=candles)
+    return model_response(series, accept_encoding)
 
 
 @router.post("/create", response_model=Event)
@@ -71,226 +317,406 @@ def create_event(
     session.add(db_event)
     session.commit()
     session.refresh(db_event)
+    market_state.add_event(db_event)
     return db_event
 
 
-@router.post("/bet", response_model=list[Share])
-def place_bet(
+@router.post("/bet", response_model=ShareRead)
+async def place_bet(
     event_id: str,
     outcome_id: str,
     quantity: int = Body(..., embed=True),
     expected_price: float = Body(..., embed=True),
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_async_session),
     current_user: User = Depends(get_current_user),
-) -> list[Share]:
-    # 1. Validation
-    db_event = session.get(Event, event_id)
-    if not db_event or db_event.finalized:
-        raise HTTPException(status_code=400, detail="Event unavailable or finalized")
-
-    db_outcome = session.get(Outcome, outcome_id)
-    if not db_outcome or db_outcome.event_id != event_id:
-        raise HTTPException(status_code=404, detail="Outcome not found")
-
-    # 2. Calculate the actual cost using the scaled model
-    # We get the list of prices for the quantity requested
-    prices = calculate_outcome_costs(quantity, db_outcome, db_event, session)
-    total_cost = sum(prices)
-    final_share_price = prices[-1]
-
-    # Slippage check: if the last share is more expensive than the user expected, block the trade
-    if final_share_price > expected_price + 0.01:  # Small buffer for float math
-        raise HTTPException(status_code=400, detail="Price moved too much (slippage)")
-
-    if current_user.balance < total_cost:
-        raise HTTPException(status_code=400, detail="Insufficient balance")
-
-    # 3. Deduct balance and create shares
-    current_user.balance -= total_cost
-    session.add(current_user)
-
-    new_shares: list[Share] = []
-    for price in prices:
-        share = Share(
-            value=db_event.value,
-            outcome_id=outcome_id,
-            wager=price,  # Store the actual price paid for THIS specific share
-            event_id=db_event.id,
-            user_id=current_user.id,
+) -> Share:
+    # Queue behind other bets on this event without blocking the event loop,
+    # then run the fill through the shared (sync) execution path
+    async with event_locks.hold_async(event_id):
+        return await session.run_sync(
+            lambda sync_session: execute_bet(
+                event_id,
+                outcome_id,
+                quantity,
+                expected_price,
+                sync_session,
+                current_user,
+            )
         )
-        session.add(share)
-        new_shares.append(share)
-
-    # 4. UPDATE ALL OUTCOMES (The new percentages)
-    # We must commit or flush here so the next calculation sees the new shares
-    session.flush()
-
-    for outcome in db_event.outcomes:
-        # Calculate what the NEXT single share would cost for this outcome
-        # This updates the 'cost' field used by the UI to show the current price
-        next_price_list = calculate_outcome_costs(1, outcome, db_event, session)
-        outcome.cost = next_price_list[0]
-        session.add(outcome)
 
-    # 5. Finalize
-    try:
-        session.commit()
-    except Exception:
-        session.rollback()
-        raise HTTPException(status_code=500, detail="Transaction failed")
-
-    # Optional: Broadcast new outcome costs via WebSocket here
-    # await manager.broadcast({"type": "PRICE_UPDATE", "event_id": event_id})
 
-    for share in new_shares:
-        session.refresh(share)
+@router.post("/bet/batch", response_model=list[ShareRead])
+async def place_bets(
+    batch: BatchBetRequest,
+    session: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(get_current_user),
+) -> list[Share]:
+    """
+    Places several bets, across outcomes or events, as one all-or-nothing
+    transaction. Each leg has its own slippage limit, and fails the batch.
+    """
+    if not batch.legs:
+        raise HTTPException(status_code=400, detail="A batch needs at least one leg")
+    if len(batch.legs) > MAX_BATCH_LEGS:
+        raise HTTPException(
+            status_code=400, detail=f"At most {MAX_BATCH_LEGS} legs per batch"
+        )
 
-    return new_shares
+    async with AsyncExitStack() as locks:
+        # The same order the fill takes the thread locks in
+        for event_id in sorted({leg.event_id for leg in batch.legs}):
+            await locks.enter_async_context(event_locks.hold_async(event_id))
+        return await session.run_sync(
+            lambda sync_session: execute_batch(batch.legs, sync_session, current_user)
+        )
 
 
-@router.post("/bet/cost", response_model=list[float])
-def get_outcome_costs(
+@router.post("/bet/cost", response_model=QuoteRead)
+async def get_outcome_costs(
     num_shares: int,
     event_id: str,
     outcome_id: str,
-    session: Session = Depends(get_session),
+    include_prices: bool = False,
+    session: AsyncSession = Depends(get_async_session),
     current_user: User = Depends(get_current_user),
 ):
-    # 1. Fetch the Event
-    event = session.get(Event, event_id)
-    if not event:
+    # 1. Look up the event's market state (no database round trip once loaded)
+    market = await get_market(event_id, session)
+    if market is None:
         raise HTTPException(status_code=404, detail="Event not found")
 
-    # 2. Fetch the Outcome
-    # It's good practice to ensure the outcome actually belongs to the event
-    outcome = session.get(Outcome, outcome_id)
-    if not outcome or outcome.event_id != event_id:
+    # 2. It's good practice to ensure the outcome actually belongs to the event
+    if not market.has_outcome(outcome_id):
         raise HTTPException(status_code=404, detail="Outcome not found for this event")
 
-    # 3. Calculate the step-by-step prices
-    prices = calculate_outcome_costs(num_shares, outcome, event, session)
+    # 3. Price the order. The per-share ladder is only sent when asked for
+    quote = quote_or_400(market, outcome_id, num_shares, include_prices)
 
-    return prices
+    return QuoteRead(event_id=event_id, outcome_id=outcome_id, **quote.model_dump())
 
 
-def calculate_outcome_costs(
-    num_shares: int, selected_outcome: Outcome, event: Event, session: Session
+@router.post("/bet/quotes", response_model=list[QuoteRead])
+async def get_outcome_quotes(
+    requests: list[QuoteRequest],
+    include_prices: bool = False,
+    session: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(get_current_user),
 ):
-    # 1. Get current total shares for this specific outcome
-    # We sum the 'value' (number of shares per record)
-    current_outcome_shares: int | Literal[0] = (
-        session.exec(
-            select(func.sum(Share.value)).where(Share.outcome_id == selected_outcome.id)
-        ).one()
-        or 0
-    )
+    """
+    Quotes many (event, outcome, quantity) orders in one round trip. Every
+    quote is priced independently against the current market.
+    """
+    if len(requests) > MAX_QUOTE_BATCH:
+        raise HTTPException(
+            status_code=400, detail=f"At most {MAX_QUOTE_BATCH} quotes per request"
+        )
+    if include_prices and sum(r.quantity for r in requests) > MAX_PRICE_LADDER:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Per-share prices are sent for at most {MAX_PRICE_LADDER} shares",
+        )
 
-    # 2. Get current total shares for the entire event
-    total_event_shares = (
-        session.exec(
-            select(func.sum(Share.value)).where(Share.event_id == event.id)
-        ).one()
-        or 0
-    )
+    quotes: list[QuoteRead] = []
+    for request in requests:
+        market = await get_market(request.event_id, session)
+        if market is None:
+            raise HTTPException(
+                status_code=404, detail=f"Event {request.event_id} not found"
+            )
+        if not market.has_outcome(request.outcome_id):
+            raise HTTPException(
+                status_code=404,
+                detail=f"Outcome {request.outcome_id} not found for this event",
+            )
+
+        quote = quote_or_400(
+            market, request.outcome_id, request.quantity, include_prices
+        )
+        quotes.append(
+            QuoteRead(
+                event_id=request.event_id,
+                outcome_id=request.outcome_id,
+                **quote.model_dump(),
+            )
+        )
 
-    total_cost = 0.0
+    return quotes
 
-    # We iterate to simulate price slippage
-    # For every 1 share purchased, the price for the NEXT one goes up
-    temp_outcome_shares = current_outcome_shares
-    temp_total_event_shares = total_event_shares
 
-    prices: list[float] = []
-    for _ in range(num_shares):
-        # Prevent division by zero if it's the first share ever
-        if temp_total_event_shares == 0:
-            # Default to an even split price if market is empty
-            current_price = 1.0 / len(event.outcomes) if event.outcomes else 0.5
-        else:
-            current_price = temp_outcome_shares / temp_total_event_shares
+async def get_market(event_id: str, session: AsyncSession) -> EventMarket | None:
+    """The event's market state, only touching the database if it isn't loaded
+    or its totals have gone stale."""
+    market = market_state.peek(event_id)
+    if market is not None:
+        return market
+    return await session.run_sync(
+        lambda sync_session: market_state.get(event_id, sync_session)
+    )
 
-        # Clamp price between a small minimum and $1.00
-        current_price = max(0.01, min(current_price, 0.99))
 
-        prices.append(current_price)
-        total_cost += current_price
+def quote_or_400(
+    market: EventMarket,
+    outcome_id: str,
+    num_shares: int,
+    include_prices: bool = False,
+) -> OutcomeQuote:
+    if include_prices and num_shares > MAX_PRICE_LADDER:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Per-share prices are sent for at most {MAX_PRICE_LADDER} shares",
+        )
+    try:
+        return market.quote(outcome_id, num_shares, include_prices)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
-        # Simulate the purchase for the next iteration
-        temp_outcome_shares += 1
-        temp_total_event_shares += 1
 
-    return prices
+@router.post("/counters/rebuild", response_model=CounterReport)
+async def rebuild_event_counters(
+    dry_run: bool = False,
+    session: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Checks every outcome's and event's share counters against the share table
+    and, unless dry_run is set, recomputes them all from it.
+    """
+    if not current_user.admin:
+        raise HTTPException(status_code=403, detail="Only admins can rebuild counters")
+
+    mismatches = await session.run_sync(verify_counters)
+    if dry_run:
+        return CounterReport(rebuilt=False, mismatches=mismatches)
+
+    affected = sorted({mismatch.event_id for mismatch in mismatches})
+    await session.run_sync(rebuild_counters)
+    # Their listings change, so cached copies must not revalidate
+    await session.exec(
+        update(Event)
+        .where(Event.id.in_(affected))
+        .values(version=Event.version + 1, updated_at=datetime.utcnow())
+    )
+    await session.commit()
+
+    # Markets loaded from the drifted counters take the repaired totals, and
+    # stay loaded so live subscriptions and trades keep finding them
+    for event_id in affected:
+        async with event_locks.hold_async(event_id):
+            with event_locks.hold(event_id):
+                await session.run_sync(
+                    lambda sync_session: market_state.get_current(
+                        event_id, sync_session
+                    )
+                )
+        event_responses.invalidate(event_id)
+
+    return CounterReport(rebuilt=True, mismatches=mismatches)
 
 
 @router.post("/{event_id}/close")
-def close_event(
+async def close_event(
     event_id: str,
     winning_value: int = Body(..., embed=True),
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_async_session),
     current_user: User = Depends(get_current_user),
 ):
     # 1. Security Check: Only admins should close events
     if not current_user.admin:
         raise HTTPException(status_code=403, detail="Only admins can close events")
 
-    # 2. Fetch the Event
-    db_event = session.get(Event, event_id)
-    if not db_event:
-        raise HTTPException(status_code=404, detail="Event not found")
+    async with event_locks.hold_async(event_id):
+        return await session.run_sync(
+            lambda sync_session: settle_event(event_id, winning_value, sync_session)
+        )
 
-    if db_event.finalized:
-        raise HTTPException(status_code=400, detail="Event is already finalized")
 
-    # 3. Identify the winning outcome based on the value
-    # We look for the outcome tied to this event that matches the 'winning_value'
-    winning_outcome = next(
-        (o for o in db_event.outcomes if o.value == winning_value), None
-    )
+def settle_event(event_id: str, winning_value: int, session: Session):
+    """Finalizes an event and pays out every holder of the winning outcome."""
+    # 1. Fetch the Event (before locking, so we never wait for a connection
+    # while holding the lock that the bets which hold connections wait on)
+    if not session.get(Event, event_id):
+        raise HTTPException(status_code=404, detail="Event not found")
 
-    if not winning_outcome:
-        raise HTTPException(
-            status_code=400, detail=f"No outcome found with value {winning_value}"
+    # No bet on this event may fill while it is being settled
+    with event_locks.hold(event_id):
+        # The row lock keeps bets on other worker processes out too
+        db_event = session.get(
+            Event, event_id, populate_existing=True, with_for_update=True
         )
+        if db_event.finalized:
+            raise HTTPException(status_code=400, detail="Event is already finalized")
 
-    # 4. Finalize the Event
-    db_event.finalized = True
-    session.add(db_event)
-
-    # 5. Execute Payouts
-    num_payouts = process_payouts(db_event, winning_outcome, session)
+        # 2. Identify the winning outcome based on the value
+        # We look for the outcome tied to this event that matches the 'winning_value'
+        winning_outcome = next(
+            (o for o in db_event.outcomes if o.value == winning_value), None
+        )
 
-    # 6. Commit all changes (Event status + User balances)
-    try:
-        session.commit()
-    except Exception:
-        session.rollback()
-        raise HTTPException(status_code=500, detail="Failed to finalize payouts")
+        if not winning_outcome:
+            raise HTTPException(
+                status_code=400, detail=f"No outcome found with value {winning_value}"
+            )
+
+        # 3. Finalize the Event
+        db_event.finalized = True
+        db_event.version += 1
+        db_event.updated_at = datetime.utcnow()
+        session.add(db_event)
+
+        # 4. Execute Payouts
+        payouts = process_payouts(db_event, winning_outcome, session)
+
+        # 5. Commit all changes (Event status + User balances)
+        with leaderboard.writing():
+            try:
+                session.commit()
+            except Exception:
+                session.rollback()
+                raise HTTPException(
+                    status_code=500, detail="Failed to finalize payouts"
+                )
+
+            leaderboard.record_settlement(
+                event_id, {payout.user_id: payout.amount for payout in payouts}
+            )
+    for payout in payouts:
+        user_cache.invalidate(payout.user_id)
+    event_responses.invalidate(event_id)
+    price_feed.publish_close(event_id, winning_outcome.id)
 
     return {
         "message": "Event finalized successfully",
         "winner": winning_outcome.description,
-        "shares_paid": num_payouts,
+        "shares_paid": sum(payout.shares for payout in payouts),
+        "payouts": payouts,
     }
 
 
-def process_payouts(event: Event, winning_outcome: Outcome, session: Session):
+@router.websocket("/ws")
+async def price_updates(
+    websocket: WebSocket,
+    token: str = Query(...),
+    session: AsyncSession = Depends(get_async_session),
+):
+    """
+    Streams price updates for the events a client subscribes to. Clients send
+    {"action": "subscribe" | "unsubscribe", "event_id": ...} messages and get a
+    PRICE_SNAPSHOT on subscribing, then PRICE_UPDATE and EVENT_CLOSED deltas.
+    """
+    # Browsers can't set headers on a WebSocket, so the JWT comes as a query param
+    if decode_token_subject(token) is None:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    await websocket.accept()
+    subscriber = Subscriber()
+
+    async def receive_requests():
+        while True:
+            request = await websocket.receive_json()
+            action = request.get("action")
+            event_id = request.get("event_id")
+            if not isinstance(event_id, str):
+                subscriber.push(
+                    "error", {"type": "ERROR", "detail": "Missing event_id"}
+                )
+            elif action == "subscribe":
+                await subscribe(event_id)
+            elif action == "unsubscribe":
+                price_feed.unsubscribe(subscriber, event_id)
+            else:
+                subscriber.push("error", {"type": "ERROR", "detail": "Unknown action"})
+
+    async def subscribe(event_id: str):
+        # Loaded on demand: this worker may never have seen the event
+        market = await get_market(event_id, session)
+        # Hand the connection back to the pool between subscriptions
+        await session.close()
+        if market is None:
+            subscriber.push("error", {"type": "ERROR", "detail": "Event not found"})
+        elif len(subscriber.events) >= MAX_SUBSCRIPTIONS:
+            subscriber.push("error", {"type": "ERROR", "detail": "Too many events"})
+        else:
+            price_feed.subscribe(subscriber, event_id)
+            subscriber.push(
+                event_id,
+                {
+                    "type": "PRICE_SNAPSHOT",
+                    "event_id": event_id,
+                    "prices": market.prices(),
+                    "share_totals": dict(market.outcome_shares),
+                },
+            )
+
+    async def send_updates():
+        while True:
+            for message in await subscriber.next_messages():
+                # A client that stops reading gets dropped rather than buffered for
+                await asyncio.wait_for(websocket.send_json(message), SEND_TIMEOUT)
+
+    tasks = [
+        asyncio.create_task(receive_requests()),
+        asyncio.create_task(send_updates()),
+    ]
+    try:
+        done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            error = task.exception()
+            if isinstance(error, asyncio.TimeoutError):
+                await websocket.close(code=status.WS_1013_TRY_AGAIN_LATER)
+            elif error is not None and not isinstance(error, WebSocketDisconnect):
+                raise error
+    finally:
+        for task in tasks:
+            task.cancel()
+        price_feed.remove(subscriber)
+
+
+def process_payouts(
+    event: Event, winning_outcome: Outcome, session: Session
+) -> list[PayoutRead]:
     """
-    Identifies all shares for the winning outcome and credits the
-    users' balances.
+    Credits every holder of the winning outcome with one grouped aggregate
+    and a single set-based UPDATE, and returns the per-user payouts.
     """
-    # 1. Fetch all shares for the winning outcome
-    # We use a join to ensure we get the user objects to update balances
-    statement = select(Share).where(Share.outcome_id == winning_outcome.id)
-    winning_shares = session.exec(statement).all()
-
-    for share in winning_shares:
-        # Payout logic: 1.00 per share
-        # payout_amount = 1.0
-        payout_amount = 1.0
-
-        # Update user balance
-        user = share.user
-        user.balance += payout_amount
-        session.add(user)
-
-    return len(winning_shares)
+    # 1. Total winning shares per user, in one grouped query
+    shares_per_user = (
+        select(Share.user_id, func.sum(Share.quantity).label("shares"))
+        .where(Share.outcome_id == winning_outcome.id)
+        .group_by(Share.user_id)
+        .subquery()
+    )
+    rows = session.exec(
+        select(User.id, User.username, shares_per_user.c.shares).join(
+            shares_per_user, User.id == shares_per_user.c.user_id
+        )
+    ).all()
+    payouts = [
+        PayoutRead(
+            user_id=user_id,
+            username=username,
+            shares=shares,
+            amount=shares * PAYOUT_PER_SHARE,
+        )
+        for user_id, username, shares in rows
+    ]
+    if not payouts:
+        return payouts
+
+    # 2. Apply every balance change with one UPDATE in the caller's transaction
+    user_shares = (
+        select(func.sum(Share.quantity))
+        .where((Share.outcome_id == winning_outcome.id) & (Share.user_id == User.id))
+        .scalar_subquery()
+    )
+    session.execute(
+        update(User)
+        .where(
+            User.id.in_(
+                select(Share.user_id).where(Share.outcome_id == winning_outcome.id)
+            )
+        )
+        .values(balance=User.balance + user_shares * PAYOUT_PER_SHARE)
+        .execution_options(synchronize_session=False)
+    )
+
+    return payouts
@@ -1,55 +1,243 @@
 from typing import List
 
-from fastapi import APIRouter, Depends, HTTPException
-from poly_party.db import get_session
-from poly_party.models import User, UserRead, UserReadWithShares, IconCreate
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from poly_party.conditional import (
+    cache_headers,
+    etag_matches,
+    not_modified,
+    version_etag,
+)
+from poly_party.db import get_async_session
+from poly_party.leaderboard import leaderboard
+from poly_party.models import (
+    Event,
+    LeaderboardEntry,
+    LeaderboardPage,
+    Outcome,
+    PortfolioPage,
+    Position,
+    Share,
+    User,
+    UserRead,
+    UserReadWithShares,
+    IconCreate,
+    leaderboardRanking,
+)
+from poly_party.pagination import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    decode_cursor,
+    encode_cursor,
+)
+from poly_party.rendering import model_response
 from poly_party.security import (
     get_current_user,
 )
-from sqlmodel import Session, select
+from poly_party.user_cache import user_cache
+from sqlalchemy.orm import selectinload
+from sqlmodel import func, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 router = APIRouter()
 
+LEADERBOARD_SIZE = 10
+
 
 @router.get("/", response_model=List[UserRead])
-def get_users(
-    session: Session = Depends(get_session),
+async def get_users(
+    session: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(get_current_user),
+):
+    return (await session.exec(select(User))).all()
+
+
+@router.get("/leaderboard", response_model=LeaderboardPage)
+async def get_leaderboard(
+    ranking: leaderboardRanking = leaderboardRanking.NET_WORTH,
+    offset: int = Query(default=0, ge=0),
+    limit: int = Query(default=LEADERBOARD_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    if_none_match: str | None = Header(default=None),
+    accept_encoding: str | None = Header(default=None),
+    session: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    `limit` users from rank `offset + 1` down, by net worth or balance, read
+    from the in-memory rankings. Pollers get a 304 until a standing changes.
+    """
+    if not leaderboard.loaded:
+        await session.run_sync(leaderboard.ensure_loaded)
+
+    etag = version_etag(
+        "leaderboard", leaderboard.stamp(), ranking.value, offset, limit
+    )
+    headers = cache_headers(etag, None)
+    if etag_matches(if_none_match, etag):
+        return not_modified(headers)
+
+    page = LeaderboardPage(
+        ranking=ranking,
+        total=leaderboard.size(),
+        entries=leaderboard.top(ranking, offset, limit),
+    )
+    return model_response(page, accept_encoding, headers)
+
+
+@router.post("/leaderboard/rebuild", response_model=LeaderboardPage)
+async def rebuild_leaderboard(
+    session: AsyncSession = Depends(get_async_session),
     current_user: User = Depends(get_current_user),
 ):
-    return session.exec(select(User)).all()
+    """Reloads both rankings from the database and returns the new top."""
+    if not current_user.admin:
+        raise HTTPException(
+            status_code=403, detail="Only admins can rebuild the leaderboard"
+        )
+
+    await session.run_sync(leaderboard.load)
+    ranking = leaderboardRanking.NET_WORTH
+    return LeaderboardPage(
+        ranking=ranking,
+        total=leaderboard.size(),
+        entries=leaderboard.top(ranking, 0, LEADERBOARD_SIZE),
+    )
 
 
 # 3. View a specific User and all their tied Shares
 @router.get("/{user_id}/shares", response_model=UserReadWithShares)
-def get_user_shares(
+async def get_user_shares(
     user_id: int,
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_async_session),
     current_user: User = Depends(get_current_user),
 ):
-    user = session.get(User, user_id)
+    user = await session.get(User, user_id, options=[selectinload(User.shares)])
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     return user
 
 
 @router.get("/current", response_model=UserReadWithShares)
-def get_user(
-    session: Session = Depends(get_session),
+async def get_user(
+    session: AsyncSession = Depends(get_async_session),
     current_user: User = Depends(get_current_user),
 ):
-    return current_user
+    # The authenticated user is a cached snapshot, so load the live row (and
+    # its shares, which can't lazy-load on the event loop)
+    return await session.get(User, current_user.id, options=[selectinload(User.shares)])
+
+
+@router.get("/current/rank", response_model=LeaderboardEntry)
+async def get_current_rank(
+    ranking: leaderboardRanking = leaderboardRanking.NET_WORTH,
+    session: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(get_current_user),
+):
+    if not leaderboard.loaded:
+        await session.run_sync(leaderboard.ensure_loaded)
+
+    entry = leaderboard.standing(ranking, current_user.id)
+    if entry is None:
+        raise HTTPException(status_code=404, detail="User not ranked")
+    return entry
+
+
+async def load_portfolio(
+    user_id: str, limit: int, cursor: str | None, session: AsyncSession
+) -> PortfolioPage:
+    """
+    A user's holdings grouped by event and outcome, in one grouped query over
+    their shares, paged by (event_id, outcome_id). Finalized events are left
+    out: their payouts are in the balance already, and their stored prices
+    are the last ones before settlement (the leaderboard skips them too).
+    """
+    statement = (
+        select(
+            Event.id.label("event_id"),
+            Event.title.label("event_title"),
+            Outcome.id.label("outcome_id"),
+            Outcome.description.label("outcome_description"),
+            Outcome.cost.label("current_price"),
+            func.sum(Share.quantity).label("quantity"),
+            func.sum(Share.wager).label("cost_basis"),
+        )
+        .join(Event, Event.id == Share.event_id)
+        .join(Outcome, Outcome.id == Share.outcome_id)
+        .where(Share.user_id == user_id)
+        .where(Event.finalized == False)
+    )
+    if cursor:
+        event_id, outcome_id = decode_cursor(cursor, str, str)
+        statement = statement.where(
+            (Share.event_id > event_id)
+            | ((Share.event_id == event_id) & (Share.outcome_id > outcome_id))
+        )
+    statement = (
+        statement.group_by(Event.id, Outcome.id)
+        .order_by(Event.id, Outcome.id)
+        .limit(limit + 1)
+    )
+    rows = (await session.exec(statement)).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].event_id, rows[-1].outcome_id)
+
+    items = []
+    for row in rows:
+        market_value = row.quantity * row.current_price
+        items.append(
+            Position(
+                **row._mapping,
+                average_price=row.cost_basis / row.quantity,
+                market_value=market_value,
+                unrealized_pnl=market_value - row.cost_basis,
+            )
+        )
+    return PortfolioPage(items=items, next_cursor=next_cursor)
+
+
+@router.get("/current/portfolio", response_model=PortfolioPage)
+async def get_current_portfolio(
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    session: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(get_current_user),
+):
+    return await load_portfolio(current_user.id, limit, cursor, session)
+
+
+@router.get("/{user_id}/portfolio", response_model=PortfolioPage)
+async def get_user_portfolio(
+    user_id: str,
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    session: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    A user's holdings per open event and outcome, with cost basis, current
+    price and unrealized P&L, instead of every share row they ever bought.
+    """
+    if not await session.get(User, user_id):
+        raise HTTPException(status_code=404, detail="User not found")
+    return await load_portfolio(user_id, limit, cursor, session)
+
 
 @router.post("/icon", response_model=UserRead)
-def post_icon(
+async def post_icon(
     icon: IconCreate,
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_async_session),
     current_user: User = Depends(get_current_user),
 ):
+    # Write to the live row, not the cached snapshot of the user
+    user = await session.get(User, current_user.id)
     if not icon.random:
-        current_user.icon_url = icon.icon_url
+        user.icon_url = icon.icon_url
     else:
-        current_user.icon_url = None
-    session.add(current_user)
-    session.commit()
-    session.refresh(current_user)
-    return current_user
+        user.icon_url = None
+    session.add(user)
+    await session.commit()
+    await session.refresh(user)
+    user_cache.invalidate(user.id)
+    return user
@@ -0,0 +1,234 @@
+"""
+Price history candles.
+
+Every fill updates an open/high/low/close candle for each outcome of its
+event, at each resolution in settings.candle_resolutions (seconds), so a
+chart reads a handful of rows per bucket instead of scanning the share
+table. Only buckets that saw a fill get a row.
+
+A fill doesn't write its candles itself: under LMSR every outcome's price
+moves, which would be resolutions x outcomes upserts inside every trade.
+Committed fills queue their price moves in the candle buffer instead, and
+the buffer is flushed every settings.candle_flush_seconds (and before the
+candles are read), folding everything queued into one upsert per candle.
+Each worker process flushes its own fills; when workers' fills share a
+bucket the upserts merge their highs, lows and volumes, and the last flush
+sets the close.
+
+Coarser resolutions are served by merging the buckets of the largest stored
+resolution that divides them, e.g. 5 minutes from the 1 minute candles.
+"""
+
+import threading
+from datetime import datetime, timedelta, timezone
+
+from fastapi import HTTPException
+from poly_party.config import settings
+from poly_party.models import Candle, CandleRead
+from sqlalchemy import func
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlmodel import Session, select
+
+RESOLUTIONS = sorted(settings.candle_resolutions)
+
+EPOCH = datetime(1970, 1, 1)
+
+
+def bucket_start(timestamp: datetime, resolution: int) -> datetime:
+    """The start of the `resolution`-second bucket holding a (naive UTC) time."""
+    seconds = int((timestamp - EPOCH).total_seconds())
+    return EPOCH + timedelta(seconds=seconds - seconds % resolution)
+
+
+def naive_utc(timestamp: datetime | None) -> datetime | None:
+    """Timestamps are stored as naive UTC, so convert any aware one to match."""
+    if timestamp is None or timestamp.tzinfo is None:
+        return timestamp
+    return timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def _upsert(session: Session):
+    """INSERT ... ON CONFLICT DO UPDATE that widens the candle already stored."""
+    # On the table rather than the model, so rows skip the ORM's bulk insert
+    table = Candle.__table__
+    dialect = session.get_bind().dialect.name
+    if dialect == "postgresql":
+        statement = postgresql.insert(table)
+        higher, lower = func.greatest, func.least
+    else:
+        statement = sqlite.insert(table)
+        # SQLite's two-argument max() and min() are scalar, not aggregates
+        higher, lower = func.max, func.min
+    return statement.on_conflict_do_update(
+        index_elements=[table.c.outcome_id, table.c.resolution, table.c.bucket_start],
+        set_={
+            "high": higher(table.c.high, statement.excluded.high),
+            "low": lower(table.c.low, statement.excluded.low),
+            "close": statement.excluded.close,
+            "volume": table.c.volume + statement.excluded.volume,
+        },
+    )
+
+
+def fold(
+    moves: list[
+        tuple[str, dict[str, float], dict[str, float], dict[str, int], datetime]
+    ],
+) -> list[dict]:
+    """
+    Merges fills, in the order they happened, into one row per candle. Each
+    move is an event id, the prices before and after the fill, the shares it
+    bought of each outcome and its (naive UTC) time.
+    """
+    rows: dict[tuple, dict] = {}
+    for event_id, before, after, volume, timestamp in moves:
+        starts = [(r, bucket_start(timestamp, r)) for r in RESOLUTIONS]
+        for outcome_id, price in after.items():
+            # An outcome the fill left alone keeps its last close, no row needed
+            if price == before[outcome_id] and outcome_id not in volume:
+                continue
+            opened = before[outcome_id]
+            high, low = max(opened, price), min(opened, price)
+            traded = volume.get(outcome_id, 0)
+            for resolution, start in starts:
+                row = rows.get((outcome_id, resolution, start))
+                if row is None:
+                    rows[(outcome_id, resolution, start)] = {
+                        "outcome_id": outcome_id,
+                        "event_id": event_id,
+                        "resolution": resolution,
+                        "bucket_start": start,
+                        # A new bucket opens where the price stood before the fill
+                        "open": opened,
+                        "high": high,
+                        "low": low,
+                        "close": price,
+                        "volume": traded,
+                    }
+                else:
+                    row["high"] = max(row["high"], high)
+                    row["low"] = min(row["low"], low)
+                    row["close"] = price
+                    row["volume"] += traded
+    return list(rows.values())
+
+
+def write_candles(session: Session, rows: list[dict]):
+    """Upserts folded candles into the ones already stored (not committed)."""
+    if rows:
+        session.connection().execute(_upsert(session), rows)
+
+
+class CandleBuffer:
+    """Committed fills' price moves, waiting to be written as candles."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # Held while writing, so flushes land in the order their fills did
+        self._flushing = threading.Lock()
+        self._moves: list[tuple] = []
+
+    def add(
+        self,
+        event_id: str,
+        before: dict[str, float],
+        after: dict[str, float],
+        volume: dict[str, int],
+        timestamp: datetime,
+    ):
+        with self._lock:
+            self._moves.append((event_id, before, after, volume, timestamp))
+
+    def pending(self) -> int:
+        return len(self._moves)
+
+    def flush(self, session: Session) -> int:
+        """Writes and commits everything queued; returns how many candle rows."""
+        with self._flushing:
+            with self._lock:
+                moves, self._moves = self._moves, []
+            if not moves:
+                return 0
+            rows = fold(moves)
+            try:
+                write_candles(session, rows)
+                session.commit()
+            except Exception:
+                session.rollback()
+                # Keep them for the next flush, ahead of anything queued since
+                with self._lock:
+                    self._moves[:0] = moves
+                raise
+            return len(rows)
+
+    def clear(self):
+        with self._lock:
+            self._moves = []
+
+
+candle_buffer = CandleBuffer()
+
+
+def stored_resolution(resolution: int) -> int:
+    """The largest stored resolution that a requested one is a multiple of."""
+    for stored in reversed(RESOLUTIONS):
+        if resolution % stored == 0:
+            return stored
+    raise HTTPException(
+        status_code=400,
+        detail=f"Resolution must be a multiple of one of {RESOLUTIONS} seconds",
+    )
+
+
+def downsample(candles: list[Candle], resolution: int) -> list[CandleRead]:
+    """Merges one outcome's candles, in time order, into `resolution` buckets."""
+    merged: list[CandleRead] = []
+    for candle in candles:
+        start = bucket_start(candle.bucket_start, resolution)
+        if merged and merged[-1].bucket_start == start:
+            last = merged[-1]
+            last.high = max(last.high, candle.high)
+            last.low = min(last.low, candle.low)
+            last.close = candle.close
+            last.volume += candle.volume
+        else:
+            merged.append(
+                CandleRead(
+                    bucket_start=start,
+                    open=candle.open,
+                    high=candle.high,
+                    low=candle.low,
+                    close=candle.close,
+                    volume=candle.volume,
+                )
+            )
+    return merged
+
+
+def load_candles(
+    session: Session,
+    event_id: str,
+    resolution: int,
+    start: datetime,
+    end: datetime,
+    outcome_id: str | None = None,
+) -> dict[str, list[CandleRead]]:
+    """Every outcome's candles with buckets starting in [start, end)."""
+    stored = stored_resolution(resolution)
+    statement = select(Candle).where(
+        (Candle.event_id == event_id)
+        & (Candle.resolution == stored)
+        & (Candle.bucket_start >= bucket_start(start, resolution))
+        & (Candle.bucket_start < end)
+    )
+    if outcome_id is not None:
+        statement = statement.where(Candle.outcome_id == outcome_id)
+    statement = statement.order_by(Candle.outcome_id, Candle.bucket_start)
+
+    by_outcome: dict[str, list[Candle]] = {}
+    for candle in session.exec(statement):
+        by_outcome.setdefault(candle.outcome_id, []).append(candle)
+    return {
+        outcome: downsample(candles, resolution)
+        for outcome, candles in by_outcome.items()
+    }
@@ -0,0 +1,45 @@
+"""
+Conditional GET helpers.
+
+Every event carries a version that each change to it (a fill, settlement)
+bumps, so a version, or a hash of the versions on a page, makes a cheap
+ETag. Routes read the versions first and answer a matching If-None-Match
+with 304 before loading anything else.
+"""
+
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime
+
+from fastapi import Response
+
+# Authenticated data: only the client's own cache may keep it, and it has to
+# revalidate before every use
+CACHE_CONTROL = "private, no-cache"
+
+
+def version_etag(*parts) -> str:
+    digest = hashlib.sha1(":".join(str(p) for p in parts).encode()).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Whether an If-None-Match header matches the ETag (weakly, per RFC 9110)."""
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in [tag.removeprefix("W/") for tag in candidates]
+
+
+def cache_headers(etag: str, last_modified: datetime | None) -> dict[str, str]:
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if last_modified is not None:
+        # Stored as naive UTC
+        headers["Last-Modified"] = format_datetime(
+            last_modified.replace(tzinfo=timezone.utc), usegmt=True
+        )
+    return headers
+
+
+def not_modified(headers: dict[str, str]) -> Response:
+    return Response(status_code=304, headers=headers)
@@ -0,0 +1,136 @@
+"""
+Denormalized share counters.
+
+Every outcome and event carries its own share_count (the market-weighted
+share total, value * quantity, the prices are computed from), total_wagered
+and participant_count. Each fill bumps them in the same transaction that
+records it, so reading an outcome's totals is a single row lookup rather
+than an aggregate over the share table. rebuild_counters recomputes them all
+from the share table, and verify_counters reports any that have drifted.
+"""
+
+from datetime import datetime
+
+from poly_party.models import CounterMismatch, Event, Outcome, Share
+from sqlalchemy import Connection, distinct
+from sqlmodel import Session, func, select, update
+
+COUNTERS = ("share_count", "total_wagered", "participant_count")
+
+
+def record_fill(
+    session: Session,
+    event_id: str,
+    outcome_id: str,
+    user_id: str,
+    units: int,
+    wager: float,
+):
+    """
+    Adds a fill to its outcome's and event's counters. Must run before the
+    fill's Share is added to the session, or the bettor would count as a
+    returning participant.
+    """
+    new_to_outcome = (
+        session.exec(
+            select(Share.id)
+            .where((Share.outcome_id == outcome_id) & (Share.user_id == user_id))
+            .limit(1)
+        ).first()
+        is None
+    )
+    new_to_event = new_to_outcome and (
+        session.exec(
+            select(Share.id)
+            .where((Share.event_id == event_id) & (Share.user_id == user_id))
+            .limit(1)
+        ).first()
+        is None
+    )
+
+    # Relative updates, so they never overwrite a concurrent writer's count
+    session.execute(
+        update(Outcome)
+        .where(Outcome.id == outcome_id)
+        .values(
+            share_count=Outcome.share_count + units,
+            total_wagered=Outcome.total_wagered + wager,
+            participant_count=Outcome.participant_count + int(new_to_outcome),
+        )
+        .execution_options(synchronize_session=False)
+    )
+    session.execute(
+        update(Event)
+        .where(Event.id == event_id)
+        .values(
+            share_count=Event.share_count + units,
+            total_wagered=Event.total_wagered + wager,
+            participant_count=Event.participant_count + int(new_to_event),
+            # A fill changes the event as clients see it
+            version=Event.version + 1,
+            updated_at=datetime.utcnow(),
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+def _actual(key):
+    """The counters of whatever `key` matches, aggregated from the share table."""
+    return (
+        select(func.sum(Share.value * Share.quantity)).where(key).scalar_subquery(),
+        select(func.sum(Share.wager)).where(key).scalar_subquery(),
+        select(func.count(distinct(Share.user_id))).where(key).scalar_subquery(),
+    )
+
+
+def rebuild_counters(connection: Session | Connection):
+    """Recomputes every counter from the share table, one UPDATE per table."""
+    for model, key in ((Outcome, Share.outcome_id), (Event, Share.event_id)):
+        share_count, total_wagered, participants = _actual(key == model.id)
+        connection.execute(
+            update(model)
+            .values(
+                share_count=func.coalesce(share_count, 0),
+                total_wagered=func.coalesce(total_wagered, 0.0),
+                participant_count=participants,
+            )
+            .execution_options(synchronize_session=False)
+        )
+
+
+def verify_counters(session: Session) -> list[CounterMismatch]:
+    """Every stored counter that differs from the share table."""
+    mismatches = []
+    for model, kind, key, event_id in (
+        (Outcome, "outcome", Share.outcome_id, Outcome.event_id),
+        (Event, "event", Share.event_id, Event.id),
+    ):
+        share_count, total_wagered, participants = _actual(key == model.id)
+        rows = session.exec(
+            select(
+                model.id,
+                event_id,
+                model.share_count,
+                model.total_wagered,
+                model.participant_count,
+                func.coalesce(share_count, 0),
+                func.coalesce(total_wagered, 0.0),
+                participants,
+            )
+        )
+        for row_id, row_event_id, *values in rows:
+            stored, actual = values[:3], values[3:]
+            for counter, stored_value, actual_value in zip(COUNTERS, stored, actual):
+                # Wagers are float sums, so allow for rounding in the order added
+                if abs(stored_value - actual_value) > 1e-6:
+                    mismatches.append(
+                        CounterMismatch(
+                            kind=kind,
+                            id=row_id,
+                            event_id=row_event_id,
+                            counter=counter,
+                            stored=stored_value,
+                            actual=actual_value,
+                        )
+                    )
+    return mismatches
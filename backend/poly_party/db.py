@@ -1,16 +1,114 @@
-from sqlmodel import Session, SQLModel, create_engine
+from poly_party.config import settings
+from poly_party.metrics import instrument_pool
+from poly_party.migrations import migrate
+from sqlalchemy import URL, Engine, event, make_url
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import Session, create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-sqlite_file_name = "database.db"
-sqlite_url = f"sqlite:///{sqlite_file_name}"
+# The driver the async engine uses for each backend, unless the URL already
+# names one that can run async
+ASYNC_DRIVERS = {"sqlite": "aiosqlite", "postgresql": "psycopg"}
+ASYNC_CAPABLE = {"aiosqlite", "psycopg", "asyncpg"}
 
-connect_args = {"check_same_thread": False}
-engine = create_engine(sqlite_url, connect_args=connect_args)
+
+def async_url(url: str | URL) -> URL:
+    url = make_url(url)
+    backend, driver = url.get_backend_name(), url.get_driver_name()
+    if backend in ASYNC_DRIVERS and driver not in ASYNC_CAPABLE:
+        url = url.set(drivername=f"{backend}+{ASYNC_DRIVERS[backend]}")
+    return url
+
+
+def engine_options(url: str | URL) -> dict:
+    """Pool settings (and SQLite's connect args) for an engine on `url`."""
+    url = make_url(url)
+    if url.get_backend_name() == "sqlite":
+        options = {"connect_args": {"check_same_thread": False}}
+        if url.database in (None, "", ":memory:"):
+            return options  # One connection per thread, no pool to size
+    else:
+        options = {}
+    return options | {
+        "pool_size": settings.database_pool_size,
+        "max_overflow": settings.database_max_overflow,
+        "pool_recycle": settings.database_pool_recycle,
+        "pool_pre_ping": settings.database_pool_pre_ping,
+    }
+
+
+engine = create_engine(settings.database_url, **engine_options(settings.database_url))
+
+# Read and trade routes run on the event loop and use this engine instead, so
+# a request waiting on the database doesn't hold a threadpool worker
+async_engine = create_async_engine(
+    async_url(settings.database_url), **engine_options(settings.database_url)
+)
+
+instrument_pool(engine, "sync")
+instrument_pool(async_engine.sync_engine, "async")
+
+
+def apply_sqlite_profile(engine: Engine):
+    """Applies the configured journal mode, sync level and busy timeout to
+    every new connection of a SQLite engine."""
+
+    @event.listens_for(engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        # The timeout first: switching the journal mode needs the lock too,
+        # and workers starting together would otherwise fail on it at once
+        cursor.execute(f"PRAGMA busy_timeout={int(settings.sqlite_busy_timeout_ms)}")
+        cursor.execute(f"PRAGMA journal_mode={settings.sqlite_journal_mode}")
+        cursor.execute(f"PRAGMA synchronous={settings.sqlite_synchronous}")
+        cursor.close()
+
+    @event.listens_for(engine, "begin")
+    def begin_immediate(connection):
+        # pysqlite only opens a transaction right before the first write, so
+        # anything read first was read without the lock. Transactions that
+        # ask for it (see begin_write) take the write lock up front instead
+        if connection.get_execution_options().get("sqlite_begin") == "IMMEDIATE":
+            connection.exec_driver_sql("BEGIN IMMEDIATE")
+
+
+def begin_write(session: Session):
+    """
+    Makes the session's transaction one that will write what it reads. On
+    SQLite it takes the database's write lock before the next read (BEGIN
+    IMMEDIATE), so no other process can commit in between. Other databases
+    lock rows as they go.
+    """
+    if session.get_bind().dialect.name != "sqlite":
+        return
+    if not session.in_transaction():
+        session.connection(execution_options={"sqlite_begin": "IMMEDIATE"})
+        return
+    # Already begun, on a connection the session keeps until it ends. pysqlite
+    # only really opens a transaction for a write, which took the lock already
+    connection = session.connection()
+    dbapi_connection = connection.connection.dbapi_connection
+    # aiosqlite's adapter keeps the sqlite3 connection's state one level down
+    if not getattr(dbapi_connection, "_connection", dbapi_connection).in_transaction:
+        connection.exec_driver_sql("BEGIN IMMEDIATE")
+
+
+if engine.dialect.name == "sqlite":
+    apply_sqlite_profile(engine)
+    apply_sqlite_profile(async_engine.sync_engine)
 
 
 def create_db_and_tables():
-    SQLModel.metadata.create_all(engine)
+    # Creates a fresh database or upgrades an existing one in place
+    migrate(engine)
 
 
 def get_session():
     with Session(engine) as session:
         yield session
+
+
+async def get_async_session():
+    # Nothing may lazy-load outside the loop, so keep attributes after commit
+    async with AsyncSession(async_engine, expire_on_commit=False) as session:
+        yield session
@@ -2,26 +2,42 @@ from datetime import datetime, timedelta
 
 from fastapi import HTTPException
 from poly_party.api import auth
-from poly_party.api.events import create_event, place_bet
+from poly_party.api.events import create_event
 from poly_party.config import settings
-from poly_party.models import EventCreate, OutcomeBase, User, eventType
+from poly_party.models import Event, EventCreate, OutcomeBase, User, eventType
+from poly_party.trading import execute_bet
 from sqlmodel import Session, select
 
 
-def create_example_users(session: Session):
-    try:
-        _ = auth.create_user_locally(
+def user_exists(username: str, session: Session) -> bool:
+    return (
+        session.exec(select(User.id).where(User.username == username)).first()
+        is not None
+    )
+
+
+def create_admin_user(session: Session):
+    # Checked first, so only the very first start pays for a password hash
+    if not user_exists("admin", session):
+        auth.create_user_locally(
             username="admin", password=settings.admin_pass, admin=True, session=session
         )
 
-        _ = auth.create_user_locally(
+
+def create_example_users(session: Session):
+    if not user_exists("greg", session):
+        auth.create_user_locally(
             username="greg", password=settings.admin_pass, admin=False, session=session
         )
-    except HTTPException:
-        pass
+
+
+EXAMPLE_EVENT_TITLE = "Liam loses interest in pibble"
 
 
 def create_example_event(session: Session):
+    if session.exec(select(Event.id).where(Event.title == EXAMPLE_EVENT_TITLE)).first():
+        return
+
     outcome_yes = OutcomeBase(
         description="Liam maintains interest.", value=0, cost=0.50
     )
@@ -30,7 +46,7 @@ def create_example_event(session: Session):
 
     # 2. Define the EventCreate object
     example_event = EventCreate(
-        title="Liam loses interest in pibble",
+        title=EXAMPLE_EVENT_TITLE,
         description="Will liam lose interest in pibble?",
         start_time=datetime.utcnow(),
         end_time=datetime.utcnow() + timedelta(hours=1),
@@ -44,8 +60,8 @@ def create_example_event(session: Session):
         event = create_event(example_event, session=session, current_user=None)
         test_user = session.exec(select(User).where(User.username == "greg")).first()
 
-        _ = place_bet(
-            event.id, event.outcomes[0].id, 1, 1.00, session, current_user=test_user
+        _ = execute_bet(
+            event.id, event.outcomes[0].id, 1, 1.00, session, user=test_user
         )
 
     except HTTPException:
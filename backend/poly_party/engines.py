@@ -0,0 +1,151 @@
+"""
+Pricing engines.
+
+Each event is priced by an engine: the share-ratio rule in pricing.py, or an
+LMSR market maker. An event can name its engine when it's created, otherwise
+the default for its type in settings.pricing_engines applies, and failing
+that the share-ratio rule.
+
+Engines take the share totals of all of an event's outcomes at once, in a
+fixed order, so repricing an event after a fill is one call however many
+outcomes it has. For LMSR that call is a single vectorized NumPy pass.
+"""
+
+from abc import ABC, abstractmethod
+
+import numpy as np
+from poly_party.config import settings
+from poly_party.models import OutcomeQuote, PriceTier, eventType, pricingEngine
+from poly_party.pricing import quote_shares, spot_price
+
+
+class PricingEngine(ABC):
+    """
+    `shares` are the market totals of every outcome of an event, and `weight`
+    is how much each share bought adds to them (the event's value).
+    """
+
+    @abstractmethod
+    def prices(self, shares: list[int], weight: int) -> list[float]:
+        """The price of the next share of every outcome."""
+
+    @abstractmethod
+    def quote(
+        self,
+        shares: list[int],
+        index: int,
+        quantity: int,
+        weight: int,
+        include_prices: bool = False,
+    ) -> OutcomeQuote:
+        """Prices an order of `quantity` shares of the outcome at `index`."""
+
+
+class ShareRatioEngine(PricingEngine):
+    """Each outcome's share of the event total, clamped (see pricing.py)."""
+
+    def prices(self, shares, weight):
+        total = sum(shares)
+        return [spot_price(outcome, total, len(shares)) for outcome in shares]
+
+    def quote(self, shares, index, quantity, weight, include_prices=False):
+        return quote_shares(
+            shares[index], sum(shares), len(shares), quantity, include_prices
+        )
+
+
+def _logsumexp(levels: np.ndarray) -> float:
+    if not levels.size:
+        return -np.inf
+    top = levels.max()
+    return float(top + np.log(np.exp(levels - top).sum()))
+
+
+class LMSREngine(PricingEngine):
+    """
+    Hanson's logarithmic market scoring rule. The market maker's cost
+    function is C(q) = b * ln(sum(exp(q_i / b))) over the shares held of each
+    outcome, a trade costs the change in C, and prices always sum to 1. The
+    liquidity b sets how far a trade moves the price; the most the market
+    maker can lose on an event is b * ln(number of outcomes).
+    """
+
+    def __init__(self, liquidity: float):
+        if liquidity <= 0:
+            raise ValueError("LMSR liquidity must be positive")
+        self.liquidity = liquidity
+
+    def _levels(self, shares, weight) -> np.ndarray:
+        """q / b, with q counted in shares rather than market units."""
+        return np.asarray(shares, dtype=float) / (weight * self.liquidity)
+
+    def prices(self, shares, weight):
+        levels = self._levels(shares, weight)
+        if not levels.size:
+            return []
+        # Softmax, shifted so the largest exponent is 0
+        weights = np.exp(levels - levels.max())
+        return (weights / weights.sum()).tolist()
+
+    def quote(self, shares, index, quantity, weight, include_prices=False):
+        if quantity < 1:
+            raise ValueError("Quantity must be at least 1")
+
+        b = self.liquidity
+        levels = self._levels(shares, weight)
+        others = _logsumexp(np.delete(levels, index))
+
+        def cost_level(bought):
+            # ln(sum(exp(q / b))) once `bought` more shares of the outcome are held
+            return np.logaddexp(others, levels[index] + np.asarray(bought) / b)
+
+        def share_price(k):
+            # What share number k of the order costs
+            return float(b * (cost_level(k + 1) - cost_level(k)))
+
+        total_cost = float(b * (cost_level(quantity) - cost_level(0)))
+        first, last = share_price(0), share_price(quantity - 1)
+        prices = None
+        if include_prices:
+            prices = (b * np.diff(cost_level(np.arange(quantity + 1)))).tolist()
+
+        return OutcomeQuote(
+            quantity=quantity,
+            total_cost=total_cost,
+            average_price=total_cost / quantity,
+            marginal_price=first,
+            final_price=last,
+            next_price=share_price(quantity),
+            tiers=[
+                PriceTier(
+                    kind="curve",
+                    start=0,
+                    quantity=quantity,
+                    start_price=first,
+                    end_price=last,
+                    cost=total_cost,
+                )
+            ],
+            prices=prices,
+        )
+
+
+ENGINES: dict[pricingEngine, PricingEngine] = {
+    pricingEngine.SHARE_RATIO: ShareRatioEngine(),
+    pricingEngine.LMSR: LMSREngine(settings.lmsr_liquidity),
+}
+
+# Fail at startup, not on the first trade, if the settings name a bad engine
+DEFAULT_ENGINES = {
+    eventType(event_type): pricingEngine(engine)
+    for event_type, engine in settings.pricing_engines.items()
+}
+
+
+def engine_for(
+    event_type: eventType, engine: pricingEngine | None = None
+) -> PricingEngine:
+    """The engine an event names, or else the default for its type."""
+    if engine is None:
+        engine = DEFAULT_ENGINES.get(event_type, pricingEngine.SHARE_RATIO)
+    return ENGINES[engine]
@@ -0,0 +1,84 @@
+"""
+Password hashing off the request path.
+
+Argon2 is slow and memory hungry on purpose, so a burst of logins hashed in
+request threads would take every worker and starve the trading routes. Instead
+hashes run in a small process pool, and only a bounded number may be waiting
+on it at once: past that, a login is turned away with a 503 straight away
+rather than queueing behind everyone else's.
+"""
+
+import asyncio
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor
+
+from fastapi import HTTPException
+from poly_party.config import settings
+from pwdlib import PasswordHash
+from pwdlib.hashers.argon2 import Argon2Hasher
+
+# Hashes made with other parameters still verify, and get rehashed on login
+password_hash = PasswordHash(
+    (
+        Argon2Hasher(
+            time_cost=settings.argon2_time_cost,
+            memory_cost=settings.argon2_memory_cost,
+            parallelism=settings.argon2_parallelism,
+        ),
+    )
+)
+
+
+# --- Run inside the pool's worker processes ---
+
+
+def hash_in_worker(password: str) -> str:
+    return password_hash.hash(password)
+
+
+def verify_in_worker(password: str, hashed_password: str) -> tuple[bool, str | None]:
+    return password_hash.verify_and_update(password, hashed_password)
+
+
+class HashingPool:
+    def __init__(self, workers: int, max_pending: int):
+        self.workers = workers
+        self.max_pending = max_pending
+        self._pending = 0
+        self._executor: Executor | None = None
+
+    def _get_executor(self) -> Executor | None:
+        # Zero workers hashes on the default threadpool instead (tests, tiny hosts)
+        if self._executor is None and self.workers > 0:
+            # spawn: forking a process that is already running threads isn't safe
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._executor
+
+    async def run(self, fn, *args):
+        """Runs `fn` in the pool, or fails with a 503 if too many are waiting."""
+        # Only touched from the event loop, so a plain counter is enough
+        if self._pending >= self.max_pending:
+            raise HTTPException(
+                status_code=503,
+                detail="Too many logins at once, try again shortly",
+                headers={"Retry-After": "1"},
+            )
+        self._pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), fn, *args)
+        finally:
+            self._pending -= 1
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
+
+
+hashing_pool = HashingPool(
+    settings.password_hash_workers, settings.password_hash_max_pending
+)
@@ -0,0 +1,427 @@
+"""
+In-process leaderboard.
+
+Every user is ranked by balance and by net worth: their balance plus their
+open positions (shares in events not yet settled) valued at each outcome's
+current price. Both rankings live in memory and are kept in step the way the
+market state is, by applying each fill and payout after its transaction
+commits, so the scoreboard never has to aggregate the share table. A fill
+moves the prices of its event, and with them every holder's position there:
+the bettor is revalued at once, the other holders are marked stale and
+revalued in one pass per event before the next query, so a run of fills on
+a busy event costs one revaluation rather than one per fill.
+
+The rankings are loaded from the database on first use (and at startup) and
+can be rebuilt from it at any time; until loaded, updates are ignored since
+the load will see them anyway. A write holds writing() from before it
+commits until its update is applied, and a load whose read overlapped one
+can't tell whether it saw that write, so it reads again.
+
+Each worker process keeps its own rankings and only applies the fills and
+payouts made through it, so with several workers a leaderboard misses the
+others' until it's next loaded. Set LEADERBOARD_REFRESH_SECONDS to reload it
+periodically.
+"""
+
+import random
+import threading
+import uuid
+from contextlib import contextmanager
+
+from fastapi import HTTPException
+from poly_party.models import (
+    Event,
+    LeaderboardEntry,
+    Outcome,
+    Share,
+    User,
+    leaderboardRanking,
+)
+from sqlmodel import Session, func, select
+
+# Reads a load makes before giving up on a moment with no write in flight
+LOAD_ATTEMPTS = 20
+
+
+class _Node:
+    __slots__ = ("key", "next", "span")
+
+    def __init__(self, key, level: int):
+        self.key = key
+        self.next: list[_Node | None] = [None] * level
+        # How many positions each link skips ahead
+        self.span = [0] * level
+
+
+class RankedSet:
+    """
+    Keys in sorted order, in a skip list whose links count the entries they
+    skip (the structure behind Redis's sorted sets), so inserting, removing,
+    finding a key's rank and finding the key at a rank are all O(log n).
+    """
+
+    MAX_LEVEL = 32
+
+    def __init__(self):
+        self._head = _Node(None, self.MAX_LEVEL)
+        self._level = 1
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    @staticmethod
+    def _random_level() -> int:
+        level = 1
+        while level < RankedSet.MAX_LEVEL and random.random() < 0.25:
+            level += 1
+        return level
+
+    def add(self, key):
+        update: list[_Node] = [self._head] * self.MAX_LEVEL
+        rank = [0] * self.MAX_LEVEL
+        node = self._head
+        for i in reversed(range(self._level)):
+            rank[i] = 0 if i == self._level - 1 else rank[i + 1]
+            while node.next[i] is not None and node.next[i].key < key:
+                rank[i] += node.span[i]
+                node = node.next[i]
+            update[i] = node
+
+        level = self._random_level()
+        if level > self._level:
+            for i in range(self._level, level):
+                self._head.span[i] = self._size
+            self._level = level
+
+        new = _Node(key, level)
+        for i in range(level):
+            new.next[i] = update[i].next[i]
+            update[i].next[i] = new
+            new.span[i] = update[i].span[i] - (rank[0] - rank[i])
+            update[i].span[i] = rank[0] - rank[i] + 1
+        for i in range(level, self._level):
+            update[i].span[i] += 1
+        self._size += 1
+
+    def remove(self, key):
+        update: list[_Node] = [self._head] * self.MAX_LEVEL
+        node = self._head
+        for i in reversed(range(self._level)):
+            while node.next[i] is not None and node.next[i].key < key:
+                node = node.next[i]
+            update[i] = node
+
+        node = node.next[0]
+        if node is None or node.key != key:
+            raise KeyError(key)
+        for i in range(self._level):
+            if update[i].next[i] is node:
+                update[i].span[i] += node.span[i] - 1
+                update[i].next[i] = node.next[i]
+            else:
+                update[i].span[i] -= 1
+        while self._level > 1 and self._head.next[self._level - 1] is None:
+            self._level -= 1
+        self._size -= 1
+
+    def rank(self, key) -> int:
+        """The 0-based position of a key."""
+        node, rank = self._head, 0
+        for i in reversed(range(self._level)):
+            while node.next[i] is not None and node.next[i].key <= key:
+                rank += node.span[i]
+                node = node.next[i]
+            if node is not self._head and node.key == key:
+                return rank - 1
+        raise KeyError(key)
+
+    def slice(self, start: int, count: int) -> list:
+        """Up to `count` keys from position `start` on."""
+        if start >= self._size or count <= 0:
+            return []
+        node, traversed = self._head, 0
+        for i in reversed(range(self._level)):
+            while node.next[i] is not None and traversed + node.span[i] <= start + 1:
+                traversed += node.span[i]
+                node = node.next[i]
+        keys = []
+        while node is not None and len(keys) < count:
+            keys.append(node.key)
+            node = node.next[0]
+        return keys
+
+
+class _Standing:
+    __slots__ = ("user_id", "username", "balance", "positions")
+
+    def __init__(self, user_id: str, username: str, balance: float):
+        self.user_id = user_id
+        self.username = username
+        self.balance = balance
+        self.positions = 0.0  # Open positions at current prices
+
+    @property
+    def net_worth(self) -> float:
+        return self.balance + self.positions
+
+    def key(self, ranking: leaderboardRanking):
+        score = (
+            self.net_worth if ranking == leaderboardRanking.NET_WORTH else self.balance
+        )
+        # Highest first, ties in a fixed order
+        return (-score, self.user_id)
+
+
+class Leaderboard:
+    def __init__(self):
+        self._lock = threading.Lock()
+        # Keeps a restarted process's versions from matching old ETags
+        self._instance = uuid.uuid4().hex
+        # Writes between their commit and their update, and how many finished
+        self._writing = 0
+        self._written = 0
+        self._reset()
+
+    def _reset(self):
+        self.loaded = False
+        self.version = 0  # Bumped by every change, for ETags
+        self._rankings = {ranking: RankedSet() for ranking in leaderboardRanking}
+        self._standings: dict[str, _Standing] = {}
+        # Open events: shares held per user and outcome, prices, and the
+        # value of each holder's position
+        self._holdings: dict[str, dict[str, dict[str, int]]] = {}
+        self._prices: dict[str, dict[str, float]] = {}
+        self._values: dict[str, dict[str, float]] = {}
+        # Events whose prices moved since their holders were last valued
+        self._stale: set[str] = set()
+
+    # --- Loading ---
+
+    def load(self, session: Session):
+        """Rebuilds both rankings from the database."""
+        for _ in range(LOAD_ATTEMPTS):
+            with self._lock:
+                quiet = self._writing == 0
+                written = self._written
+            snapshot = self._read(session)
+            with self._lock:
+                # Every write either committed before the read began, and is in
+                # it, or hasn't been applied yet, and will be on top of it
+                if quiet and self._writing == 0 and self._written == written:
+                    self._install(*snapshot)
+                    return
+        raise HTTPException(
+            status_code=503,
+            detail="Too many trades to rebuild the leaderboard, try again",
+        )
+
+    @staticmethod
+    def _read(session: Session):
+        users = session.exec(select(User.id, User.username, User.balance)).all()
+        prices = session.exec(
+            select(Outcome.event_id, Outcome.id, Outcome.cost)
+            .join(Event, Event.id == Outcome.event_id)
+            .where(Event.finalized == False)
+        ).all()
+        holdings = session.exec(
+            select(
+                Share.event_id,
+                Share.user_id,
+                Share.outcome_id,
+                func.sum(Share.quantity),
+            )
+            .join(Event, Event.id == Share.event_id)
+            .where(Event.finalized == False)
+            .group_by(Share.event_id, Share.user_id, Share.outcome_id)
+        ).all()
+        return users, prices, holdings
+
+    def _install(self, users, prices, holdings):
+        version = self.version
+        self._reset()
+        self.version = version + 1
+        for user_id, username, balance in users:
+            self._standings[user_id] = _Standing(user_id, username, balance)
+        for event_id, outcome_id, cost in prices:
+            self._prices.setdefault(event_id, {})[outcome_id] = cost
+        for event_id, user_id, outcome_id, quantity in holdings:
+            held = self._holdings.setdefault(event_id, {}).setdefault(user_id, {})
+            held[outcome_id] = quantity
+        for event_id in self._holdings:
+            for user_id, change in self._revalue(event_id).items():
+                self._standings[user_id].positions += change
+        for standing in self._standings.values():
+            self._rank(standing)
+        self.loaded = True
+
+    def ensure_loaded(self, session: Session):
+        if not self.loaded:
+            self.load(session)
+
+    @contextmanager
+    def writing(self):
+        """Held by a write from before it commits until its update is applied."""
+        with self._lock:
+            self._writing += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._writing -= 1
+                self._written += 1
+
+    # --- Updates, applied after their transaction commits ---
+
+    # A standing's keys are its scores, so it comes out of both rankings
+    # before they change and goes back in after
+
+    def _rank(self, standing: _Standing):
+        for ranking, ranked in self._rankings.items():
+            ranked.add(standing.key(ranking))
+
+    def _unrank(self, standing: _Standing):
+        for ranking, ranked in self._rankings.items():
+            ranked.remove(standing.key(ranking))
+
+    def _revalue(
+        self, event_id: str, user_ids: list[str] | None = None
+    ) -> dict[str, float]:
+        """
+        Revalues the positions in an event, every holder's unless `user_ids`
+        names some; returns each holder's change.
+        """
+        prices = self._prices.get(event_id, {})
+        values = self._values.setdefault(event_id, {})
+        holdings = self._holdings.get(event_id, {})
+        if user_ids is not None:
+            holdings = {user_id: holdings[user_id] for user_id in user_ids}
+        changes = {}
+        for user_id, held in holdings.items():
+            value = sum(
+                prices[outcome_id] * quantity for outcome_id, quantity in held.items()
+            )
+            change = value - values.get(user_id, 0.0)
+            values[user_id] = value
+            if change and user_id in self._standings:
+                changes[user_id] = change
+        return changes
+
+    def _move_positions(self, changes: dict[str, float]):
+        for user_id, change in changes.items():
+            holder = self._standings[user_id]
+            self._unrank(holder)
+            holder.positions += change
+            self._rank(holder)
+
+    def _refresh(self):
+        """Revalues the holders of every event whose prices have moved."""
+        for event_id in self._stale:
+            self._move_positions(self._revalue(event_id))
+        self._stale.clear()
+
+    def add_user(self, user: User):
+        with self._lock:
+            if not self.loaded or user.id in self._standings:
+                return
+            standing = _Standing(user.id, user.username, user.balance)
+            self._standings[user.id] = standing
+            self._rank(standing)
+            self.version += 1
+
+    def record_fills(
+        self,
+        user_id: str,
+        cost: float,
+        bought: dict[str, dict[str, int]],
+        prices: dict[str, dict[str, float]],
+    ):
+        """
+        A user paid `cost` for the shares `bought` per event and outcome, which
+        moved each event's outcomes to the given prices.
+        """
+        with self._lock:
+            if not self.loaded:
+                return
+            standing = self._standings.get(user_id)
+            if standing is not None:
+                self._unrank(standing)
+                standing.balance -= cost
+                self._rank(standing)
+
+            for event_id, fills in bought.items():
+                held = self._holdings.setdefault(event_id, {}).setdefault(user_id, {})
+                for outcome_id, quantity in fills.items():
+                    held[outcome_id] = held.get(outcome_id, 0) + quantity
+                self._prices[event_id] = dict(prices[event_id])
+                # The other holders wait for the next query
+                self._stale.add(event_id)
+                self._move_positions(self._revalue(event_id, [user_id]))
+            self.version += 1
+
+    def record_settlement(self, event_id: str, payouts: dict[str, float]):
+        """An event paid out; its positions are now balance, not holdings."""
+        with self._lock:
+            if not self.loaded:
+                return
+            # Positions hold whatever was last valued, stale or not
+            values = self._values.pop(event_id, {})
+            self._holdings.pop(event_id, None)
+            self._prices.pop(event_id, None)
+            self._stale.discard(event_id)
+            for user_id in values.keys() | payouts.keys():
+                standing = self._standings.get(user_id)
+                if standing is None:
+                    continue
+                self._unrank(standing)
+                standing.positions -= values.get(user_id, 0.0)
+                standing.balance += payouts.get(user_id, 0.0)
+                self._rank(standing)
+            self.version += 1
+
+    # --- Queries ---
+
+    def _entry(self, standing: _Standing, rank: int) -> LeaderboardEntry:
+        return LeaderboardEntry(
+            rank=rank + 1,
+            user_id=standing.user_id,
+            username=standing.username,
+            balance=standing.balance,
+            net_worth=standing.net_worth,
+        )
+
+    def stamp(self) -> str:
+        """Changes whenever any standing does."""
+        return f"{self._instance}:{self.version}"
+
+    def size(self) -> int:
+        return len(self._standings)
+
+    def top(
+        self, ranking: leaderboardRanking, offset: int, limit: int
+    ) -> list[LeaderboardEntry]:
+        with self._lock:
+            self._refresh()
+            keys = self._rankings[ranking].slice(offset, limit)
+            return [
+                self._entry(self._standings[user_id], offset + i)
+                for i, (_, user_id) in enumerate(keys)
+            ]
+
+    def standing(
+        self, ranking: leaderboardRanking, user_id: str
+    ) -> LeaderboardEntry | None:
+        with self._lock:
+            self._refresh()
+            standing = self._standings.get(user_id)
+            if standing is None:
+                return None
+            rank = self._rankings[ranking].rank(standing.key(ranking))
+            return self._entry(standing, rank)
+
+    def clear(self):
+        with self._lock:
+            self._reset()
+
+
+leaderboard = Leaderboard()
@@ -1,8 +1,25 @@
+import asyncio
+import logging
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from poly_party.api import auth, events, users
-from poly_party.db import create_db_and_tables, get_session
-from poly_party.db_initialization import create_example_event, create_example_users
+from poly_party.candles import candle_buffer
+from poly_party.config import settings
+from poly_party.db import async_engine, create_db_and_tables, engine
+from poly_party.db_initialization import (
+    create_admin_user,
+    create_example_event,
+    create_example_users,
+)
+from poly_party.hashing import hashing_pool
+from poly_party.leaderboard import leaderboard
+from poly_party.market_state import market_state
+from poly_party.metrics import MetricsMiddleware, instrument_engine, registry
+from sqlmodel import Session
+
+logger = logging.getLogger(__name__)
 
 app = FastAPI(title="FastAPI + SQLModel Auth")
 
@@ -14,15 +31,68 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Per-route latency, status codes and SQL counts, served on /metrics
+app.add_middleware(MetricsMiddleware)
+instrument_engine(engine)
+instrument_engine(async_engine.sync_engine)
+
 
 # Database initialization
 @app.on_event("startup")
 def on_startup():
     create_db_and_tables()
-    session = next(get_session())
+    with Session(engine) as session:
+        create_admin_user(session)
+        if settings.seed_example_data:
+            create_example_users(session)
+            create_example_event(session)
+
+        # Warm the in-memory market state so quotes never hit the share table
+        market_state.load_all(session)
+        leaderboard.load(session)
+
+
+def flush_candles():
+    # Off the fill path: bets only queue their price moves
+    with Session(engine) as session:
+        candle_buffer.flush(session)
+
+
+def reload_leaderboard():
+    # Picks up the fills and payouts other worker processes applied
+    with Session(engine) as session:
+        leaderboard.load(session)
+
 
-    create_example_users(session)
-    create_example_event(session)
+async def run_periodically(seconds: float, job):
+    while True:
+        await asyncio.sleep(seconds)
+        try:
+            await asyncio.to_thread(job)
+        except Exception:
+            logger.exception("%s failed, retrying next time", job.__name__)
+
+
+@app.on_event("startup")
+async def start_background_jobs():
+    jobs = [(settings.candle_flush_seconds, flush_candles)]
+    if settings.leaderboard_refresh_seconds:
+        jobs.append((settings.leaderboard_refresh_seconds, reload_leaderboard))
+    app.state.background_jobs = [
+        asyncio.create_task(run_periodically(seconds, job)) for seconds, job in jobs
+    ]
+
+
+@app.on_event("shutdown")
+async def stop_background_jobs():
+    for task in app.state.background_jobs:
+        task.cancel()
+    await asyncio.to_thread(flush_candles)
+
+
+@app.on_event("shutdown")
+def on_shutdown():
+    hashing_pool.shutdown()
 
 
 # Include Routers
@@ -34,3 +104,10 @@ app.include_router(events.router, prefix="/events", tags=["Events"])
 @app.get("/")
 def root():
     return {"message": "API is running!"}
+
+
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+def metrics():
+    return PlainTextResponse(
+        registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
@@ -0,0 +1,226 @@
+"""
+In-process market state.
+
+Every event's share totals live here so quotes and post-trade repricing never
+have to aggregate the share table. The store is filled from the database once
+at startup (and lazily for anything it hasn't seen), then kept in step by
+applying each fill after its transaction commits. The database stays the
+durable record: shares, outcome costs and the share counters on each outcome
+are still written through SQLModel, and loading reads those counters.
+
+Each worker process has its own store, so trades re-read their event's
+counters under its row lock (see trading.py) rather than trusting totals
+another worker may have moved. Quotes use the local totals while they're
+fresh and re-read them once they're older than market_state_ttl_seconds.
+
+Prices come from each event's pricing engine (see engines.py).
+"""
+
+import threading
+import time
+
+from poly_party.config import settings
+from poly_party.engines import PricingEngine, ShareRatioEngine, engine_for
+from poly_party.models import Event, Outcome, OutcomeQuote
+from sqlmodel import Session, select
+
+
+class EventMarket:
+    """Share totals and current prices for the outcomes of a single event."""
+
+    def __init__(
+        self,
+        event_id: str,
+        outcome_shares: dict[str, int],
+        engine: PricingEngine | None = None,
+        weight: int = 1,
+    ):
+        self.event_id = event_id
+        self.outcome_shares = dict(outcome_shares)
+        self.total_shares = sum(self.outcome_shares.values())
+        self.engine = engine or ShareRatioEngine()
+        self.weight = weight  # Units each share adds to the totals
+        # Engines see the outcomes as one list, always in this order
+        self._index = {outcome_id: i for i, outcome_id in enumerate(outcome_shares)}
+        self.lock = threading.Lock()
+        self.synced_at = time.monotonic()
+        self.fills = 0  # Fills applied so far, to spot a sync racing one
+
+    def has_outcome(self, outcome_id: str) -> bool:
+        return outcome_id in self.outcome_shares
+
+    def snapshot(self) -> dict[str, int]:
+        """A copy of the share totals, to price hypothetical fills against."""
+        with self.lock:
+            return dict(self.outcome_shares)
+
+    def prices_for(self, outcome_shares: dict[str, int]) -> dict[str, float]:
+        """Every outcome's price at the given share totals."""
+        prices = self.engine.prices(list(outcome_shares.values()), self.weight)
+        return dict(zip(outcome_shares, prices))
+
+    def prices(self) -> dict[str, float]:
+        return self.prices_for(self.snapshot())
+
+    def quote_against(
+        self,
+        outcome_shares: dict[str, int],
+        outcome_id: str,
+        quantity: int,
+        include_prices: bool = False,
+    ) -> OutcomeQuote:
+        """Quotes an order at the given share totals rather than the current ones."""
+        return self.engine.quote(
+            list(outcome_shares.values()),
+            self._index[outcome_id],
+            quantity,
+            self.weight,
+            include_prices,
+        )
+
+    def quote(
+        self, outcome_id: str, quantity: int, include_prices: bool = False
+    ) -> OutcomeQuote:
+        return self.quote_against(self.snapshot(), outcome_id, quantity, include_prices)
+
+    def is_stale(self) -> bool:
+        return time.monotonic() - self.synced_at >= settings.market_state_ttl_seconds
+
+    def sync(self, outcome_shares: dict[str, int], fills: int | None = None):
+        """
+        Replaces the share totals with ones read from the database. Given the
+        fill count from before the read, a sync that a fill applied meanwhile
+        could roll back is dropped instead.
+        """
+        with self.lock:
+            if fills is not None and fills != self.fills:
+                return
+            self.synced_at = time.monotonic()
+            for outcome_id, shares in outcome_shares.items():
+                if outcome_id in self.outcome_shares:
+                    self.outcome_shares[outcome_id] = shares
+            self.total_shares = sum(self.outcome_shares.values())
+
+    def apply_fills(self, fills: dict[str, int]) -> dict[str, float]:
+        """Records committed fills (units per outcome) and returns the new prices."""
+        with self.lock:
+            for outcome_id, units in fills.items():
+                self.outcome_shares[outcome_id] += units
+                self.total_shares += units
+            self.fills += 1
+            outcome_shares = dict(self.outcome_shares)
+        return self.prices_for(outcome_shares)
+
+    def apply_fill(self, outcome_id: str, units: int) -> dict[str, float]:
+        return self.apply_fills({outcome_id: units})
+
+
+class MarketStateStore:
+    def __init__(self):
+        self._markets: dict[str, EventMarket] = {}
+        self._lock = threading.Lock()
+
+    def load_all(self, session: Session):
+        """Rebuilds the state of every event with one pass over the database."""
+        events = session.exec(
+            select(Event.id, Event.type, Event.pricing_engine, Event.value)
+        ).all()
+        outcome_shares: dict[str, dict[str, int]] = {event.id: {} for event in events}
+        outcomes = session.exec(
+            select(Outcome.event_id, Outcome.id, Outcome.share_count)
+        )
+        for event_id, outcome_id, share_count in outcomes:
+            if event_id in outcome_shares:
+                outcome_shares[event_id][outcome_id] = share_count
+
+        markets = {
+            event.id: EventMarket(
+                event.id,
+                outcome_shares[event.id],
+                engine_for(event.type, event.pricing_engine),
+                event.value,
+            )
+            for event in events
+        }
+        with self._lock:
+            self._markets = markets
+
+    @staticmethod
+    def _share_counts(event_id: str, session: Session) -> dict[str, int]:
+        return dict(
+            session.exec(
+                select(Outcome.id, Outcome.share_count).where(
+                    Outcome.event_id == event_id
+                )
+            ).all()
+        )
+
+    def _load(self, event_id: str, session: Session) -> EventMarket | None:
+        event = session.get(Event, event_id)
+        if not event:
+            return None
+        return EventMarket(
+            event_id,
+            self._share_counts(event_id, session),
+            engine_for(event.type, event.pricing_engine),
+            event.value,
+        )
+
+    def get(self, event_id: str, session: Session) -> EventMarket | None:
+        """
+        The state of an event, loading it from the database on first use and
+        re-reading its totals once they've gone stale.
+        """
+        market = self._markets.get(event_id)
+        if market is not None:
+            if market.is_stale():
+                fills = market.fills
+                market.sync(self._share_counts(event_id, session), fills)
+            return market
+
+        market = self._load(event_id, session)
+        if market is None:
+            return None
+        with self._lock:
+            # Another request may have loaded it meanwhile, keep the first one
+            return self._markets.setdefault(event_id, market)
+
+    def get_current(self, event_id: str, session: Session) -> EventMarket | None:
+        """
+        The state of an event with its totals re-read from the stored share
+        counters, for a trade holding the event's row lock: another worker
+        process may have traded on the event since this one last saw it.
+        """
+        market = self._markets.get(event_id)
+        if market is None:
+            return self.get(event_id, session)
+        market.sync(self._share_counts(event_id, session))
+        return market
+
+    def peek(self, event_id: str) -> EventMarket | None:
+        """
+        The state of an event if it's loaded and fresh, without touching the
+        DB. Otherwise None, and get() has to load or re-read it.
+        """
+        market = self._markets.get(event_id)
+        if market is None or market.is_stale():
+            return None
+        return market
+
+    def add_event(self, event: Event):
+        """Registers a freshly created event, which has no shares yet."""
+        market = EventMarket(
+            event.id,
+            {outcome.id: 0 for outcome in event.outcomes},
+            engine_for(event.type, event.pricing_engine),
+            event.value,
+        )
+        with self._lock:
+            self._markets[event.id] = market
+
+    def clear(self):
+        with self._lock:
+            self._markets = {}
+
+
+market_state = MarketStateStore()
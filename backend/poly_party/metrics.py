@@ -0,0 +1,348 @@
+"""
+Request instrumentation.
+
+A small ASGI middleware times every HTTP request per route and tracks how
+many are in flight and what they answered, while SQLAlchemy cursor events
+count the queries each request runs and the time spent in them. Everything
+is exposed in the Prometheus text format on /metrics. Requests slower than
+settings.slow_request_ms are also logged along with the SQL they ran.
+
+Metrics live in the process that recorded them, so with several workers each
+one reports its own.
+"""
+
+import logging
+import threading
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from poly_party.config import settings
+from sqlalchemy import Engine, event
+
+logger = logging.getLogger("poly_party.slow_requests")
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+MAX_LOGGED_STATEMENTS = 50
+
+
+# --- Registry ---
+
+
+def escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def format_labels(names: tuple[str, ...], values: tuple) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{escape(value)}"' for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+
+class Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self._lock = threading.Lock()
+
+    def header(self) -> list[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def __init__(self, name, help, labels=()):
+        super().__init__(name, help, labels)
+        self._values: dict[tuple, float] = {}
+
+    def inc(self, *labels, amount: float = 1.0):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def value(self, *labels) -> float:
+        return self._values.get(labels, 0.0)
+
+    def render(self) -> list[str]:
+        with self._lock:
+            values = dict(self._values)
+        return self.header() + [
+            f"{self.name}{format_labels(self.labels, key)} {value}"
+            for key, value in sorted(values.items())
+        ]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, *labels):
+        self.inc(*labels, amount=-1.0)
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name, help, labels=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, help, labels)
+        self.buckets = buckets
+        # label values -> (count per bucket, sum, count)
+        self._values: dict[tuple, tuple[list[int], float, int]] = {}
+
+    def observe(self, value: float, *labels):
+        with self._lock:
+            counts, total, count = self._values.get(
+                labels, ([0] * len(self.buckets), 0.0, 0)
+            )
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+            self._values[labels] = (counts, total + value, count + 1)
+
+    def count(self, *labels) -> int:
+        entry = self._values.get(labels)
+        return entry[2] if entry else 0
+
+    def render(self) -> list[str]:
+        with self._lock:
+            values = {key: (list(c), s, n) for key, (c, s, n) in self._values.items()}
+        lines = self.header()
+        bucket_labels = (*self.labels, "le")
+        for key, (counts, total, count) in sorted(values.items()):
+            for bound, bucket_count in zip(self.buckets, counts):
+                lines.append(
+                    f"{self.name}_bucket"
+                    f"{format_labels(bucket_labels, (*key, bound))} {bucket_count}"
+                )
+            lines.append(
+                f"{self.name}_bucket{format_labels(bucket_labels, (*key, '+Inf'))} {count}"
+            )
+            lines.append(f"{self.name}_sum{format_labels(self.labels, key)} {total}")
+            lines.append(f"{self.name}_count{format_labels(self.labels, key)} {count}")
+        return lines
+
+
+class PoolGauge(Metric):
+    """Connection pool occupancy, read from each pool when scraped."""
+
+    kind = "gauge"
+    STATES = {
+        "size": "size",
+        "checked_in": "checkedin",
+        "checked_out": "checkedout",
+        "overflow": "overflow",
+    }
+
+    def __init__(self, name, help):
+        super().__init__(name, help, ("engine", "state"))
+        self._pools: dict[str, object] = {}
+
+    def track(self, engine_label: str, pool):
+        with self._lock:
+            self._pools[engine_label] = pool
+
+    def value(self, engine_label: str, state: str) -> float | None:
+        # Only queue pools keep counts (not NullPool, StaticPool and the like)
+        reader = getattr(self._pools.get(engine_label), self.STATES[state], None)
+        if not callable(reader):
+            return None
+        # A queue pool's overflow counts up from -size until it's full
+        return float(max(reader(), 0)) if state == "overflow" else float(reader())
+
+    def render(self) -> list[str]:
+        with self._lock:
+            engine_labels = sorted(self._pools)
+        lines = self.header()
+        for engine_label in engine_labels:
+            for state in self.STATES:
+                value = self.value(engine_label, state)
+                if value is not None:
+                    labels = format_labels(self.labels, (engine_label, state))
+                    lines.append(f"{self.name}{labels} {value}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self.metrics: list[Metric] = []
+
+    def register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        return "\n".join(line for m in self.metrics for line in m.render()) + "\n"
+
+
+registry = Registry()
+
+ROUTE_LABELS = ("method", "route")
+
+requests_total = registry.register(
+    Counter(
+        "polyparty_http_requests_total",
+        "HTTP requests served, by route and status code.",
+        (*ROUTE_LABELS, "status"),
+    )
+)
+requests_in_flight = registry.register(
+    Gauge(
+        "polyparty_http_requests_in_flight",
+        "HTTP requests currently being served.",
+        ("method",),
+    )
+)
+request_duration = registry.register(
+    Histogram(
+        "polyparty_http_request_duration_seconds",
+        "Time to serve an HTTP request.",
+        ROUTE_LABELS,
+    )
+)
+request_queries = registry.register(
+    Histogram(
+        "polyparty_db_queries_per_request",
+        "SQL statements run while serving an HTTP request.",
+        ROUTE_LABELS,
+        buckets=QUERY_BUCKETS,
+    )
+)
+queries_total = registry.register(
+    Counter(
+        "polyparty_db_queries_total",
+        "SQL statements run, by the route that ran them.",
+        ROUTE_LABELS,
+    )
+)
+query_seconds_total = registry.register(
+    Counter(
+        "polyparty_db_query_seconds_total",
+        "Time spent executing SQL, by the route that ran it.",
+        ROUTE_LABELS,
+    )
+)
+
+
+pool_connections = registry.register(
+    PoolGauge(
+        "polyparty_db_pool_connections",
+        "Database connections per pool: its size, idle, in use and overflow.",
+    )
+)
+pool_events_total = registry.register(
+    Counter(
+        "polyparty_db_pool_events_total",
+        "Connections opened, checked out and invalidated, per pool.",
+        ("engine", "event"),
+    )
+)
+
+
+def instrument_pool(engine: Engine, label: str):
+    """Reports an engine's pool on /metrics under `label`."""
+    pool_connections.track(label, engine.pool)
+    for name in ("connect", "checkout", "invalidate"):
+
+        def count(*args, name=name):
+            pool_events_total.inc(label, name)
+
+        event.listen(engine, name, count)
+
+
+# --- Per-request SQL accounting ---
+
+
+@dataclass
+class RequestStats:
+    queries: int = 0
+    db_time: float = 0.0
+    # Only kept when the slow-request log is on
+    statements: list[str] | None = None
+    _started: list[float] = field(default_factory=list)
+
+
+current_request: ContextVar[RequestStats | None] = ContextVar(
+    "current_request", default=None
+)
+
+
+def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = current_request.get()
+    if stats is not None:
+        stats._started.append(time.perf_counter())
+        if (
+            stats.statements is not None
+            and len(stats.statements) < MAX_LOGGED_STATEMENTS
+        ):
+            stats.statements.append(statement)
+
+
+def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = current_request.get()
+    if stats is not None and stats._started:
+        stats.queries += 1
+        stats.db_time += time.perf_counter() - stats._started.pop()
+
+
+def instrument_engine(engine: Engine):
+    """Attributes the queries an engine runs to the request running them."""
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", after_cursor_execute)
+
+
+# --- Middleware ---
+
+
+class MetricsMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        method = scope["method"]
+        status = 500
+        slow_log = settings.slow_request_ms > 0
+        stats = RequestStats(statements=[] if slow_log else None)
+        token = current_request.set(stats)
+        start = time.perf_counter()
+        requests_in_flight.inc(method)
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            current_request.reset(token)
+            requests_in_flight.dec(method)
+
+            # Only known once the router has matched the request
+            route = scope.get("route")
+            # Unmatched paths share a label, so scanners can't blow up cardinality
+            route_label = getattr(route, "path", None) or "unmatched"
+            requests_total.inc(method, route_label, status)
+            request_duration.observe(elapsed, method, route_label)
+            request_queries.observe(stats.queries, method, route_label)
+            queries_total.inc(method, route_label, amount=stats.queries)
+            query_seconds_total.inc(method, route_label, amount=stats.db_time)
+
+            if slow_log and elapsed * 1000 >= settings.slow_request_ms:
+                logger.warning(
+                    "Slow request: %s %s took %.1f ms (%d queries, %.1f ms in SQL)\n%s",
+                    method,
+                    scope["path"],
+                    elapsed * 1000,
+                    stats.queries,
+                    stats.db_time * 1000,
+                    "\n".join(stats.statements),
+                )
@@ -0,0 +1,217 @@
+"""
+Schema migrations.
+
+Each migration has a version number and runs once per database. The
+versions already applied are recorded in the schema_migrations table, so
+startup only runs the new ones. Every migration checks the schema before it
+changes it. That way a database.db created before this module existed
+(which has tables but no schema_migrations) is upgraded in place, not
+recreated.
+
+Every migration can also be rerun from any point. SQLite (through pysqlite)
+commits DDL as it goes, so a migration interrupted halfway leaves its first
+columns behind, and a worker starting up alongside another may find the
+other's half-done work too. Backfills are keyed on the data they fix
+rather than on whether the column was just added.
+
+To upgrade a database without starting the server:
+
+    uv run python -m poly_party.migrations
+"""
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime
+
+from poly_party import models  # noqa: F401 (registers the tables on the metadata)
+from poly_party.counters import rebuild_counters
+from sqlalchemy import Connection, Engine, inspect, text
+from sqlalchemy.exc import IntegrityError, OperationalError, ProgrammingError
+from sqlalchemy.schema import CreateIndex
+from sqlmodel import SQLModel
+
+# Attempts at a migration that keeps colliding with another worker's
+RACE_ATTEMPTS = 3
+
+
+@dataclass
+class Migration:
+    version: int
+    name: str
+    upgrade: Callable[[Connection], None]
+
+
+def add_missing_columns(connection: Connection, table: str, columns: dict[str, str]):
+    """Adds each `name: DDL` column the table doesn't have yet."""
+    existing = {column["name"] for column in inspect(connection).get_columns(table)}
+    for name, ddl in columns.items():
+        if name not in existing:
+            connection.execute(text(f'ALTER TABLE "{table}" ADD COLUMN {name} {ddl}'))
+
+
+# --- Migrations ---
+
+# The updated_at an event gets from its column's default, before the backfill
+UNSTAMPED = datetime(1970, 1, 1)
+
+
+def create_tables(connection: Connection):
+    # Only creates what's missing, so it's a no-op on an existing database
+    SQLModel.metadata.create_all(connection)
+
+
+def aggregate_share_fills(connection: Connection):
+    # Shares used to be one row per share bought, at the price in `wager`
+    add_missing_columns(
+        connection,
+        "share",
+        {
+            "quantity": "INTEGER NOT NULL DEFAULT 1",
+            "price": "FLOAT NOT NULL DEFAULT 0",
+            "tiers": "JSON NOT NULL DEFAULT '[]'",
+        },
+    )
+    # Every real fill has a price, so only rows still on the default need it
+    connection.execute(text("UPDATE share SET price = wager WHERE price = 0"))
+
+
+def create_indexes(connection: Connection):
+    # Every index declared on the models, including ones added since a table
+    # was created (create_all skips the indexes of tables that already exist).
+    # Indexes on columns a later migration adds wait for that migration
+    inspector = inspect(connection)
+    for table in SQLModel.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        columns = {column["name"] for column in inspector.get_columns(table.name)}
+        for index in table.indexes:
+            if {column.name for column in index.columns} <= columns:
+                # IF NOT EXISTS rather than a check first, which two workers
+                # could both pass
+                connection.execute(CreateIndex(index, if_not_exists=True))
+
+
+def add_share_counters(connection: Connection):
+    counters = {
+        "share_count": "INTEGER NOT NULL DEFAULT 0",
+        "total_wagered": "FLOAT NOT NULL DEFAULT 0",
+        "participant_count": "INTEGER NOT NULL DEFAULT 0",
+    }
+    add_missing_columns(connection, "outcome", counters)
+    add_missing_columns(connection, "event", counters)
+    # Backfill from the shares already placed
+    rebuild_counters(connection)
+
+
+def add_event_versions(connection: Connection):
+    add_missing_columns(
+        connection,
+        "event",
+        {
+            "version": "INTEGER NOT NULL DEFAULT 1",
+            "updated_at": f"TIMESTAMP NOT NULL DEFAULT '{UNSTAMPED}'",
+        },
+    )
+    connection.execute(
+        text("UPDATE event SET updated_at = :now WHERE updated_at = :unstamped"),
+        {"now": datetime.utcnow(), "unstamped": UNSTAMPED},
+    )
+
+
+def add_pricing_engines(connection: Connection):
+    # Null keeps an existing event on its type's default engine
+    add_missing_columns(connection, "event", {"pricing_engine": "VARCHAR(11)"})
+
+
+def add_token_batches(connection: Connection):
+    add_missing_columns(
+        connection,
+        "token",
+        {
+            "revoked": "BOOLEAN NOT NULL DEFAULT FALSE",
+            "batch_id": "VARCHAR",
+            "expires_at": "TIMESTAMP",
+        },
+    )
+    create_indexes(connection)
+
+
+MIGRATIONS = [
+    Migration(1, "create tables", create_tables),
+    Migration(2, "aggregate share fills", aggregate_share_fills),
+    Migration(3, "create indexes", create_indexes),
+    Migration(4, "add share counters", add_share_counters),
+    Migration(5, "index shares by holder", create_indexes),
+    Migration(6, "add event versions", add_event_versions),
+    Migration(7, "add pricing engines", add_pricing_engines),
+    Migration(8, "add price candles", create_tables),
+    Migration(9, "add token batches", add_token_batches),
+]
+
+
+# --- Runner ---
+
+
+def applied_versions(connection: Connection) -> set[int]:
+    connection.execute(
+        text(
+            "CREATE TABLE IF NOT EXISTS schema_migrations ("
+            "version INTEGER PRIMARY KEY, name VARCHAR NOT NULL, "
+            "applied_at TIMESTAMP NOT NULL)"
+        )
+    )
+    return set(
+        connection.execute(text("SELECT version FROM schema_migrations")).scalars()
+    )
+
+
+def migrate(engine: Engine) -> list[Migration]:
+    """Applies every migration the database hasn't had yet, in order."""
+    with engine.begin() as connection:
+        done = applied_versions(connection)
+
+    applied = []
+    for migration in sorted(MIGRATIONS, key=lambda m: m.version):
+        if migration.version not in done and apply(engine, migration):
+            applied.append(migration)
+    return applied
+
+
+def apply(engine: Engine, migration: Migration) -> bool:
+    """Runs and records a migration; False if another worker recorded it first."""
+    for attempt in range(RACE_ATTEMPTS):
+        try:
+            with engine.begin() as connection:
+                migration.upgrade(connection)
+                connection.execute(
+                    text(
+                        "INSERT INTO schema_migrations (version, name, applied_at) "
+                        "VALUES (:version, :name, :applied_at)"
+                    ),
+                    {
+                        "version": migration.version,
+                        "name": migration.name,
+                        "applied_at": datetime.utcnow(),
+                    },
+                )
+            return True
+        except (IntegrityError, OperationalError, ProgrammingError):
+            # Another worker starting up at the same time recorded it first
+            # (a duplicate version), or added a column or table under us
+            # (duplicate DDL). Either it's done, or the rerun skips what
+            # the other worker finished
+            with engine.begin() as connection:
+                if migration.version in applied_versions(connection):
+                    return False
+            if attempt == RACE_ATTEMPTS - 1:
+                raise
+
+
+if __name__ == "__main__":
+    from poly_party.db import engine
+
+    applied = migrate(engine)
+    for migration in applied:
+        print(f"Applied {migration.version:04d} {migration.name}")
+    if not applied:
+        print("Database is up to date")
@@ -1,8 +1,10 @@
 import uuid
 from datetime import datetime
 from enum import Enum
+from typing import Literal
 
 from pydantic import model_validator
+from sqlalchemy import JSON, Index
 from sqlmodel import Field, Relationship, SQLModel
 
 # --- 1. ENUMS ---
@@ -14,6 +16,16 @@ class eventType(str, Enum):
     MULTIPLE_CHOICE = "multiple-choice"
 
 
+class pricingEngine(str, Enum):
+    SHARE_RATIO = "share-ratio"
+    LMSR = "lmsr"
+
+
+class leaderboardRanking(str, Enum):
+    NET_WORTH = "net-worth"  # Balance plus open positions at current prices
+    BALANCE = "balance"
+
+
 # --- 2. OUTCOME MODELS ---
 
 
@@ -21,7 +33,7 @@ class OutcomeBase(SQLModel):
     description: str
     value: int
     cost: float = Field(default=0.50)
-    event_id: str | None = Field(default=None, foreign_key="event.id")
+    event_id: str | None = Field(default=None, foreign_key="event.id", index=True)
 
 
 class Outcome(OutcomeBase, table=True):
@@ -29,6 +41,11 @@ class Outcome(OutcomeBase, table=True):
         default_factory=lambda: str(uuid.uuid4()), primary_key=True, index=True
     )
 
+    # Denormalized from the share table and bumped by every fill
+    share_count: int = Field(default=0)  # value * quantity, what prices use
+    total_wagered: float = Field(default=0.0)
+    participant_count: int = Field(default=0)
+
     # Relationship back to the Event
     event: "Event" = Relationship(back_populates="outcomes")
     shares: list["Share"] = Relationship(back_populates="outcome")
@@ -52,6 +69,31 @@ class Token(TokenBase, table=True):
     )
     token: str = Field(index=True, unique=True)
     used: bool = Field(default=False)
+    revoked: bool = Field(default=False)
+    # Tokens minted together share a batch, so they can be revoked together
+    batch_id: str | None = Field(default=None, index=True)
+    expires_at: datetime | None = Field(default=None)  # Naive UTC, None never
+
+
+class TokenMintRequest(SQLModel):
+    count: int
+    length: int | None = None  # Defaults to settings.registration_token_length
+    expires_in_minutes: int | None = None  # At least 1, None never expires
+
+
+class TokenBatch(SQLModel):
+    batch_id: str
+    expires_at: datetime | None
+    tokens: list[str]
+
+
+class TokenRevokeRequest(SQLModel):
+    batch_id: str | None = None
+    tokens: list[str] = []
+
+
+class TokenRevokeReport(SQLModel):
+    revoked: int  # Unused tokens that no longer register anyone
 
 
 class UserBase(SQLModel):
@@ -98,21 +140,38 @@ class IconCreate(SQLModel):
 
 
 class EventBase(SQLModel):
-    title: str
+    title: str = Field(index=True)  # create_event checks titles are unique
     description: str
-    start_time: datetime
-    end_time: datetime
+    start_time: datetime = Field(index=True)
+    end_time: datetime = Field(index=True)
     type: eventType
     value: int
     first_share_bonus: float = Field(default=0.0)
     finalized: bool = Field(default=False)
+    # None prices the event with its type's default engine
+    pricing_engine: pricingEngine | None = Field(default=None)
 
 
 class Event(EventBase, table=True):
+    # Listings page by (start_time, id), optionally filtered by status or type
+    __table_args__ = (
+        Index("ix_event_finalized_start_time_id", "finalized", "start_time", "id"),
+        Index("ix_event_type_start_time_id", "type", "start_time", "id"),
+    )
+
     id: str = Field(
         default_factory=lambda: str(uuid.uuid4()), primary_key=True, index=True
     )
 
+    # Denormalized from the share table and bumped by every fill
+    share_count: int = Field(default=0)  # value * quantity, what prices use
+    total_wagered: float = Field(default=0.0)
+    participant_count: int = Field(default=0)
+
+    # Bumped by every change to the event or its market, for ETags
+    version: int = Field(default=1)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+
     shares: list["Share"] = Relationship(back_populates="event")
     outcomes: list["Outcome"] = Relationship(back_populates="event")
 
@@ -121,7 +180,54 @@ class EventCreate(EventBase):
     outcomes: list[OutcomeBase]
 
 
-# --- 5. SHARE MODELS ---
+# --- 5. QUOTE MODELS ---
+
+
+class PriceTier(SQLModel):
+    # "floor"/"ceiling" stretches are pinned to the clamp, "curve" follows the
+    # share ratio and "opening" is the first share of an empty market
+    kind: Literal["opening", "floor", "curve", "ceiling"]
+    start: int
+    quantity: int
+    start_price: float
+    end_price: float
+    cost: float
+
+
+class OutcomeQuote(SQLModel):
+    quantity: int
+    total_cost: float
+    average_price: float
+    marginal_price: float  # Price of the first share bought
+    final_price: float  # Price of the last share bought
+    next_price: float  # Price of the outcome once the order has filled
+    tiers: list[PriceTier] = []
+    prices: list[float] | None = None  # Full per-share ladder, opt-in only
+
+
+class QuoteRequest(SQLModel):
+    event_id: str
+    outcome_id: str
+    quantity: int
+
+
+class QuoteRead(OutcomeQuote):
+    event_id: str
+    outcome_id: str
+
+
+class BetLeg(SQLModel):
+    event_id: str
+    outcome_id: str
+    quantity: int
+    expected_price: float  # The most the last share may cost
+
+
+class BatchBetRequest(SQLModel):
+    legs: list[BetLeg]
+
+
+# --- 6. SHARE MODELS ---
 
 
 class ShareBase(SQLModel):
@@ -129,14 +235,42 @@ class ShareBase(SQLModel):
         default_factory=lambda: str(uuid.uuid4()), primary_key=True, index=True
     )
     timestamp: datetime = Field(default_factory=datetime.utcnow)
-    value: int
-    wager: float
+    value: int  # Weight of each share in the market totals (the event's value)
+    quantity: int = Field(default=1)  # Number of shares bought in this fill
+    wager: float  # Total paid for the fill
+    price: float  # Average price per share
+    tiers: list[PriceTier] = Field(default_factory=list, sa_type=JSON)
     event_id: str = Field(foreign_key="event.id")
-    user_id: str = Field(foreign_key="user.id")
+    user_id: str = Field(foreign_key="user.id", index=True)
     outcome_id: str = Field(foreign_key="outcome.id")
 
 
 class Share(ShareBase, table=True):
+    __table_args__ = (
+        # Per-event share pages and participant counts
+        Index("ix_share_event_id_timestamp_id", "event_id", "timestamp", "id"),
+        Index("ix_share_event_id_user_id", "event_id", "user_id"),
+        # Settlement's per-user totals of the winning outcome
+        Index("ix_share_outcome_id_user_id", "outcome_id", "user_id"),
+        # Covers a user's portfolio, grouped by event and outcome
+        Index(
+            "ix_share_user_id_event_id_outcome_id",
+            "user_id",
+            "event_id",
+            "outcome_id",
+            "quantity",
+            "wager",
+        ),
+        # Covers the per-outcome share totals the market state is loaded from
+        Index(
+            "ix_share_event_id_outcome_id_value_quantity",
+            "event_id",
+            "outcome_id",
+            "value",
+            "quantity",
+        ),
+    )
+
     # Relationships
     event: Event = Relationship(back_populates="shares")
     outcome: Outcome = Relationship(back_populates="shares")
@@ -147,7 +281,109 @@ class ShareRead(ShareBase):
     pass
 
 
-# --- 6. NESTED READ SCHEMAS (For API Responses) ---
+class SharePage(SQLModel):
+    items: list[ShareRead] = []
+    next_cursor: str | None = None
+
+
+class PayoutRead(SQLModel):
+    user_id: str
+    username: str
+    shares: int
+    amount: float
+
+
+class Position(SQLModel):
+    """A user's holding in one outcome of an open event, at its current price."""
+
+    event_id: str
+    event_title: str
+    outcome_id: str
+    outcome_description: str
+    quantity: int
+    cost_basis: float  # Total paid for the shares
+    average_price: float
+    current_price: float
+    market_value: float
+    unrealized_pnl: float
+
+
+class PortfolioPage(SQLModel):
+    items: list[Position] = []
+    next_cursor: str | None = None
+
+
+class LeaderboardEntry(SQLModel):
+    rank: int  # 1 for the leader
+    user_id: str
+    username: str
+    balance: float
+    net_worth: float
+
+
+class LeaderboardPage(SQLModel):
+    ranking: leaderboardRanking
+    total: int  # Everyone ranked, for paging
+    entries: list[LeaderboardEntry] = []
+
+
+class CounterMismatch(SQLModel):
+    kind: Literal["event", "outcome"]
+    id: str
+    event_id: str
+    counter: str
+    stored: float
+    actual: float
+
+
+class CounterReport(SQLModel):
+    rebuilt: bool
+    # What differed from the share table before any rebuild
+    mismatches: list[CounterMismatch] = []
+
+
+class Candle(SQLModel, table=True):
+    """An outcome's price over one bucket of `resolution` seconds."""
+
+    __table_args__ = (
+        # An event's candles for every outcome over a time range
+        Index(
+            "ix_candle_event_id_resolution_bucket_start",
+            "event_id",
+            "resolution",
+            "bucket_start",
+        ),
+    )
+
+    # Primary key in this order, so it also serves one outcome's time ranges
+    outcome_id: str = Field(foreign_key="outcome.id", primary_key=True)
+    resolution: int = Field(primary_key=True)
+    bucket_start: datetime = Field(primary_key=True)
+    event_id: str = Field(foreign_key="event.id")
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: int = Field(default=0)  # Shares of the outcome bought in the bucket
+
+
+class CandleRead(SQLModel):
+    bucket_start: datetime
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: int
+
+
+class CandleSeries(SQLModel):
+    event_id: str
+    resolution: int
+    # Buckets without fills are left out; the price held at the last close
+    outcomes: dict[str, list[CandleRead]] = {}
+
+
+# --- 7. NESTED READ SCHEMAS (For API Responses) ---
 
 
 class UserReadWithShares(UserRead):
@@ -157,11 +393,32 @@ class UserReadWithShares(UserRead):
 
 class EventReadWithShares(EventBase):
     id: str
+    version: int = 1
     outcomes: list[OutcomeRead] = []
     shares: list[ShareRead] = []
 
 
-# --- 7. FINALIZATION ---
+class OutcomeSummary(OutcomeRead):
+    share_total: int = 0
+    total_wagered: float = 0.0
+    participant_count: int = 0
+
+
+class EventSummary(EventBase):
+    id: str
+    version: int = 1
+    outcomes: list[OutcomeSummary] = []
+    share_total: int = 0
+    total_wagered: float = 0.0
+    participant_count: int = 0
+
+
+class EventSummaryPage(SQLModel):
+    items: list[EventSummary] = []
+    next_cursor: str | None = None
+
+
+# --- 8. FINALIZATION ---
 # This fixes the "not fully defined" errors by resolving string references
 User.model_rebuild()
 Event.model_rebuild()
@@ -0,0 +1,151 @@
+"""
+Real-time price feed.
+
+Clients open a WebSocket, subscribe to the events they're looking at and get
+a compact message after each committed trade instead of polling whole events.
+Trades published within COALESCE_WINDOW of each other are merged into one
+message per event. Each subscriber keeps at most one unsent message per
+event, so a slow client only ever falls behind to the latest state instead of
+building up a backlog, and one that stops reading entirely is disconnected.
+
+The feed is per worker process: a subscriber hears about the trades made
+through the worker its socket is connected to, and nothing from the others.
+The snapshot sent on subscribing is that worker's view too. When running
+several workers (the production image runs 4), clients that must see every
+fill should also revalidate GET /events/{event_id}, whose ETag changes with
+each one.
+"""
+
+import asyncio
+
+COALESCE_WINDOW = 0.05  # seconds
+SEND_TIMEOUT = 5.0  # seconds
+MAX_SUBSCRIPTIONS = 100  # per connection
+
+
+def merge_updates(older: dict, newer: dict) -> dict:
+    """Folds two messages for the same event into one."""
+    if newer["type"] != "PRICE_UPDATE" or older["type"] != "PRICE_UPDATE":
+        return newer
+    volume = dict(older["volume"])
+    for outcome_id, units in newer["volume"].items():
+        volume[outcome_id] = volume.get(outcome_id, 0) + units
+    return {**newer, "volume": volume}
+
+
+class Subscriber:
+    """One connection's subscriptions and the messages it has yet to send."""
+
+    def __init__(self):
+        self.events: set[str] = set()
+        self.pending: dict[str, dict] = {}
+        self.ready = asyncio.Event()
+
+    def push(self, event_id: str, message: dict):
+        previous = self.pending.get(event_id)
+        self.pending[event_id] = (
+            merge_updates(previous, message) if previous else message
+        )
+        self.ready.set()
+
+    async def next_messages(self) -> list[dict]:
+        await self.ready.wait()
+        self.ready.clear()
+        messages = list(self.pending.values())
+        self.pending.clear()
+        return messages
+
+
+class PriceFeed:
+    def __init__(self, window: float = COALESCE_WINDOW):
+        self.window = window
+        self._subscribers: dict[str, set[Subscriber]] = {}
+        self._pending: dict[str, dict] = {}
+        self._flush_handle: asyncio.TimerHandle | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    # --- Subscriptions (called on the event loop) ---
+
+    def subscribe(self, subscriber: Subscriber, event_id: str):
+        self._loop = asyncio.get_running_loop()
+        subscriber.events.add(event_id)
+        self._subscribers.setdefault(event_id, set()).add(subscriber)
+
+    def unsubscribe(self, subscriber: Subscriber, event_id: str):
+        subscriber.events.discard(event_id)
+        subscribers = self._subscribers.get(event_id)
+        if subscribers is not None:
+            subscribers.discard(subscriber)
+            if not subscribers:
+                del self._subscribers[event_id]
+
+    def remove(self, subscriber: Subscriber):
+        for event_id in list(subscriber.events):
+            self.unsubscribe(subscriber, event_id)
+
+    # --- Publishing (safe to call from any thread) ---
+
+    def publish_fill(
+        self, event_id: str, volume: dict[str, int], prices: dict[str, float]
+    ):
+        """Publishes committed fills (units bought per outcome) on an event."""
+        self._publish(
+            event_id,
+            {
+                "type": "PRICE_UPDATE",
+                "event_id": event_id,
+                "prices": prices,
+                "volume": volume,
+            },
+            immediate=False,
+        )
+
+    def publish_close(self, event_id: str, winning_outcome_id: str):
+        self._publish(
+            event_id,
+            {
+                "type": "EVENT_CLOSED",
+                "event_id": event_id,
+                "winning_outcome_id": winning_outcome_id,
+            },
+            immediate=True,
+        )
+
+    def _publish(self, event_id: str, message: dict, immediate: bool):
+        loop = self._loop
+        if loop is None or event_id not in self._subscribers:
+            return
+        try:
+            loop.call_soon_threadsafe(self._queue, event_id, message, immediate)
+        except RuntimeError:
+            # The loop that served our subscribers has shut down
+            self._loop = None
+
+    def _queue(self, event_id: str, message: dict, immediate: bool):
+        previous = self._pending.get(event_id)
+        self._pending[event_id] = (
+            merge_updates(previous, message) if previous else message
+        )
+        if immediate:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = asyncio.get_running_loop().call_later(
+                self.window, self._flush
+            )
+
+    def _flush(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        pending, self._pending = self._pending, {}
+        for event_id, message in pending.items():
+            for subscriber in self._subscribers.get(event_id, ()):
+                subscriber.push(event_id, message)
+
+    def clear(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+        self.__init__(self.window)
+
+
+price_feed = PriceFeed()
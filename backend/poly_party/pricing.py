@@ -0,0 +1,194 @@
+"""
+Closed-form pricing for the share-ratio market.
+
+The price of the next share of an outcome is the outcome's share total divided
+by the event's share total, clamped to [PRICE_FLOOR, PRICE_CEILING]. Buying a
+share bumps both totals by one, so the i-th share of an order costs
+clamp((s + i) / (t + i)). Instead of walking that one share at a time we work
+out where the clamps stop applying and sum the unclamped stretch with
+harmonic numbers, so a quote costs the same for 1 share or 1,000,000.
+"""
+
+import math
+
+from poly_party.models import OutcomeQuote, PriceTier
+
+PRICE_FLOOR = 0.01
+PRICE_CEILING = 0.99
+
+EULER_GAMMA = 0.5772156649015329
+
+# Below this size harmonic sums are added up exactly
+_EXACT_HARMONIC_LIMIT = 64
+
+
+def clamp_price(price: float) -> float:
+    return max(PRICE_FLOOR, min(price, PRICE_CEILING))
+
+
+def opening_price(num_outcomes: int) -> float:
+    # Default to an even split price if market is empty
+    return clamp_price(1.0 / num_outcomes if num_outcomes else 0.5)
+
+
+def spot_price(outcome_shares: int, event_shares: int, num_outcomes: int) -> float:
+    """Price of the next single share of an outcome."""
+    if event_shares == 0:
+        return opening_price(num_outcomes)
+    return clamp_price(outcome_shares / event_shares)
+
+
+def _harmonic_excess(n: int) -> float:
+    """H(n) - ln(n), from the asymptotic expansion (accurate for large n)."""
+    inv = 1.0 / n
+    inv2 = inv * inv
+    return EULER_GAMMA + inv / 2 - inv2 / 12 + inv2 * inv2 / 120 - inv2**3 / 252
+
+
+def _harmonic_range(low: int, high: int) -> float:
+    """Sum of 1/k for k in (low, high]."""
+    if high - low <= _EXACT_HARMONIC_LIMIT:
+        return math.fsum(1.0 / k for k in range(low + 1, high + 1))
+    if low < _EXACT_HARMONIC_LIMIT:
+        head = math.fsum(1.0 / k for k in range(low + 1, _EXACT_HARMONIC_LIMIT + 1))
+        return head + _harmonic_range(_EXACT_HARMONIC_LIMIT, high)
+    # ln(high) - ln(low) written so it doesn't cancel for nearby large ends
+    return (
+        _harmonic_excess(high) - _harmonic_excess(low) + math.log1p((high - low) / low)
+    )
+
+
+def _curve_cost(outcome_shares: int, event_shares: int, start: int, count: int):
+    """Sum of (s + i) / (t + i) for i in [start, start + count)."""
+    gap = event_shares - outcome_shares
+    first = event_shares + start
+    return count - gap * _harmonic_range(first - 1, first + count - 1)
+
+
+def _tier(
+    kind: str,
+    start: int,
+    quantity: int,
+    start_price: float,
+    end_price: float,
+    cost: float,
+):
+    return PriceTier(
+        kind=kind,
+        start=start,
+        quantity=quantity,
+        start_price=start_price,
+        end_price=end_price,
+        cost=cost,
+    )
+
+
+def price_tiers(
+    outcome_shares: int, event_shares: int, num_outcomes: int, quantity: int
+) -> list[PriceTier]:
+    """
+    Splits an order into the stretches where the price is pinned to the
+    floor, follows the share ratio, or is pinned to the ceiling.
+    """
+    tiers: list[PriceTier] = []
+    offset = 0
+
+    # An empty market opens at an even split, after which the buyer owns it all
+    if event_shares == 0 and quantity > 0:
+        price = opening_price(num_outcomes)
+        tiers.append(_tier("opening", 0, 1, price, price, price))
+        outcome_shares, event_shares = outcome_shares + 1, 1
+        offset, quantity = 1, quantity - 1
+
+    if quantity <= 0:
+        return tiers
+
+    s, t = outcome_shares, event_shares
+
+    # 100 * (s + i) < (t + i)  <=>  the ratio is below the floor
+    floor_count = min(quantity, max(0, -(-(t - 100 * s) // 99)))
+    # 100 * (s + i) > 99 * (t + i)  <=>  the ratio is above the ceiling
+    ceiling_start = max(floor_count, min(quantity, 99 * t - 100 * s + 1))
+    curve_count = ceiling_start - floor_count
+    ceiling_count = quantity - ceiling_start
+
+    if floor_count:
+        tiers.append(
+            _tier(
+                "floor",
+                offset,
+                floor_count,
+                PRICE_FLOOR,
+                PRICE_FLOOR,
+                floor_count * PRICE_FLOOR,
+            )
+        )
+    if curve_count:
+        last = ceiling_start - 1
+        tiers.append(
+            _tier(
+                "curve",
+                offset + floor_count,
+                curve_count,
+                (s + floor_count) / (t + floor_count),
+                (s + last) / (t + last),
+                _curve_cost(s, t, floor_count, curve_count),
+            )
+        )
+    if ceiling_count:
+        tiers.append(
+            _tier(
+                "ceiling",
+                offset + ceiling_start,
+                ceiling_count,
+                PRICE_CEILING,
+                PRICE_CEILING,
+                ceiling_count * PRICE_CEILING,
+            )
+        )
+    return tiers
+
+
+def price_ladder(
+    outcome_shares: int, event_shares: int, num_outcomes: int, quantity: int
+) -> list[float]:
+    """The price of every individual share of an order, in purchase order."""
+    prices: list[float] = []
+    for i in range(quantity):
+        prices.append(spot_price(outcome_shares + i, event_shares + i, num_outcomes))
+    return prices
+
+
+def quote_shares(
+    outcome_shares: int,
+    event_shares: int,
+    num_outcomes: int,
+    quantity: int,
+    include_prices: bool = False,
+) -> OutcomeQuote:
+    """
+    Prices an order of `quantity` shares against the current totals without
+    iterating over the shares. The per-share ladder is only built on request.
+    """
+    if quantity < 1:
+        raise ValueError("Quantity must be at least 1")
+
+    tiers = price_tiers(outcome_shares, event_shares, num_outcomes, quantity)
+    total_cost = math.fsum(tier.cost for tier in tiers)
+
+    return OutcomeQuote(
+        quantity=quantity,
+        total_cost=total_cost,
+        average_price=total_cost / quantity,
+        marginal_price=tiers[0].start_price,
+        final_price=tiers[-1].end_price,
+        next_price=spot_price(
+            outcome_shares + quantity, event_shares + quantity, num_outcomes
+        ),
+        tiers=tiers,
+        prices=(
+            price_ladder(outcome_shares, event_shares, num_outcomes, quantity)
+            if include_prices
+            else None
+        ),
+    )
@@ -0,0 +1,156 @@
+"""
+Fast JSON rendering for event reads.
+
+FastAPI would validate a route's return value against its response_model and
+then walk it again with jsonable_encoder before encoding it, which for an
+event with tens of thousands of shares costs far more than the query. Event
+and share payloads are instead rendered straight to bytes: shares are read as
+plain rows of exactly the ShareRead columns, so they need no validation and
+pydantic-core encodes them in one pass.
+
+Rendered event details are cached per event and version. A write bumps the
+version, so a stale body can never be served, and writers also drop their
+event's entry so it doesn't take up space. Large bodies are gzipped once,
+the first time a client asks for it, and kept alongside.
+"""
+
+import gzip
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from fastapi import Response
+from poly_party.config import settings
+from poly_party.models import Event, EventReadWithShares, Outcome, Share, ShareRead
+from pydantic import BaseModel
+from pydantic_core import to_json
+
+JSON = "application/json"
+
+# The share table's columns in ShareRead's field order
+SHARE_COLUMNS = [Share.__table__.c[name] for name in ShareRead.model_fields]
+
+
+def render_event(event: Event, outcomes: list[Outcome], shares) -> bytes:
+    """An EventReadWithShares body, from rows selected with SHARE_COLUMNS."""
+    payload = EventReadWithShares.model_validate(
+        {**event.model_dump(), "outcomes": [o.model_dump() for o in outcomes]}
+    ).model_dump(mode="json", exclude={"shares"})
+    payload["shares"] = [dict(row) for row in shares]
+    return to_json(payload)
+
+
+def render_shares(shares, next_cursor: str | None) -> bytes:
+    """A SharePage body, from rows selected with SHARE_COLUMNS."""
+    return to_json({"items": [dict(row) for row in shares], "next_cursor": next_cursor})
+
+
+def accepts_gzip(accept_encoding: str | None) -> bool:
+    for coding in (accept_encoding or "").split(","):
+        name, _, params = coding.partition(";")
+        if name.strip().lower() in ("gzip", "*"):
+            quality = params.strip().removeprefix("q=") or "1"
+            try:
+                return float(quality) > 0
+            except ValueError:
+                return False
+    return False
+
+
+def wants_gzip(body: bytes, accept_encoding: str | None) -> bool:
+    return len(body) >= settings.response_gzip_min_bytes and accepts_gzip(
+        accept_encoding
+    )
+
+
+def json_response(
+    body: bytes, headers: dict[str, str], gzipped: bytes | None = None
+) -> Response:
+    """A JSON body, sent gzipped if its compressed form is given."""
+    headers = {**headers, "Vary": "Accept-Encoding"}
+    if gzipped is None:
+        return Response(body, media_type=JSON, headers=headers)
+    headers["Content-Encoding"] = "gzip"
+    # Byte-for-byte different from the identity body, so only weakly equal
+    if "ETag" in headers and not headers["ETag"].startswith("W/"):
+        headers["ETag"] = "W/" + headers["ETag"]
+    return Response(gzipped, media_type=JSON, headers=headers)
+
+
+def encode(
+    body: bytes, accept_encoding: str | None, headers: dict[str, str] | None = None
+) -> Response:
+    gzipped = gzip.compress(body) if wants_gzip(body, accept_encoding) else None
+    return json_response(body, headers or {}, gzipped)
+
+
+def model_response(
+    model: BaseModel, accept_encoding: str | None, headers: dict[str, str] | None = None
+) -> Response:
+    """Any response model, encoded by pydantic-core without re-validation."""
+    return encode(model.model_dump_json().encode(), accept_encoding, headers)
+
+
+@dataclass
+class Rendered:
+    version: int
+    body: bytes
+    gzipped: bytes | None = None  # compressed on first request
+
+    def response(self, accept_encoding: str | None, headers: dict[str, str]):
+        if not wants_gzip(self.body, accept_encoding):
+            return json_response(self.body, headers)
+        if self.gzipped is None:
+            self.gzipped = gzip.compress(self.body)
+        return json_response(self.body, headers, self.gzipped)
+
+
+class ResponseCache:
+    """Rendered bodies per event, least recently used first out past max_bytes."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[str, Rendered] = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, event_id: str, version: int) -> Rendered | None:
+        with self._lock:
+            rendered = self._entries.get(event_id)
+            if rendered is None or rendered.version != version:
+                return None
+            self._entries.move_to_end(event_id)
+            return rendered
+
+    def put(self, event_id: str, version: int, body: bytes) -> Rendered:
+        rendered = Rendered(version, body)
+        if len(body) > self.max_bytes:
+            return rendered
+        with self._lock:
+            current = self._entries.get(event_id)
+            # A slower reader mustn't replace a newer version with its older one
+            if current is not None and current.version > version:
+                return rendered
+            self._drop(event_id)
+            self._entries[event_id] = rendered
+            self._size += len(body)
+            while self._size > self.max_bytes:
+                self._drop(next(iter(self._entries)))
+        return rendered
+
+    def _drop(self, event_id: str):
+        rendered = self._entries.pop(event_id, None)
+        if rendered is not None:
+            self._size -= len(rendered.body)
+
+    def invalidate(self, event_id: str):
+        with self._lock:
+            self._drop(event_id)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+
+event_responses = ResponseCache(settings.response_cache_bytes)
@@ -1,18 +1,19 @@
 from datetime import datetime, timedelta, timezone
 from typing import Optional
-from jose import jwt
-from pwdlib import PasswordHash
+from jose import JWTError, jwt
 from fastapi import Depends, HTTPException
 from sqlmodel import Session, select
-from poly_party.db import get_session
+from sqlmodel.ext.asyncio.session import AsyncSession
+from poly_party.db import get_async_session, get_session
 from poly_party.models import User
 from fastapi.security import OAuth2PasswordBearer
 from poly_party.config import settings
+from poly_party.hashing import hash_in_worker, hashing_pool, password_hash, verify_in_worker
+from poly_party.user_cache import user_cache
 
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60
 
-password_hash = PasswordHash.recommended()
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 oauth2_scheme_optional = OAuth2PasswordBearer(tokenUrl="/auth/login", auto_error=False)
 
@@ -26,6 +27,21 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return password_hash.verify(plain_password, hashed_password)
 
 
+async def hash_password_async(password: str) -> str:
+    """Like hash_password, but runs in the hashing pool."""
+    return await hashing_pool.run(hash_in_worker, password)
+
+
+async def verify_password_async(
+    plain_password: str, hashed_password: str
+) -> tuple[bool, str | None]:
+    """
+    Verifies a password in the hashing pool. Also returns a new hash when the
+    stored one was made with different Argon2 parameters, else None.
+    """
+    return await hashing_pool.run(verify_in_worker, plain_password, hashed_password)
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
     if expires_delta:
@@ -40,30 +56,62 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     return encoded_jwt
 
 
-def decode_jwt_and_get_user(token: str = Depends(oauth2_scheme), session: Session = Depends(get_session), raise_exception=True) -> User:
+def decode_token_subject(token: str) -> str | None:
+    """The username a token was issued to, or None if it doesn't verify."""
+    # A token that verified once stays valid until it expires
+    username = user_cache.token_subject(token)
+    if username is not None:
+        return username
+
     try:
         payload = jwt.decode(token, settings.secret_phrase, algorithms=[ALGORITHM])
-        username: str = payload.get("sub")
-        if username is None and raise_exception:
-            raise HTTPException(status_code=401, detail="Invalid token")
-        elif username is None and not raise_exception:
-            return None
-    except:
+    except JWTError:
+        return None
+    username = payload.get("sub")
+    if username is not None:
+        user_cache.remember_token(token, username, payload.get("exp"))
+    return username
+
+
+def decode_jwt_and_get_user(token: str = Depends(oauth2_scheme), session: Session = Depends(get_session), raise_exception=True) -> User:
+    """
+    The user a token belongs to, as a detached snapshot. Handlers that write
+    to the user must load it into their own session first.
+    """
+    username = decode_token_subject(token)
+    if username is None:
         if raise_exception:
             raise HTTPException(status_code=401, detail="Could not validate credentials")
-        else:
-            return None
+        return None
+
+    user = user_cache.get_user(username)
+    if user is not None:
+        return user
 
     user = session.exec(select(User).where(User.username == username)).first()
     if user is None:
         raise HTTPException(status_code=404, detail="User not found")
-    return user
+    user_cache.remember_user(user)
+    return user_cache.detach(user)
 
 
-def get_current_user(
-    token: str = Depends(oauth2_scheme), session: Session = Depends(get_session)
-):
-    return decode_jwt_and_get_user(token, session)
+async def get_current_user(
+    token: str = Depends(oauth2_scheme),
+    session: AsyncSession = Depends(get_async_session),
+) -> User:
+    username = decode_token_subject(token)
+    if username is None:
+        raise HTTPException(status_code=401, detail="Could not validate credentials")
+
+    user = user_cache.get_user(username)
+    if user is not None:
+        return user
+
+    user = (await session.exec(select(User).where(User.username == username))).first()
+    if user is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    user_cache.remember_user(user)
+    return user_cache.detach(user)
 
 def get_current_user_optional(
     token: str | None = Depends(oauth2_scheme_optional), session: Session = Depends(get_session)
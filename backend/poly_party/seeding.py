@@ -0,0 +1,302 @@
+"""
+Synthetic data for profiling.
+
+    python -m poly_party.seeding --users 5000 --events 2000 --shares 2000000
+
+Bulk-loads users, events and shares into the configured database with
+multi-row inserts straight into the tables rather than through the request
+path. Every synthetic user has the same password, hashed once. Bettors and
+events are picked with a long tail, as at a real party, and each fill is
+priced by its event's engine at the totals the fills before it left.
+Each batch of fills is folded into price candles as it's inserted, and
+afterwards the counters, outcome prices and balances are brought up to date
+in a few set-based statements, so the data reads (and charts) as if it had
+been traded through the API.
+
+The share indexes are dropped for the load and rebuilt once at the end, all
+in one transaction, so an interrupted run leaves nothing behind. Stop the
+server first. Dropping an index locks the whole share table until the run
+commits (ACCESS EXCLUSIVE on PostgreSQL; SQLite's single writer is held
+from the first insert anyway), so every bet and share listing would wait
+for the whole run. Start it again afterwards, so its in-memory markets and
+leaderboard load what was seeded.
+"""
+
+import argparse
+import random
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from itertools import accumulate
+
+from poly_party.candles import fold, write_candles
+from poly_party.counters import rebuild_counters
+from poly_party.engines import engine_for
+from poly_party.hashing import password_hash
+from poly_party.models import Event, Outcome, Share, User, eventType
+from sqlalchemy import Engine
+from sqlmodel import Session, select, update
+
+DEFAULT_BATCH_SIZE = 50_000
+HISTORY_DAYS = 7  # Fills are spread over the week before now
+
+
+@dataclass
+class SeedReport:
+    users: int
+    events: int
+    outcomes: int
+    shares: int
+    seconds: float
+
+
+def _ids(rng: random.Random, count: int) -> list[str]:
+    # Drawn from the seeded generator so a run can be repeated exactly
+    return [str(uuid.UUID(int=rng.getrandbits(128), version=4)) for _ in range(count)]
+
+
+def _long_tail(rng: random.Random, count: int) -> list[float]:
+    """Cumulative weights under which a few items get most of the picks."""
+    return list(accumulate(rng.paretovariate(1.2) for _ in range(count)))
+
+
+def _insert(session: Session, model, rows: list[dict], batch_size: int):
+    # Core inserts: at millions of rows the ORM's per-row bookkeeping dominates
+    for start in range(0, len(rows), batch_size):
+        session.connection().execute(
+            model.__table__.insert(), rows[start : start + batch_size]
+        )
+
+
+def seed(
+    engine: Engine,
+    num_users: int,
+    num_events: int,
+    outcomes_per_event: int,
+    num_shares: int,
+    password: str = "password",
+    prefix: str = "seed",
+    balance: float = 1000.0,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    rng_seed: int = 0,
+) -> SeedReport:
+    """
+    Adds `num_users` users named `prefix`0, `prefix`1, ... and `num_events`
+    open events, then `num_shares` fills between them. Fails if a previous
+    run already used the prefix.
+    """
+    if outcomes_per_event < 2:
+        raise ValueError("Events need at least 2 outcomes")
+    started = time.perf_counter()
+    # Seeded per prefix too, so another prefix gets different ids
+    rng = random.Random(f"{prefix}:{rng_seed}")
+    now = datetime.utcnow().replace(microsecond=0)
+    history_start = now - timedelta(days=HISTORY_DAYS)
+
+    with Session(engine) as session:
+        first = f"{prefix}0"
+        if session.exec(select(User.id).where(User.username == first)).first():
+            raise ValueError(f"Users named {prefix}N exist already, pick a new prefix")
+
+        # 1. Users, all with one precomputed hash
+        hashed_password = password_hash.hash(password)
+        user_ids = _ids(rng, num_users)
+        users = [
+            {
+                "id": user_id,
+                "username": f"{prefix}{i}",
+                "hashed_password": hashed_password,
+                "balance": balance,
+                "admin": False,
+                "icon_url": None,
+            }
+            for i, user_id in enumerate(user_ids)
+        ]
+        _insert(session, User, users, batch_size)
+
+        # 2. Open events, started over the last week, and their outcomes
+        event_type = (
+            eventType.SINGLETON
+            if outcomes_per_event == 2
+            else eventType.MULTIPLE_CHOICE
+        )
+        event_ids = _ids(rng, num_events)
+        events, outcomes = [], []
+        outcome_ids: list[list[str]] = []  # Per event
+        for i, event_id in enumerate(event_ids):
+            start_time = history_start + timedelta(
+                seconds=rng.uniform(0, HISTORY_DAYS * 86400 / 2)
+            )
+            events.append(
+                {
+                    "id": event_id,
+                    "title": f"{prefix} event {i}",
+                    "description": "Synthetic event for profiling",
+                    "start_time": start_time,
+                    "end_time": now + timedelta(days=1),
+                    "type": event_type,
+                    "value": 1,
+                    "first_share_bonus": 0.0,
+                    "finalized": False,
+                    "pricing_engine": None,
+                    "version": 1,
+                    "updated_at": now,
+                }
+            )
+            outcome_ids.append(_ids(rng, outcomes_per_event))
+            outcomes.extend(
+                {
+                    "id": outcome_id,
+                    "event_id": event_id,
+                    "description": f"Outcome {k}",
+                    "value": k,
+                    "cost": 1 / outcomes_per_event,
+                }
+                for k, outcome_id in enumerate(outcome_ids[-1])
+            )
+        _insert(session, Event, events, batch_size)
+        _insert(session, Outcome, outcomes, batch_size)
+
+        # 3. Shares, a batch at a time, each priced at its event's totals. The
+        # share indexes are built once at the end rather than row by row,
+        # locking the table until the commit (see above)
+        share_indexes = Share.__table__.indexes
+        for index in share_indexes:
+            index.drop(session.connection(), checkfirst=True)
+        pricing = engine_for(event_type)
+        totals = [[0] * outcomes_per_event for _ in event_ids]
+        # Each event's prices as its last fill left them, for the candles
+        opening = pricing.prices([0] * outcomes_per_event, 1)
+        current = [opening for _ in event_ids]
+        spent = [0.0] * num_users
+        user_weights = _long_tail(rng, num_users)
+        event_weights = _long_tail(rng, num_events)
+        step = (now - history_start) / max(num_shares, 1)
+        inserted = 0
+        while inserted < num_shares:
+            # A full batch of picks, in case some bettors can't afford theirs
+            count = min(batch_size, num_shares - inserted)
+            k = batch_size
+            bettors = rng.choices(range(num_users), cum_weights=user_weights, k=k)
+            markets = rng.choices(range(num_events), cum_weights=event_weights, k=k)
+            rows, moves = [], []
+            for bettor, market in zip(bettors, markets):
+                if len(rows) == count:
+                    break
+                index = rng.randrange(outcomes_per_event)
+                quantity = min(int(rng.paretovariate(1.5)), 100)
+                before = current[market]
+                # Priced like a trade: up the curve from the event's totals
+                quote = pricing.quote(totals[market], index, quantity, 1)
+                if spent[bettor] + quote.total_cost > balance:
+                    continue  # Can't afford it, the next pick gets a turn
+                spent[bettor] += quote.total_cost
+                totals[market][index] += quantity
+                current[market] = pricing.prices(totals[market], 1)
+                timestamp = history_start + step * (inserted + len(rows))
+                ids = outcome_ids[market]
+                moves.append(
+                    (
+                        event_ids[market],
+                        dict(zip(ids, before)),
+                        dict(zip(ids, current[market])),
+                        {ids[index]: quantity},
+                        timestamp,
+                    )
+                )
+                rows.append(
+                    {
+                        "id": str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+                        "timestamp": timestamp,
+                        "value": 1,
+                        "quantity": quantity,
+                        "wager": quote.total_cost,
+                        "price": quote.average_price,
+                        "tiers": [tier.model_dump() for tier in quote.tiers],
+                        "event_id": event_ids[market],
+                        "outcome_id": outcome_ids[market][index],
+                        "user_id": user_ids[bettor],
+                    }
+                )
+            if not rows:
+                break  # Everyone is out of money
+            _insert(session, Share, rows, batch_size)
+            # Later batches' candles merge into these like later flushes do
+            write_candles(session, fold(moves))
+            inserted += len(rows)
+
+        # 4. Everything the fill path would have kept up to date
+        for index in share_indexes:
+            index.create(session.connection(), checkfirst=True)
+        rebuild_counters(session)
+        session.execute(
+            update(Outcome),
+            [
+                {"id": outcome_id, "cost": price}
+                for ids, prices in zip(outcome_ids, current)
+                for outcome_id, price in zip(ids, prices)
+            ],
+        )
+        session.execute(
+            update(User),
+            [
+                {"id": user_id, "balance": balance - amount}
+                for user_id, amount in zip(user_ids, spent)
+                if amount
+            ],
+        )
+        session.commit()
+
+    return SeedReport(
+        users=num_users,
+        events=num_events,
+        outcomes=len(outcomes),
+        shares=inserted,
+        seconds=time.perf_counter() - started,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog="poly_party.seeding",
+        description="Stop the server first, the run locks the share table.",
+    )
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--events", type=int, default=200)
+    parser.add_argument("--outcomes", type=int, default=3, help="per event")
+    parser.add_argument("--shares", type=int, default=100_000)
+    parser.add_argument("--password", default="password", help="for every user")
+    parser.add_argument("--prefix", default="seed", help="of usernames and titles")
+    parser.add_argument("--balance", type=float, default=1000.0)
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--seed", type=int, default=0, help="random seed")
+    args = parser.parse_args()
+
+    from poly_party.db import create_db_and_tables, engine
+
+    create_db_and_tables()
+    try:
+        report = seed(
+            engine,
+            num_users=args.users,
+            num_events=args.events,
+            outcomes_per_event=args.outcomes,
+            num_shares=args.shares,
+            password=args.password,
+            prefix=args.prefix,
+            balance=args.balance,
+            batch_size=args.batch_size,
+            rng_seed=args.seed,
+        )
+    except ValueError as e:
+        parser.error(str(e))
+    print(
+        f"Seeded {report.users} users, {report.events} events "
+        f"({report.outcomes} outcomes) and {report.shares} shares "
+        f"in {report.seconds:.1f}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
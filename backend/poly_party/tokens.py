@@ -0,0 +1,148 @@
+"""
+Registration tokens.
+
+Tokens are minted a batch at a time, in one transaction: the batch's codes
+are drawn at random and written with a single INSERT ... ON CONFLICT DO
+NOTHING, which lets the unique index on the code skip the ones already
+issued, and the few that collided are drawn again. Nothing reads the
+existing codes, so minting costs the same however many have been issued,
+until the space of codes of that length is nearly full.
+
+Codes come from the OS's random source, since anyone who can guess an unused
+one can register. Every token of a batch shares its batch id and expiry, so
+a batch of printed invites can be revoked together.
+"""
+
+import random
+import string
+import uuid
+from datetime import datetime, timedelta
+
+from fastapi import HTTPException, status
+from poly_party.config import settings
+from poly_party.models import Token, TokenBatch
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlmodel import Session, update
+
+ALPHABET = string.ascii_letters + string.digits
+MIN_LENGTH = 4
+MAX_LENGTH = 10
+MAX_BATCH = 1000
+# Draws that may come back without a single new code before giving up
+MAX_DRAWS = 10
+
+# The dialects whose inserts can skip rows that hit a unique index
+INSERTS = {"sqlite": sqlite.insert, "postgresql": postgresql.insert}
+
+_random = random.SystemRandom()
+
+
+def draw_codes(count: int, length: int) -> set[str]:
+    """`count` distinct random codes of `length` characters."""
+    codes: set[str] = set()
+    while len(codes) < count:
+        codes.add("".join(_random.choice(ALPHABET) for _ in range(length)))
+    return codes
+
+
+def insert_new(session: Session, rows: list[dict]) -> set[str]:
+    """Inserts the rows whose codes are unused; returns the codes inserted."""
+    insert = INSERTS[session.get_bind().dialect.name]
+    statement = (
+        insert(Token)
+        .values(rows)
+        .on_conflict_do_nothing(index_elements=["token"])
+        .returning(Token.token)
+    )
+    return set(session.execute(statement).scalars())
+
+
+def mint_tokens(
+    session: Session,
+    count: int,
+    length: int | None = None,
+    expires_in_minutes: int | None = None,
+) -> TokenBatch:
+    """Issues `count` new unused tokens as one batch."""
+    length = length or settings.registration_token_length
+    if not 1 <= count <= MAX_BATCH:
+        raise HTTPException(
+            status_code=400, detail=f"Mint between 1 and {MAX_BATCH} tokens at once"
+        )
+    if not MIN_LENGTH <= length <= MAX_LENGTH:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Tokens are {MIN_LENGTH} to {MAX_LENGTH} characters long",
+        )
+    if expires_in_minutes is not None and expires_in_minutes < 1:
+        # 0 would read as "never" and a negative time as already expired
+        raise HTTPException(
+            status_code=400, detail="Tokens expire at least a minute after minting"
+        )
+    expires_at = (
+        datetime.utcnow() + timedelta(minutes=expires_in_minutes)
+        if expires_in_minutes is not None
+        else None
+    )
+
+    # 1. Insert random codes and let the unique index drop the issued ones,
+    # then draw again for however many that was
+    batch_id = str(uuid.uuid4())
+    codes: list[str] = []
+    misses = 0
+    while len(codes) < count:
+        rows = [
+            {
+                "id": str(uuid.uuid4()),
+                "token": code,
+                "used": False,
+                "revoked": False,
+                "batch_id": batch_id,
+                "expires_at": expires_at,
+            }
+            for code in draw_codes(count - len(codes), length)
+        ]
+        inserted = insert_new(session, rows)
+        codes.extend(row["token"] for row in rows if row["token"] in inserted)
+        misses = 0 if inserted else misses + 1
+        if misses == MAX_DRAWS:
+            # 2. Hardly a code of this length is left, nothing is minted
+            session.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Tokens of length {length} are used up, mint longer ones",
+            )
+
+    session.commit()
+    return TokenBatch(batch_id=batch_id, expires_at=expires_at, tokens=codes)
+
+
+def revoke_tokens(
+    session: Session, batch_id: str | None = None, tokens: list[str] | None = None
+) -> int:
+    """Revokes the unused tokens of a batch and/or by code; returns how many."""
+    tokens = tokens or []
+    if batch_id is None and not tokens:
+        raise HTTPException(status_code=400, detail="Name a batch or some tokens")
+    # Only match a batch when one is named: tokens from before batches have none
+    named = Token.token.in_(tokens)
+    if batch_id is not None:
+        named |= Token.batch_id == batch_id
+    result = session.execute(
+        update(Token)
+        .where((Token.used == False) & (Token.revoked == False) & named)
+        .values(revoked=True)
+        .execution_options(synchronize_session=False)
+    )
+    session.commit()
+    return result.rowcount
+
+
+def redeemable(code: str, now: datetime):
+    """A token that can still register someone: unused, unrevoked, unexpired."""
+    return (
+        (Token.token == code)
+        & (Token.used == False)
+        & (Token.revoked == False)
+        & ((Token.expires_at == None) | (Token.expires_at > now))
+    )
@@ -0,0 +1,276 @@
+"""
+Trade execution.
+
+Fills on the same event are serialized by a per-event lock held from the
+moment the price is read until the fill has committed and been applied to
+the market state, so no two trades can both price against the same totals.
+Trades on different events take different locks and run in parallel; the
+balance is debited with a single conditional UPDATE so concurrent trades by
+one user on different events can't overwrite each other either.
+
+A batch of bets holds the locks of every event it touches, always taken in
+event id order so two batches can never each wait on a lock the other holds.
+
+Those locks only cover one process. Across worker processes, a trade also
+locks its events' rows (SELECT ... FOR UPDATE, taken in the same order) and
+prices against the share counters stored there, which the previous holder
+of the lock committed. SQLite has no row locks, so there a trade takes the
+database's write lock (BEGIN IMMEDIATE) before it reads anything instead.
+
+Async routes first queue on an asyncio lock for the event, so a coroutine
+never blocks the event loop waiting for the thread lock another coroutine
+on the same loop is holding.
+"""
+
+import asyncio
+import threading
+import weakref
+from contextlib import ExitStack, asynccontextmanager, contextmanager
+from datetime import datetime
+from math import fsum
+
+from fastapi import HTTPException
+from poly_party.candles import candle_buffer
+from poly_party.counters import record_fill
+from poly_party.db import begin_write
+from poly_party.leaderboard import leaderboard
+from poly_party.market_state import EventMarket, market_state
+from poly_party.models import BetLeg, Event, Outcome, OutcomeQuote, Share, User
+from poly_party.price_feed import price_feed
+from poly_party.rendering import event_responses
+from poly_party.user_cache import user_cache
+from sqlmodel import Session, select, update
+
+
+class EventLocks:
+    """One lock per event, created on demand and dropped once unused."""
+
+    def __init__(self):
+        self._locks: weakref.WeakValueDictionary[str, threading.Lock] = (
+            weakref.WeakValueDictionary()
+        )
+        self._async_locks: weakref.WeakValueDictionary[str, asyncio.Lock] = (
+            weakref.WeakValueDictionary()
+        )
+        self._guard = threading.Lock()
+
+    def get(self, event_id: str) -> threading.Lock:
+        with self._guard:
+            lock = self._locks.get(event_id)
+            if lock is None:
+                lock = threading.Lock()
+                self._locks[event_id] = lock
+            return lock
+
+    @contextmanager
+    def hold(self, event_id: str):
+        lock = self.get(event_id)
+        with lock:
+            yield
+
+    @asynccontextmanager
+    async def hold_async(self, event_id: str):
+        with self._guard:
+            lock = self._async_locks.get(event_id)
+            if lock is None:
+                lock = asyncio.Lock()
+                self._async_locks[event_id] = lock
+        async with lock:
+            yield
+
+
+event_locks = EventLocks()
+
+
+def debit_balance(user_id: str, amount: float, session: Session) -> bool:
+    """
+    Takes `amount` off a user's balance if they can afford it, as one atomic
+    UPDATE against the current row rather than a read-modify-write.
+    """
+    result = session.execute(
+        update(User)
+        .where((User.id == user_id) & (User.balance >= amount))
+        .values(balance=User.balance - amount)
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount == 1
+
+
+def leg_error(legs: list[BetLeg], index: int, status_code: int, detail: str):
+    # Single bets keep their plain messages, batches say which leg failed
+    if len(legs) > 1:
+        detail = f"Leg {index + 1}: {detail}"
+    return HTTPException(status_code=status_code, detail=detail)
+
+
+def execute_bet(
+    event_id: str,
+    outcome_id: str,
+    quantity: int,
+    expected_price: float,
+    session: Session,
+    user: User,
+) -> Share:
+    leg = BetLeg(
+        event_id=event_id,
+        outcome_id=outcome_id,
+        quantity=quantity,
+        expected_price=expected_price,
+    )
+    return execute_batch([leg], session, user)[0]
+
+
+def execute_batch(legs: list[BetLeg], session: Session, user: User) -> list[Share]:
+    """
+    Fills every leg in one transaction, or none of them. Each leg is priced
+    against the totals the legs before it leave behind and checked against
+    its own slippage limit, the balance is debited once for the lot, and
+    each event touched is repriced once.
+    """
+    event_ids = sorted({leg.event_id for leg in legs})
+    with ExitStack() as locks:
+        # Always taken in id order, so two batches can't wait on each other
+        for event_id in event_ids:
+            locks.enter_context(event_locks.hold(event_id))
+        # And their rows, in the same order, for other worker processes. Held
+        # until this transaction ends; on SQLite, the whole database is
+        if session.get_bind().dialect.name == "sqlite":
+            begin_write(session)
+        else:
+            session.exec(
+                select(Event.id)
+                .where(Event.id.in_(event_ids))
+                .order_by(Event.id)
+                .with_for_update()
+            ).all()
+
+        # 1. Validation, against the events as they are now that we hold their locks
+        events: dict[str, Event] = {}
+        markets: dict[str, EventMarket] = {}
+        totals: dict[str, dict[str, int]] = {}
+        opening: dict[str, dict[str, float]] = {}
+        quotes: list[OutcomeQuote] = []
+        for i, leg in enumerate(legs):
+            if leg.event_id not in events:
+                db_event = session.get(Event, leg.event_id, populate_existing=True)
+                if not db_event or db_event.finalized:
+                    raise leg_error(legs, i, 400, "Event unavailable or finalized")
+                market = market_state.get_current(leg.event_id, session)
+                if market is None:
+                    raise leg_error(legs, i, 404, "Outcome not found")
+                events[leg.event_id] = db_event
+                markets[leg.event_id] = market
+                totals[leg.event_id] = market.snapshot()
+                opening[leg.event_id] = market.prices_for(totals[leg.event_id])
+
+            market = markets[leg.event_id]
+            if not market.has_outcome(leg.outcome_id):
+                raise leg_error(legs, i, 404, "Outcome not found")
+
+            # 2. Calculate the actual cost using the scaled model
+            try:
+                quote = market.quote_against(
+                    totals[leg.event_id], leg.outcome_id, leg.quantity
+                )
+            except ValueError as e:
+                raise leg_error(legs, i, 400, str(e))
+
+            # Slippage check: if the last share is more expensive than the user expected, block the trade
+            if quote.final_price > leg.expected_price + 0.01:  # Buffer for float math
+                raise leg_error(legs, i, 400, "Price moved too much (slippage)")
+
+            totals[leg.event_id][leg.outcome_id] += (
+                events[leg.event_id].value * leg.quantity
+            )
+            quotes.append(quote)
+
+        # 3. Deduct the whole batch's cost at once and record each leg as a fill
+        # (reading user.id after the commit could reload it under the lock)
+        user_id = user.id
+        cost = fsum(quote.total_cost for quote in quotes)
+        if not debit_balance(user_id, cost, session):
+            session.rollback()
+            raise HTTPException(status_code=400, detail="Insufficient balance")
+
+        shares: list[Share] = []
+        volume: dict[str, dict[str, int]] = {event_id: {} for event_id in events}
+        bought: dict[str, dict[str, int]] = {event_id: {} for event_id in events}
+        for leg, quote in zip(legs, quotes):
+            db_event = events[leg.event_id]
+            units = db_event.value * leg.quantity
+            # Counted before the share is added, so the bettor isn't its own precedent
+            record_fill(
+                session, db_event.id, leg.outcome_id, user_id, units, quote.total_cost
+            )
+            fills = volume[leg.event_id]
+            fills[leg.outcome_id] = fills.get(leg.outcome_id, 0) + units
+            counts = bought[leg.event_id]
+            counts[leg.outcome_id] = counts.get(leg.outcome_id, 0) + leg.quantity
+
+            share = Share(
+                value=db_event.value,
+                quantity=leg.quantity,
+                outcome_id=leg.outcome_id,
+                wager=quote.total_cost,
+                price=quote.average_price,
+                # Keep the price breakdown so the per-share prices can be reconstructed
+                tiers=[tier.model_dump() for tier in quote.tiers],
+                event_id=db_event.id,
+                user_id=user_id,
+            )
+            session.add(share)
+            shares.append(share)
+
+        # 4. UPDATE ALL OUTCOMES (The new percentages)
+        # The market state knows every total, so no aggregate queries are needed,
+        # and the engine reprices every outcome of an event at once
+        closing = {
+            event_id: market.prices_for(totals[event_id])
+            for event_id, market in markets.items()
+        }
+        new_costs = [
+            {"id": outcome_id, "cost": price}
+            for prices in closing.values()
+            for outcome_id, price in prices.items()
+        ]
+        # This updates the 'cost' field used by the UI to show the current price,
+        # as one executemany by primary key without loading the outcomes
+        session.execute(update(Outcome), new_costs)
+
+        # 5. Finalize, telling a leaderboard load this fill isn't applied yet
+        share_ids = [share.id for share in shares]
+        locks.enter_context(leaderboard.writing())
+        try:
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise HTTPException(status_code=500, detail="Transaction failed")
+
+        # Only committed fills move the in-memory markets, and the price
+        # history, queued here in fill order and written out in the background
+        new_prices = {
+            event_id: markets[event_id].apply_fills(fills)
+            for event_id, fills in volume.items()
+        }
+        now = datetime.utcnow()
+        for event_id in events:
+            candle_buffer.add(
+                event_id, opening[event_id], closing[event_id], bought[event_id], now
+            )
+        leaderboard.record_fills(user_id, cost, bought, new_prices)
+        user_cache.invalidate(user_id)
+        for event_id in events:
+            event_responses.invalidate(event_id)
+
+    # Broadcast the new outcome costs to everyone watching these events
+    for event_id, fills in volume.items():
+        price_feed.publish_fill(event_id, fills, new_prices[event_id])
+
+    # Reload the committed fills in one query
+    statement = (
+        select(Share)
+        .where(Share.id.in_(share_ids))
+        .execution_options(populate_existing=True)
+    )
+    loaded = {share.id: share for share in session.exec(statement)}
+    return [loaded[share_id] for share_id in share_ids]
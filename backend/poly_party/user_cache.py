@@ -0,0 +1,105 @@
+"""
+Authenticated-user cache.
+
+A token whose signature has verified is remembered until it expires, and the
+user it names is kept for a short TTL, so an authenticated request usually
+needs neither a signature check nor a user query. The cached user is a
+detached snapshot: handlers that change a user load a fresh, session-bound
+row, and every change to a balance, admin flag or icon invalidates the entry.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+from poly_party.config import settings
+from poly_party.models import User
+
+
+class TTLCache:
+    """A bounded LRU map whose entries also expire at their own deadline."""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._entries: OrderedDict[str, tuple[float, object]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value, ttl: float):
+        if ttl <= 0 or self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def pop(self, key: str):
+        with self._lock:
+            entry = self._entries.pop(key, None)
+        return entry[1] if entry else None
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class UserCache:
+    def __init__(self, max_size: int, ttl: float):
+        self.ttl = ttl
+        self._subjects = TTLCache(max_size)  # token -> username
+        self._users = TTLCache(max_size)  # username -> User snapshot
+        self._usernames = TTLCache(max_size)  # user id -> username
+
+    # --- Tokens ---
+
+    def token_subject(self, token: str) -> str | None:
+        return self._subjects.get(token)
+
+    def remember_token(self, token: str, username: str, expires_at: float | None):
+        """Caches a verified token until its `exp` (a unix timestamp)."""
+        if self.ttl <= 0:
+            return
+        ttl = self.ttl if expires_at is None else expires_at - time.time()
+        self._subjects.set(token, username, ttl)
+
+    # --- Users ---
+
+    @staticmethod
+    def detach(user: User) -> User:
+        """A copy of the user's columns that isn't bound to any session."""
+        return User(**user.model_dump())
+
+    def get_user(self, username: str) -> User | None:
+        snapshot = self._users.get(username)
+        # Hand out a copy so a handler can't change the cached snapshot
+        return self.detach(snapshot) if snapshot else None
+
+    def remember_user(self, user: User):
+        self._users.set(user.username, self.detach(user), self.ttl)
+        self._usernames.set(user.id, user.username, self.ttl)
+
+    def invalidate(self, user_id: str):
+        """Forgets a user after their balance, admin flag or icon changed."""
+        username = self._usernames.pop(user_id)
+        if username is not None:
+            self._users.pop(username)
+
+    def clear(self):
+        self._subjects.clear()
+        self._users.clear()
+        self._usernames.clear()
+
+
+user_cache = UserCache(settings.user_cache_size, settings.user_cache_ttl_seconds)
@@ -0,0 +1,74 @@
+from datetime import datetime
+
+import pytest
+from poly_party.candles import candle_buffer
+from poly_party.leaderboard import leaderboard
+from poly_party.market_state import market_state
+from poly_party.models import Event, Outcome, eventType
+from poly_party.price_feed import price_feed
+from poly_party.rendering import event_responses
+from poly_party.user_cache import user_cache
+from sqlalchemy import event as sa_event
+from sqlmodel import Session, SQLModel, create_engine
+
+
+@pytest.fixture(autouse=True)
+def reset_singletons():
+    # Every in-process store a test can fill, so none leaks into the next test
+    yield
+    market_state.clear()
+    leaderboard.clear()
+    user_cache.clear()
+    price_feed.clear()
+    candle_buffer.clear()
+    event_responses.clear()
+
+
+@pytest.fixture(name="session")
+def session_fixture(tmp_path):
+    # A file, so other threads and the async routes' engine share the data
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'test.db'}", connect_args={"check_same_thread": False}
+    )
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        yield session
+    engine.dispose()
+
+
+def create_market(
+    session: Session,
+    title: str = "Market",
+    start_time: datetime = datetime.fromisoformat("2026-01-01T10:00:00"),
+    finalized: bool = False,
+    value: int = 1,
+) -> Event:
+    """A two-outcome (Yes/No) singleton event."""
+    event = Event(
+        title=title,
+        description="A market to bet on",
+        type=eventType.SINGLETON,
+        finalized=finalized,
+        start_time=start_time,
+        end_time=datetime.fromisoformat("2026-01-01T12:00:00"),
+        value=value,
+        outcomes=[
+            Outcome(description="Yes", value=1),
+            Outcome(description="No", value=0),
+        ],
+    )
+    session.add(event)
+    session.commit()
+    session.refresh(event)
+    return event
+
+
+def count_queries(session: Session) -> list[str]:
+    """Collects every statement the session's engine runs from now on."""
+    queries: list[str] = []
+    sa_event.listen(
+        session.get_bind(),
+        "before_cursor_execute",
+        lambda conn, cursor, statement, *args: queries.append(statement),
+    )
+    return queries
@@ -0,0 +1,105 @@
+import asyncio
+import time
+
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+from poly_party.db import get_async_session
+from poly_party.hashing import HashingPool, hash_in_worker, hashing_pool, password_hash
+from poly_party.main import app
+from poly_party.models import User
+from pwdlib import PasswordHash
+from pwdlib.hashers.argon2 import Argon2Hasher
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+from sqlmodel import Session, SQLModel, create_engine, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+# Cheaper than the configured parameters, like a hash from an older deploy
+old_password_hash = PasswordHash(
+    (Argon2Hasher(time_cost=1, memory_cost=8192, parallelism=1),)
+)
+
+
+@pytest.fixture(name="engine")
+def engine_fixture(tmp_path):
+    database_path = tmp_path / "auth.db"
+    engine = create_engine(f"sqlite:///{database_path}")
+    SQLModel.metadata.create_all(engine)
+    async_engine = create_async_engine(
+        f"sqlite+aiosqlite:///{database_path}", poolclass=NullPool
+    )
+
+    async def get_async_session_override():
+        async with AsyncSession(async_engine, expire_on_commit=False) as session:
+            yield session
+
+    app.dependency_overrides[get_async_session] = get_async_session_override
+    yield engine
+    app.dependency_overrides.clear()
+    hashing_pool.shutdown()
+    engine.dispose()
+
+
+def add_user(engine, hashed_password: str):
+    with Session(engine) as session:
+        session.add(User(username="partygoer", hashed_password=hashed_password))
+        session.commit()
+
+
+def stored_hash(engine) -> str:
+    with Session(engine) as session:
+        return session.exec(select(User.hashed_password)).one()
+
+
+def test_login_rehashes_passwords_made_with_old_parameters(engine):
+    old_hash = old_password_hash.hash("hunter2")
+    add_user(engine, old_hash)
+
+    response = TestClient(app).post(
+        "/auth/login", data={"username": "partygoer", "password": "hunter2"}
+    )
+
+    assert response.status_code == 200
+    new_hash = stored_hash(engine)
+    assert new_hash != old_hash
+    assert password_hash.verify("hunter2", new_hash)
+    assert not password_hash.current_hasher.check_needs_rehash(new_hash)
+
+
+def test_failed_login_keeps_the_stored_hash(engine):
+    old_hash = old_password_hash.hash("hunter2")
+    add_user(engine, old_hash)
+
+    response = TestClient(app).post(
+        "/auth/login", data={"username": "partygoer", "password": "wrong"}
+    )
+
+    assert response.status_code == 401
+    assert stored_hash(engine) == old_hash
+
+
+def test_hashing_pool_runs_in_worker_processes():
+    pool = HashingPool(workers=1, max_pending=4)
+    try:
+        hashed = asyncio.run(pool.run(hash_in_worker, "hunter2"))
+    finally:
+        pool.shutdown()
+
+    assert password_hash.verify("hunter2", hashed)
+
+
+def test_hashing_pool_turns_away_work_past_its_limit():
+    pool = HashingPool(workers=0, max_pending=1)
+
+    async def burst():
+        return await asyncio.gather(
+            pool.run(time.sleep, 0.2), pool.run(time.sleep, 0.2), return_exceptions=True
+        )
+
+    first, second = asyncio.run(burst())
+
+    assert first is None
+    assert isinstance(second, HTTPException) and second.status_code == 503
+    # The slot frees up once the first hash is done
+    assert asyncio.run(pool.run(time.sleep, 0)) is None
@@ -0,0 +1,123 @@
+from datetime import datetime
+
+import pytest
+from poly_party.candles import bucket_start, candle_buffer, load_candles
+from poly_party.models import Candle, User
+from poly_party.trading import execute_bet
+from sqlmodel import Session, select
+from tests.conftest import create_market
+
+
+def at(clock: str) -> datetime:
+    return datetime.fromisoformat(f"2026-01-01T{clock}")
+
+
+def test_bucket_start_floors_to_the_resolution():
+    assert bucket_start(at("10:37:42.5"), 1) == at("10:37:42")
+    assert bucket_start(at("10:37:42"), 60) == at("10:37:00")
+    assert bucket_start(at("10:37:42"), 3600) == at("10:00:00")
+
+
+def test_fills_upsert_one_candle_per_bucket(session: Session):
+    event = create_market(session)
+    yes, no = (outcome.id for outcome in event.outcomes)
+    fills = [
+        (at("10:00:05"), {yes: 0.5, no: 0.5}, {yes: 0.6, no: 0.4}, {yes: 2}),
+        (at("10:00:30"), {yes: 0.6, no: 0.4}, {yes: 0.8, no: 0.2}, {yes: 3}),
+        (at("10:00:50"), {yes: 0.8, no: 0.2}, {yes: 0.7, no: 0.3}, {no: 1}),
+        (at("10:01:10"), {yes: 0.7, no: 0.3}, {yes: 0.65, no: 0.35}, {no: 1}),
+    ]
+    for timestamp, before, after, volume in fills:
+        candle_buffer.add(event.id, before, after, volume, timestamp)
+    candle_buffer.flush(session)
+
+    minutes = session.exec(
+        select(Candle)
+        .where((Candle.outcome_id == yes) & (Candle.resolution == 60))
+        .order_by(Candle.bucket_start)
+    ).all()
+    assert [(c.open, c.high, c.low, c.close, c.volume) for c in minutes] == [
+        (0.5, 0.8, 0.5, 0.7, 5),
+        (0.7, 0.7, 0.65, 0.65, 0),
+    ]
+    hour = session.exec(
+        select(Candle).where((Candle.outcome_id == no) & (Candle.resolution == 3600))
+    ).one()
+    assert (hour.open, hour.high, hour.low, hour.close, hour.volume) == (
+        0.5,
+        0.5,
+        0.2,
+        0.35,
+        2,
+    )
+
+
+def test_coarser_resolutions_are_merged_from_stored_candles(session: Session):
+    event = create_market(session)
+    yes, no = (outcome.id for outcome in event.outcomes)
+    for minute, price in enumerate([0.5, 0.9, 0.3, 0.6, 0.55, 0.4]):
+        before = {yes: price - 0.05, no: 1.05 - price}
+        after = {yes: price, no: 1 - price}
+        candle_buffer.add(event.id, before, after, {yes: 1}, at(f"10:0{minute}:00"))
+    candle_buffer.flush(session)
+
+    candles = load_candles(session, event.id, 300, at("10:00:00"), at("11:00:00"))
+
+    first, second = candles[yes]
+    assert (first.bucket_start, second.bucket_start) == (at("10:00:00"), at("10:05:00"))
+    assert (first.open, first.high, first.close) == (0.45, 0.9, 0.55)
+    assert first.low == pytest.approx(0.25)
+    assert (first.volume, second.volume) == (5, 1)
+    assert set(candles) == {yes, no}
+    only_no = load_candles(session, event.id, 300, at("10:00"), at("11:00"), no)
+    assert list(only_no) == [no]
+
+
+def test_bets_extend_the_price_history(session: Session):
+    event = create_market(session)
+    yes, no = event.outcomes
+    user = User(username="charter", hashed_password="")
+    session.add(user)
+    session.commit()
+
+    execute_bet(event.id, yes.id, 3, 1.0, session, user)
+    execute_bet(event.id, no.id, 1, 1.0, session, user)
+
+    # Queued by the fills, written by the next flush as one row per candle
+    assert session.exec(select(Candle)).all() == []
+    assert candle_buffer.flush(session) == 2 * 3
+    candles = session.exec(
+        select(Candle).where((Candle.outcome_id == yes.id) & (Candle.resolution == 60))
+    ).all()
+    session.refresh(yes)
+    assert sum(c.volume for c in candles) == 3
+    assert candles[-1].close == pytest.approx(yes.cost)
+    assert {c.resolution for c in session.exec(select(Candle))} == {1, 60, 3600}
+
+
+def test_failed_flushes_keep_their_fills(session: Session):
+    event = create_market(session)
+    yes, no = (outcome.id for outcome in event.outcomes)
+    candle_buffer.add(
+        event.id, {yes: 0.5, no: 0.5}, {yes: 0.6, no: 0.4}, {yes: 1}, at("10:00:00")
+    )
+
+    class Broken:
+        def connection(self):
+            raise RuntimeError("database went away")
+
+        def rollback(self):
+            pass
+
+    with pytest.raises(RuntimeError):
+        candle_buffer.flush(Broken())
+    candle_buffer.add(
+        event.id, {yes: 0.6, no: 0.4}, {yes: 0.7, no: 0.3}, {yes: 1}, at("10:00:10")
+    )
+
+    # Two one-second buckets, one minute and one hour, for both outcomes
+    assert candle_buffer.flush(session) == 2 * 4
+    minute = session.exec(
+        select(Candle).where((Candle.outcome_id == yes) & (Candle.resolution == 60))
+    ).one()
+    assert (minute.open, minute.close, minute.volume) == (0.5, 0.7, 2)
@@ -0,0 +1,50 @@
+import pytest
+from poly_party.counters import rebuild_counters, verify_counters
+from poly_party.models import Event, Outcome, User
+from poly_party.trading import execute_bet
+from sqlmodel import Session, update
+from tests.conftest import create_market
+
+
+def place_bets(session: Session) -> Event:
+    event = create_market(session, value=2)
+    yes, no = event.outcomes
+    users = [User(username=f"user{i}", hashed_password="") for i in range(2)]
+    session.add_all(users)
+    session.commit()
+    execute_bet(event.id, yes.id, 3, 1.0, session, users[0])
+    execute_bet(event.id, yes.id, 1, 1.0, session, users[0])
+    execute_bet(event.id, no.id, 2, 1.0, session, users[1])
+    execute_bet(event.id, yes.id, 1, 1.0, session, users[1])
+    session.refresh(event)
+    return event
+
+
+def test_fills_keep_counters_in_step(session: Session):
+    event = place_bets(session)
+    yes, no = event.outcomes
+
+    assert (event.share_count, event.participant_count) == (14, 2)
+    assert (yes.share_count, yes.participant_count) == (10, 2)
+    assert (no.share_count, no.participant_count) == (4, 1)
+    assert event.total_wagered == pytest.approx(sum(s.wager for s in event.shares))
+    assert verify_counters(session) == []
+
+
+def test_rebuild_repairs_drifted_counters(session: Session):
+    event = place_bets(session)
+    yes = event.outcomes[0]
+    session.exec(update(Outcome).where(Outcome.id == yes.id).values(share_count=0))
+    session.exec(update(Event).values(participant_count=7))
+    session.commit()
+
+    drift = {(m.kind, m.counter, m.stored, m.actual) for m in verify_counters(session)}
+    assert drift == {
+        ("outcome", "share_count", 0, 10),
+        ("event", "participant_count", 7, 2),
+    }
+
+    rebuild_counters(session)
+    session.commit()
+
+    assert verify_counters(session) == []
@@ -0,0 +1,26 @@
+from poly_party.config import settings
+from poly_party.db import async_url, engine_options
+
+
+def test_async_url_picks_an_async_driver():
+    assert async_url("sqlite:///database.db").drivername == "sqlite+aiosqlite"
+    assert (
+        async_url("postgresql://user:pass@db:5432/app").drivername
+        == "postgresql+psycopg"
+    )
+    # Already async, or not ours to choose
+    assert async_url("postgresql+asyncpg://db/app").drivername == "postgresql+asyncpg"
+    assert async_url("mysql+aiomysql://db/app").drivername == "mysql+aiomysql"
+
+
+def test_engine_options_size_the_pool():
+    options = engine_options("postgresql://db/app")
+    assert options["pool_size"] == settings.database_pool_size
+    assert options["max_overflow"] == settings.database_max_overflow
+    assert "connect_args" not in options
+
+    # SQLite connections cross threads, and in-memory ones aren't pooled
+    assert engine_options("sqlite:///database.db")["connect_args"] == {
+        "check_same_thread": False
+    }
+    assert "pool_size" not in engine_options("sqlite://")
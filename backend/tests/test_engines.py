@@ -0,0 +1,109 @@
+import math
+from datetime import datetime
+
+import pytest
+from poly_party import engines
+from poly_party.engines import LMSREngine, PricingEngine, ShareRatioEngine, engine_for
+from poly_party.market_state import market_state
+from poly_party.models import Event, Outcome, User, eventType, pricingEngine
+from poly_party.pricing import quote_shares
+from poly_party.trading import execute_bet
+from sqlmodel import Session
+
+LMSR = LMSREngine(liquidity=50.0)
+
+
+def lmsr_cost(shares: list[float], b: float = 50.0) -> float:
+    return b * math.log(sum(math.exp(q / b) for q in shares))
+
+
+def test_share_ratio_engine_is_the_closed_form_rule():
+    engine = ShareRatioEngine()
+
+    assert engine.prices([3, 1], 1) == [0.75, 0.25]
+    assert engine.quote([3, 1, 0], 1, 40, 1) == quote_shares(1, 4, 3, 40)
+
+
+def test_lmsr_prices_form_a_distribution():
+    assert LMSR.prices([0] * 4, 1) == pytest.approx([0.25] * 4)
+
+    prices = LMSR.prices([120, 30, 0, 0, 5], 1)
+    assert sum(prices) == pytest.approx(1.0)
+    assert prices[0] == max(prices)
+    # Hundreds of outcomes, far past where a naive exp would overflow
+    assert sum(LMSR.prices(list(range(0, 300_000, 1000)), 1)) == pytest.approx(1.0)
+
+
+def test_lmsr_quote_is_the_change_in_cost():
+    shares = [40, 10, 0]
+
+    quote = LMSR.quote(shares, 1, 25, 1, include_prices=True)
+
+    assert quote.total_cost == pytest.approx(lmsr_cost([40, 35, 0]) - lmsr_cost(shares))
+    assert sum(quote.prices) == pytest.approx(quote.total_cost)
+    assert quote.prices[0] == quote.marginal_price
+    assert quote.prices[-1] == quote.final_price
+    assert quote.marginal_price < quote.final_price < quote.next_price < 1
+
+
+def test_lmsr_counts_shares_not_market_units():
+    # With a weight of 2 the totals hold 2 units per share, so they are the
+    # same market as [20, 5] shares
+    weighted = LMSR.quote([40, 10], 0, 7, 2)
+    plain = LMSR.quote([20, 5], 0, 7, 1)
+
+    assert weighted.total_cost == pytest.approx(plain.total_cost)
+
+
+def test_engine_selection(monkeypatch):
+    assert isinstance(engine_for(eventType.SINGLETON), ShareRatioEngine)
+    assert isinstance(engine_for(eventType.SINGLETON, pricingEngine.LMSR), LMSREngine)
+
+    monkeypatch.setitem(
+        engines.DEFAULT_ENGINES, eventType.OVER_UNDER, pricingEngine.LMSR
+    )
+    assert isinstance(engine_for(eventType.OVER_UNDER), LMSREngine)
+    assert isinstance(
+        engine_for(eventType.OVER_UNDER, pricingEngine.SHARE_RATIO), ShareRatioEngine
+    )
+
+
+def test_engines_must_implement_quotes():
+    class PricesOnly(PricingEngine):
+        def prices(self, shares, weight):
+            return [0.5] * len(shares)
+
+    with pytest.raises(TypeError):
+        PricesOnly()
+
+
+def test_lmsr_ladder_trades_are_path_independent(session: Session):
+    event = Event(
+        title="Goals",
+        description="Over/under ladder",
+        type=eventType.OVER_UNDER,
+        pricing_engine=pricingEngine.LMSR,
+        start_time=datetime.fromisoformat("2026-01-01T10:00:00"),
+        end_time=datetime.fromisoformat("2026-01-01T12:00:00"),
+        value=2,
+        outcomes=[Outcome(description=f"{i}+", value=i) for i in range(200)],
+    )
+    user = User(username="bettor", hashed_password="", balance=1000)
+    session.add_all([event, user])
+    session.commit()
+    session.refresh(event)
+    rung = event.outcomes[10].id
+    b = engines.ENGINES[pricingEngine.LMSR].liquidity
+
+    first = execute_bet(event.id, rung, 30, 1.0, session, user)
+    second = execute_bet(event.id, rung, 20, 1.0, session, user)
+
+    # Two fills cost what one order of 50 would have
+    opening = b * math.log(200)
+    after = b * math.log(199 + math.exp(50 / b))
+    assert first.wager + second.wager == pytest.approx(after - opening)
+    # Every rung was repriced and the costs still sum to 1
+    session.refresh(event)
+    assert sum(outcome.cost for outcome in event.outcomes) == pytest.approx(1.0)
+    prices = market_state.get(event.id, session).prices()
+    assert prices[rung] == pytest.approx(math.exp(50 / b) / (199 + math.exp(50 / b)))
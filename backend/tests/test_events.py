@@ -3,32 +3,39 @@ from datetime import datetime
 import pytest
 from fastapi.testclient import TestClient
 from poly_party.api.auth import get_session
+from poly_party.api.events import MAX_PRICE_LADDER
+from poly_party.db import get_async_session
 from poly_party.main import app
-from poly_party.models import Event, User, eventType
+from poly_party.market_state import market_state
+from poly_party.models import Event, EventReadWithShares, Outcome, User, eventType
+from poly_party.rendering import event_responses
 from poly_party.security import get_current_user
-from sqlmodel import Session, SQLModel, create_engine
-from sqlmodel.pool import StaticPool
+from poly_party.trading import execute_bet
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+from sqlmodel import Session, update
+from sqlmodel.ext.asyncio.session import AsyncSession
+from tests.conftest import create_market
 
 # --- SETUP ---
 
 
-@pytest.fixture(name="session")
-def session_fixture():
-    # Use StaticPool to maintain the connection in memory across the test
-    engine = create_engine(
-        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
-    )
-    SQLModel.metadata.create_all(engine)
-    with Session(engine) as session:
-        yield session
-
-
 @pytest.fixture(name="client")
 def client_fixture(session: Session):
+    # NullPool: the test client runs each request on its own event loop
+    async_engine = create_async_engine(
+        f"sqlite+aiosqlite:///{session.bind.url.database}", poolclass=NullPool
+    )
+
     def get_current_user_override():
         return User(username="testuser", id=1, hashed_password="")
 
+    async def get_async_session_override():
+        async with AsyncSession(async_engine, expire_on_commit=False) as session:
+            yield session
+
     app.dependency_overrides[get_session] = lambda: session
+    app.dependency_overrides[get_async_session] = get_async_session_override
     app.dependency_overrides[get_current_user] = get_current_user_override
 
     yield TestClient(app)
@@ -43,6 +50,7 @@ def test_get_events(client: TestClient, session: Session):
     event = Event(
         id=1,
         title="Test Event",
+        description="Listed event",
         type=eventType.OVER_UNDER,
         start_time=datetime.fromisoformat("2026-01-01T10:00:00"),
         end_time=datetime.fromisoformat("2026-01-01T12:00:00"),
@@ -54,17 +62,20 @@ def test_get_events(client: TestClient, session: Session):
     response = client.get("/events/")
     assert response.status_code == 200
     data = response.json()
-    assert len(data) == 1
-    assert data[0]["title"] == "Test Event"
+    assert len(data["items"]) == 1
+    assert data["items"][0]["title"] == "Test Event"
+    assert "shares" not in data["items"][0]
+    assert data["next_cursor"] is None
 
 
 # 2. Test GET specific event details
 def test_get_event_details(client: TestClient, session: Session):
-    # Use an integer ID to match your Event model (Optional[int])
-    event_id = 123
+    # Event ids are strings (uuids by default)
+    event_id = "123"
     event = Event(
         id=event_id,
         title="Specific Event",
+        description="Event with details",
         type=eventType.SINGLETON,
         start_time=datetime.fromisoformat("2026-01-01T10:00:00"),
         end_time=datetime.fromisoformat("2026-01-01T12:00:00"),
@@ -94,6 +105,7 @@ def test_create_event(client: TestClient):
     # FastAPI/Pydantic will handle the conversion to datetime for you.
     payload = {
         "title": "Super Bowl 2026",
+        "description": "Total points scored",
         "start_time": "2026-02-08T23:00:00",
         "end_time": "2026-02-09T04:00:00",
         "type": "over/under",
@@ -112,3 +124,325 @@ def test_create_event(client: TestClient):
     assert data["id"] is not None
     # Verify that the response includes fields from EventBase
     assert data["type"] == "over/under"
+
+
+# 4. Test POST bet cost quotes
+def test_quote_omits_price_ladder_by_default(client: TestClient, session: Session):
+    event = create_market(session)
+    outcome = event.outcomes[0]
+
+    response = client.post(
+        "/events/bet/cost",
+        params={"num_shares": 50_000, "event_id": event.id, "outcome_id": outcome.id},
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["quantity"] == 50_000
+    assert data["prices"] is None
+    assert data["marginal_price"] == 0.5
+    assert data["final_price"] == 0.99
+    assert [tier["kind"] for tier in data["tiers"]] == ["opening", "ceiling"]
+
+
+def test_quote_batch(client: TestClient, session: Session):
+    event = create_market(session)
+    yes, no = event.outcomes
+
+    response = client.post(
+        "/events/bet/quotes",
+        params={"include_prices": True},
+        json=[
+            {"event_id": event.id, "outcome_id": yes.id, "quantity": 3},
+            {"event_id": event.id, "outcome_id": no.id, "quantity": 1},
+        ],
+    )
+
+    assert response.status_code == 200
+    first, second = response.json()
+    assert first["outcome_id"] == yes.id
+    assert first["prices"] == [0.5, 0.99, 0.99]
+    assert second["total_cost"] == 0.5
+
+
+def test_price_ladder_is_capped(client: TestClient, session: Session):
+    event = create_market(session)
+    yes, no = event.outcomes
+
+    single = client.post(
+        "/events/bet/cost",
+        params={
+            "num_shares": MAX_PRICE_LADDER + 1,
+            "event_id": event.id,
+            "outcome_id": yes.id,
+            "include_prices": True,
+        },
+    )
+    batch = client.post(
+        "/events/bet/quotes",
+        params={"include_prices": True},
+        json=[
+            {"event_id": event.id, "outcome_id": outcome.id, "quantity": quantity}
+            for outcome, quantity in ((yes, MAX_PRICE_LADDER), (no, 1))
+        ],
+    )
+
+    assert single.status_code == 400
+    assert batch.status_code == 400
+
+
+def test_quote_batch_unknown_outcome(client: TestClient, session: Session):
+    event = create_market(session)
+
+    response = client.post(
+        "/events/bet/quotes",
+        json=[{"event_id": event.id, "outcome_id": "missing", "quantity": 1}],
+    )
+
+    assert response.status_code == 404
+
+
+# 5. Test GET event pages
+def test_get_events_pages_with_filters(client: TestClient, session: Session):
+    for day in range(1, 6):
+        create_market(
+            session,
+            title=f"Day {day}",
+            start_time=datetime(2026, 1, day, 10),
+            finalized=day == 3,
+        )
+
+    first = client.get("/events/", params={"limit": 2, "finalized": False}).json()
+    assert [item["title"] for item in first["items"]] == ["Day 5", "Day 4"]
+
+    second = client.get(
+        "/events/",
+        params={"limit": 2, "finalized": False, "cursor": first["next_cursor"]},
+    ).json()
+    assert [item["title"] for item in second["items"]] == ["Day 2", "Day 1"]
+    assert second["next_cursor"] is None
+
+    windowed = client.get(
+        "/events/",
+        params={"starts_after": "2026-01-02T00:00:00", "starts_before": "2026-01-04"},
+    ).json()
+    assert [item["title"] for item in windowed["items"]] == ["Day 3", "Day 2"]
+
+
+def test_get_events_summarizes_shares(client: TestClient, session: Session):
+    event = create_market(session)
+    yes, no = event.outcomes
+    users = [User(username=f"user{i}", hashed_password="") for i in range(2)]
+    session.add_all(users)
+    session.commit()
+    execute_bet(event.id, yes.id, 3, 1.0, session, users[0])
+    execute_bet(event.id, no.id, 2, 1.0, session, users[1])
+    execute_bet(event.id, yes.id, 1, 1.0, session, users[1])
+
+    summary = client.get("/events/").json()["items"][0]
+
+    assert summary["share_total"] == 6
+    assert summary["participant_count"] == 2
+    totals = {outcome["id"]: outcome["share_total"] for outcome in summary["outcomes"]}
+    assert totals == {yes.id: 4, no.id: 2}
+
+
+def test_get_events_serves_prices_other_workers_stored(
+    client: TestClient, session: Session
+):
+    event = create_market(session)
+    yes = event.outcomes[0]
+    market_state.get(event.id, session)
+
+    # Another worker's fill moved the stored price; this worker's market didn't
+    session.exec(update(Outcome).where(Outcome.id == yes.id).values(cost=0.8))
+    session.exec(update(Event).where(Event.id == event.id).values(version=2))
+    session.commit()
+
+    summary = client.get("/events/").json()["items"][0]
+    prices = {outcome["id"]: outcome["cost"] for outcome in summary["outcomes"]}
+    assert prices[yes.id] == 0.8
+
+
+def test_get_event_shares_pages(client: TestClient, session: Session):
+    event = create_market(session)
+    user = User(username="pager", hashed_password="")
+    session.add(user)
+    session.commit()
+    for _ in range(3):
+        execute_bet(event.id, event.outcomes[0].id, 1, 1.0, session, user)
+
+    first = client.get(f"/events/{event.id}/shares", params={"limit": 2}).json()
+    second = client.get(
+        f"/events/{event.id}/shares",
+        params={"limit": 2, "cursor": first["next_cursor"]},
+    ).json()
+
+    assert len(first["items"]) == 2
+    assert len(second["items"]) == 1
+    assert second["next_cursor"] is None
+    assert client.get("/events/missing/shares").status_code == 404
+
+
+def test_get_events_rejects_bad_cursor(client: TestClient):
+    response = client.get("/events/", params={"cursor": "not-a-cursor"})
+
+    assert response.status_code == 400
+
+
+def test_rebuild_counters_reports_then_repairs(client: TestClient, session: Session):
+    event = create_market(session)
+    user = User(username="bettor", hashed_password="")
+    session.add(user)
+    session.commit()
+    execute_bet(event.id, event.outcomes[0].id, 2, 1.0, session, user)
+    session.exec(update(Event).values(share_count=0))
+    session.commit()
+
+    assert client.post("/events/counters/rebuild").status_code == 403
+    app.dependency_overrides[get_current_user] = lambda: User(
+        username="admin", id="admin", hashed_password="", admin=True
+    )
+
+    report = client.post("/events/counters/rebuild", params={"dry_run": True}).json()
+    assert report["rebuilt"] is False
+    assert [(m["counter"], m["stored"], m["actual"]) for m in report["mismatches"]] == [
+        ("share_count", 0, 2)
+    ]
+
+    assert client.post("/events/counters/rebuild").json()["rebuilt"] is True
+    assert client.post("/events/counters/rebuild").json()["mismatches"] == []
+    # Still loaded, with the repaired totals, for subscriptions that only peek
+    assert market_state.peek(event.id).snapshot()[event.outcomes[0].id] == 2
+
+
+def test_event_details_answer_matching_etag_with_304(
+    client: TestClient, session: Session
+):
+    event = create_market(session)
+    user = User(username="bettor", hashed_password="")
+    session.add(user)
+    session.commit()
+
+    first = client.get(f"/events/{event.id}")
+    etag = first.headers["etag"]
+    assert "last-modified" in first.headers
+
+    unchanged = client.get(f"/events/{event.id}", headers={"If-None-Match": etag})
+    assert unchanged.status_code == 304
+    assert unchanged.content == b""
+
+    execute_bet(event.id, event.outcomes[0].id, 1, 1.0, session, user)
+    changed = client.get(f"/events/{event.id}", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+    assert changed.json()["version"] == first.json()["version"] + 1
+
+
+def test_event_list_etag_covers_every_event_on_the_page(
+    client: TestClient, session: Session
+):
+    events = [
+        create_market(
+            session, f"Day {day}", datetime.fromisoformat(f"2026-01-0{day}T10:00:00")
+        )
+        for day in (1, 2)
+    ]
+    user = User(username="bettor", hashed_password="")
+    session.add(user)
+    session.commit()
+
+    etag = client.get("/events/", headers={"Accept-Encoding": "identity"}).headers[
+        "etag"
+    ]
+    assert (
+        client.get("/events/", headers={"If-None-Match": f"W/{etag}"}).status_code
+        == 304
+    )
+
+    # A fill on an older event still changes the page
+    execute_bet(events[0].id, events[0].outcomes[0].id, 1, 1.0, session, user)
+    assert client.get("/events/", headers={"If-None-Match": etag}).status_code == 200
+
+
+def test_event_details_render_like_the_response_model(
+    client: TestClient, session: Session
+):
+    event = create_market(session)
+    users = [User(username=f"user{i}", hashed_password="") for i in range(3)]
+    session.add_all(users)
+    session.commit()
+    for i, user in enumerate(users):
+        execute_bet(event.id, event.outcomes[i % 2].id, i + 1, 1.0, session, user)
+    session.refresh(event)
+    _ = event.outcomes, event.shares
+
+    response = client.get(f"/events/{event.id}", headers={"Accept-Encoding": "gzip"})
+
+    # Big enough to be sent gzipped (the client decodes it transparently)
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["etag"].startswith("W/")
+    expected = EventReadWithShares.model_validate(event).model_dump(mode="json")
+    expected["shares"].sort(key=lambda share: (share["timestamp"], share["id"]))
+    assert response.json() == expected
+
+
+def test_event_details_cache_is_dropped_by_a_fill(client: TestClient, session: Session):
+    event = create_market(session)
+    user = User(username="bettor", hashed_password="")
+    session.add(user)
+    session.commit()
+
+    client.get(f"/events/{event.id}")
+    assert event_responses.get(event.id, 1) is not None
+
+    execute_bet(event.id, event.outcomes[0].id, 1, 1.0, session, user)
+
+    assert event_responses.get(event.id, 1) is None
+    assert len(client.get(f"/events/{event.id}").json()["shares"]) == 1
+
+
+def test_batch_bet_endpoint(client: TestClient, session: Session):
+    events = [
+        create_market(session, title=f"Leg {i}", start_time=datetime(2026, 1, i + 1))
+        for i in range(2)
+    ]
+    session.add(User(username="testuser", id="1", hashed_password=""))
+    session.commit()
+    legs = [
+        {
+            "event_id": event.id,
+            "outcome_id": event.outcomes[0].id,
+            "quantity": 2,
+            "expected_price": 1.0,
+        }
+        for event in events
+    ]
+
+    response = client.post("/events/bet/batch", json={"legs": legs})
+
+    assert response.status_code == 200
+    assert [share["event_id"] for share in response.json()] == [e.id for e in events]
+    assert client.post("/events/bet/batch", json={"legs": []}).status_code == 400
+
+
+def test_event_candles_endpoint(client: TestClient, session: Session):
+    event = create_market(session)
+    yes = event.outcomes[0]
+    user = User(username="charter", hashed_password="")
+    session.add(user)
+    session.commit()
+    execute_bet(event.id, yes.id, 2, 1.0, session, user)
+
+    response = client.get(
+        f"/events/{event.id}/candles",
+        params={"resolution": 3600, "outcome_id": yes.id},
+    )
+
+    assert response.status_code == 200
+    series = response.json()
+    assert series["resolution"] == 3600
+    assert [c["volume"] for c in series["outcomes"][yes.id]] == [2]
+    params = {"resolution": 0}
+    assert client.get(f"/events/{event.id}/candles", params=params).status_code == 422
+    assert client.get("/events/missing/candles").status_code == 404
@@ -0,0 +1,183 @@
+import random
+
+import pytest
+from fastapi import HTTPException
+from poly_party.api.events import settle_event
+from poly_party.leaderboard import Leaderboard, RankedSet, leaderboard
+from poly_party.models import User, leaderboardRanking
+from poly_party.trading import execute_bet
+from sqlmodel import Session
+from tests.conftest import create_market
+
+NET_WORTH = leaderboardRanking.NET_WORTH
+BALANCE = leaderboardRanking.BALANCE
+
+
+def create_users(session: Session, count: int) -> list[User]:
+    users = [User(username=f"player{i}", hashed_password="") for i in range(count)]
+    session.add_all(users)
+    session.commit()
+    for user in users:
+        session.refresh(user)
+    return users
+
+
+def standings(board: Leaderboard, ranking: leaderboardRanking):
+    return [
+        (entry.user_id, entry.balance, entry.net_worth)
+        for entry in board.top(ranking, 0, board.size())
+    ]
+
+
+def test_ranked_set_matches_a_sorted_list():
+    rng = random.Random(7)
+    ranked, expected = RankedSet(), []
+    for _ in range(2000):
+        if expected and rng.random() < 0.4:
+            key = expected.pop(rng.randrange(len(expected)))
+            ranked.remove(key)
+        else:
+            key = (rng.random(), rng.randrange(10**9))
+            ranked.add(key)
+            expected.append(key)
+            expected.sort()
+
+    assert len(ranked) == len(expected)
+    assert ranked.slice(0, len(expected)) == expected
+    assert ranked.slice(17, 5) == expected[17:22]
+    for position in rng.sample(range(len(expected)), 50):
+        assert ranked.rank(expected[position]) == position
+    with pytest.raises(KeyError):
+        ranked.remove((2.0, 0))
+
+
+def test_fills_and_payouts_keep_rankings_in_step(session: Session):
+    event = create_market(session)
+    other = create_market(session, "Still open")
+    yes, no = event.outcomes
+    alice, bob, carol = create_users(session, 3)
+    leaderboard.load(session)
+
+    execute_bet(event.id, yes.id, 5, 1.0, session, alice)
+    execute_bet(event.id, no.id, 2, 1.0, session, bob)
+    execute_bet(other.id, other.outcomes[0].id, 1, 1.0, session, carol)
+
+    # Everyone is revalued at the prices the last fill on each event left
+    session.refresh(yes)
+    session.refresh(no)
+    session.refresh(alice)
+    alice_entry = leaderboard.standing(NET_WORTH, alice.id)
+    assert alice_entry.balance == pytest.approx(alice.balance)
+    assert alice_entry.net_worth == pytest.approx(alice.balance + 5 * yes.cost)
+    balances = [entry.balance for entry in leaderboard.top(BALANCE, 0, 3)]
+    assert balances == sorted(balances, reverse=True)
+
+    fresh = Leaderboard()
+    fresh.load(session)
+    for ranking in leaderboardRanking:
+        assert standings(leaderboard, ranking) == pytest.approx(
+            standings(fresh, ranking)
+        )
+
+    settle_event(event.id, yes.value, session)
+
+    session.refresh(alice)
+    alice_entry = leaderboard.standing(NET_WORTH, alice.id)
+    assert alice_entry.rank == 1
+    assert alice_entry.net_worth == pytest.approx(alice.balance)
+    fresh.load(session)
+    assert standings(leaderboard, NET_WORTH) == pytest.approx(
+        standings(fresh, NET_WORTH)
+    )
+
+
+def test_unloaded_leaderboard_ignores_updates(session: Session):
+    event = create_market(session)
+    (user,) = create_users(session, 1)
+
+    execute_bet(event.id, event.outcomes[0].id, 1, 1.0, session, user)
+
+    assert not leaderboard.loaded
+    assert leaderboard.size() == 0
+    leaderboard.ensure_loaded(session)
+    assert leaderboard.standing(BALANCE, user.id).balance == pytest.approx(
+        100 - event.outcomes[0].shares[0].wager
+    )
+
+
+def test_load_rereads_when_a_fill_lands_during_it(
+    session: Session, monkeypatch: pytest.MonkeyPatch
+):
+    event = create_market(session)
+    (alice,) = create_users(session, 1)
+    leaderboard.load(session)
+    read = Leaderboard._read
+    reads = []
+
+    def read_then_trade(session: Session):
+        # The first read misses a fill that commits and applies right after it
+        snapshot = read(session)
+        if not reads:
+            execute_bet(event.id, event.outcomes[0].id, 3, 1.0, session, alice)
+        reads.append(snapshot)
+        return snapshot
+
+    monkeypatch.setattr(Leaderboard, "_read", staticmethod(read_then_trade))
+    leaderboard.load(session)
+
+    assert len(reads) == 2
+    session.refresh(alice)
+    assert leaderboard.standing(BALANCE, alice.id).balance == pytest.approx(
+        alice.balance
+    )
+    monkeypatch.undo()
+    fresh = Leaderboard()
+    fresh.load(session)
+    assert standings(leaderboard, NET_WORTH) == pytest.approx(
+        standings(fresh, NET_WORTH)
+    )
+
+
+def test_load_gives_up_while_writes_stay_in_flight(session: Session):
+    create_users(session, 1)
+
+    with leaderboard.writing():
+        with pytest.raises(HTTPException) as error:
+            leaderboard.load(session)
+
+    assert error.value.status_code == 503
+    assert not leaderboard.loaded
+    leaderboard.load(session)
+    assert leaderboard.size() == 1
+
+
+def test_fills_revalue_other_holders_once_per_query(
+    session: Session, monkeypatch: pytest.MonkeyPatch
+):
+    event = create_market(session)
+    yes = event.outcomes[0]
+    users = create_users(session, 5)
+    leaderboard.load(session)
+    revalue = Leaderboard._revalue
+    full_passes = []
+
+    def counting_revalue(self, event_id, user_ids=None):
+        if user_ids is None:
+            full_passes.append(event_id)
+        return revalue(self, event_id, user_ids)
+
+    monkeypatch.setattr(Leaderboard, "_revalue", counting_revalue)
+    for user in users:
+        execute_bet(event.id, yes.id, 2, 1.0, session, user)
+
+    assert full_passes == []
+    leaderboard.top(NET_WORTH, 0, 5)
+    leaderboard.standing(NET_WORTH, users[0].id)
+    assert full_passes == [event.id]
+
+    # Every holder ends up valued at the last fill's price
+    session.refresh(yes)
+    for user in users:
+        session.refresh(user)
+        entry = leaderboard.standing(NET_WORTH, user.id)
+        assert entry.net_worth == pytest.approx(user.balance + 2 * yes.cost)
@@ -0,0 +1,139 @@
+from datetime import datetime
+
+import pytest
+from poly_party.api.events import settle_event
+from poly_party.config import settings
+from poly_party.market_state import MarketStateStore, market_state
+from poly_party.trading import execute_bet
+from poly_party.models import Event, Outcome, Share, User, eventType
+from sqlmodel import Session, func, select
+from tests.conftest import count_queries
+
+
+@pytest.fixture(name="event")
+def event_fixture(session: Session) -> Event:
+    event = Event(
+        title="Market",
+        description="Three way market",
+        type=eventType.MULTIPLE_CHOICE,
+        start_time=datetime.fromisoformat("2026-01-01T10:00:00"),
+        end_time=datetime.fromisoformat("2026-01-01T12:00:00"),
+        value=1,
+        outcomes=[
+            Outcome(description="A", value=0),
+            Outcome(description="B", value=1),
+            Outcome(description="C", value=2),
+        ],
+    )
+    session.add(event)
+    session.add(User(username="bettor", hashed_password="", balance=1000))
+    session.commit()
+    session.refresh(event)
+    return event
+
+
+def test_bets_keep_state_in_step_with_database(session: Session, event: Event):
+    user = session.exec(select(User)).one()
+    a, b, c = event.outcomes
+
+    execute_bet(event.id, a.id, 5, 1.0, session, user)
+    execute_bet(event.id, b.id, 3, 1.0, session, user)
+    execute_bet(event.id, a.id, 2, 1.0, session, user)
+
+    market = market_state.get(event.id, session)
+    assert market is not None
+    assert market.outcome_shares == {a.id: 7, b.id: 3, c.id: 0}
+    assert (
+        market.total_shares
+        == session.exec(select(func.sum(Share.value * Share.quantity))).one()
+    )
+
+    # A fresh load from the database agrees with the incrementally kept state
+    reloaded = MarketStateStore()
+    reloaded.load_all(session)
+    assert reloaded.get(event.id, session).outcome_shares == market.outcome_shares
+
+    # The persisted outcome costs match the in-memory prices
+    session.refresh(a)
+    assert a.cost == pytest.approx(market.prices()[a.id])
+
+
+def test_quotes_make_no_queries_once_loaded(session: Session, event: Event):
+    market_state.load_all(session)
+    outcome_id = event.outcomes[0].id
+    queries = count_queries(session)
+
+    market = market_state.get(event.id, session)
+    assert market is not None
+    quote = market.quote(outcome_id, 10_000)
+
+    assert quote.quantity == 10_000
+    assert queries == []
+
+
+def test_quotes_pick_up_other_workers_fills_once_stale(
+    session: Session, event: Event, monkeypatch
+):
+    market_state.load_all(session)
+    a = event.outcomes[0]
+    # Another worker process fills 5 shares, which only reach the counters
+    a.share_count = 5
+    session.add(a)
+    session.commit()
+    assert market_state.get(event.id, session).snapshot()[a.id] == 0
+
+    monkeypatch.setattr(settings, "market_state_ttl_seconds", 0)
+    assert market_state.peek(event.id) is None
+    assert market_state.get(event.id, session).snapshot()[a.id] == 5
+
+
+def test_sync_read_before_a_fill_is_dropped(session: Session, event: Event):
+    market_state.load_all(session)
+    market = market_state.peek(event.id)
+    a = event.outcomes[0]
+
+    fills = market.fills
+    counts = {a.id: 0}  # Read before the fill below committed
+    market.apply_fill(a.id, 3)
+    market.sync(counts, fills)
+
+    assert market.snapshot()[a.id] == 3
+
+
+def test_bet_is_recorded_as_one_fill(session: Session, event: Event):
+    user = session.exec(select(User)).one()
+    outcome_id = event.outcomes[0].id
+
+    share = execute_bet(event.id, outcome_id, 1000, 1.0, session, user)
+
+    assert session.exec(select(func.count(Share.id))).one() == 1
+    assert share.quantity == 1000
+    assert share.price == pytest.approx(share.wager / 1000)
+    assert sum(tier["quantity"] for tier in share.tiers) == 1000
+    assert user.balance == pytest.approx(1000 - share.wager)
+
+
+def test_settlement_pays_each_user_with_one_update(session: Session, event: Event):
+    bettor = session.exec(select(User)).one()
+    other = User(username="other", hashed_password="", balance=1000)
+    session.add(other)
+    session.commit()
+    winner, loser, _ = event.outcomes
+
+    execute_bet(event.id, winner.id, 4, 1.0, session, bettor)
+    execute_bet(event.id, winner.id, 6, 1.0, session, bettor)
+    execute_bet(event.id, winner.id, 2, 1.0, session, other)
+    execute_bet(event.id, loser.id, 9, 1.0, session, other)
+    balances = {user.id: user.balance for user in (bettor, other)}
+
+    queries = count_queries(session)
+    result = settle_event(event.id, winner.value, session)
+
+    assert sum("UPDATE user" in query for query in queries) == 1
+    assert result["shares_paid"] == 12
+    payouts = {payout.username: payout.amount for payout in result["payouts"]}
+    assert payouts == {"bettor": 10.0, "other": 2.0}
+    session.refresh(bettor)
+    session.refresh(other)
+    assert bettor.balance == pytest.approx(balances[bettor.id] + 10)
+    assert other.balance == pytest.approx(balances[other.id] + 2)
@@ -0,0 +1,128 @@
+import logging
+
+import pytest
+from fastapi.testclient import TestClient
+from poly_party.config import settings
+from poly_party.db import get_async_session
+from poly_party.main import app
+from poly_party.metrics import (
+    Histogram,
+    instrument_engine,
+    instrument_pool,
+    pool_connections,
+    queries_total,
+    request_duration,
+    requests_total,
+)
+from poly_party.models import User
+from poly_party.security import get_current_user
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+from sqlmodel import Session, SQLModel, create_engine, text
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+
+@pytest.fixture(name="client")
+def client_fixture(tmp_path):
+    database_path = tmp_path / "metrics.db"
+    engine = create_engine(f"sqlite:///{database_path}")
+    SQLModel.metadata.create_all(engine)
+    async_engine = create_async_engine(
+        f"sqlite+aiosqlite:///{database_path}", poolclass=NullPool
+    )
+    instrument_engine(async_engine.sync_engine)
+
+    async def get_async_session_override():
+        async with AsyncSession(async_engine, expire_on_commit=False) as session:
+            yield session
+
+    app.dependency_overrides[get_async_session] = get_async_session_override
+    app.dependency_overrides[get_current_user] = lambda: User(
+        username="testuser", id="1", hashed_password=""
+    )
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+    engine.dispose()
+
+
+def test_requests_are_counted_per_route_template(client: TestClient):
+    before = requests_total.value("GET", "/events/{event_id}", 404)
+    observed = request_duration.count("GET", "/events/{event_id}")
+    queries = queries_total.value("GET", "/events/{event_id}")
+
+    assert client.get("/events/missing").status_code == 404
+    assert client.get("/events/also-missing").status_code == 404
+
+    assert requests_total.value("GET", "/events/{event_id}", 404) == before + 2
+    assert request_duration.count("GET", "/events/{event_id}") == observed + 2
+    assert queries_total.value("GET", "/events/{event_id}") >= queries + 2
+
+
+def test_unmatched_paths_share_one_label(client: TestClient):
+    before = requests_total.value("GET", "unmatched", 404)
+
+    client.get("/no/such/route")
+
+    assert requests_total.value("GET", "unmatched", 404) == before + 1
+
+
+def test_metrics_endpoint_serves_prometheus_text(client: TestClient):
+    client.get("/events/missing")
+
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    body = response.text
+    assert "# TYPE polyparty_http_request_duration_seconds histogram" in body
+    assert (
+        'polyparty_http_requests_total{method="GET",route="/events/{event_id}",status="404"}'
+        in body
+    )
+    assert 'polyparty_db_queries_total{method="GET",route="/events/{event_id}"}' in body
+
+
+def test_slow_requests_are_logged_with_their_sql(
+    client: TestClient, monkeypatch, caplog
+):
+    monkeypatch.setattr(settings, "slow_request_ms", 0.001)
+
+    with caplog.at_level(logging.WARNING, logger="poly_party.slow_requests"):
+        client.get("/events/missing")
+
+    (record,) = caplog.records
+    assert "GET /events/missing" in record.getMessage()
+    assert "SELECT" in record.getMessage()
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = Histogram("latency", "Test latency.", ("route",), buckets=(0.1, 1.0))
+    histogram.observe(0.05, "/a")
+    histogram.observe(0.5, "/a")
+    histogram.observe(5.0, "/a")
+
+    lines = histogram.render()
+
+    assert 'latency_bucket{route="/a",le="0.1"} 1' in lines
+    assert 'latency_bucket{route="/a",le="1.0"} 2' in lines
+    assert 'latency_bucket{route="/a",le="+Inf"} 3' in lines
+    assert 'latency_count{route="/a"} 3' in lines
+
+
+def test_pool_gauge_reads_the_pool_when_scraped(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}", pool_size=3, max_overflow=0
+    )
+    instrument_pool(engine, "test")
+
+    with Session(engine) as session:
+        session.exec(text("SELECT 1"))
+        in_use = pool_connections.render()
+    idle = pool_connections.render()
+    engine.dispose()
+
+    assert 'polyparty_db_pool_connections{engine="test",state="size"} 3.0' in in_use
+    assert (
+        'polyparty_db_pool_connections{engine="test",state="checked_out"} 1.0' in in_use
+    )
+    assert 'polyparty_db_pool_connections{engine="test",state="checked_in"} 1.0' in idle
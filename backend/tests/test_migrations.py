@@ -0,0 +1,158 @@
+from datetime import datetime
+
+import pytest
+from poly_party import migrations
+from poly_party.market_state import MarketStateStore
+from poly_party.migrations import MIGRATIONS, UNSTAMPED, Migration, migrate
+from poly_party.models import Event, Outcome, Share, Token
+from sqlalchemy import inspect, text
+from sqlmodel import Session, SQLModel, create_engine, select
+
+# The schema create_all produced before migrations existed
+LEGACY_SCHEMA = """
+CREATE TABLE user (
+    username VARCHAR NOT NULL, balance FLOAT NOT NULL, icon_url VARCHAR,
+    id VARCHAR NOT NULL, hashed_password VARCHAR NOT NULL,
+    admin BOOLEAN NOT NULL, PRIMARY KEY (id)
+);
+CREATE TABLE event (
+    title VARCHAR NOT NULL, description VARCHAR NOT NULL,
+    start_time DATETIME NOT NULL, end_time DATETIME NOT NULL,
+    type VARCHAR(15) NOT NULL, value INTEGER NOT NULL,
+    first_share_bonus FLOAT NOT NULL, finalized BOOLEAN NOT NULL,
+    id VARCHAR NOT NULL, PRIMARY KEY (id)
+);
+CREATE TABLE outcome (
+    description VARCHAR NOT NULL, value INTEGER NOT NULL, cost FLOAT NOT NULL,
+    event_id VARCHAR, id VARCHAR NOT NULL, PRIMARY KEY (id),
+    FOREIGN KEY(event_id) REFERENCES event (id)
+);
+CREATE TABLE share (
+    id VARCHAR NOT NULL, timestamp DATETIME NOT NULL, value INTEGER NOT NULL,
+    wager FLOAT NOT NULL, event_id VARCHAR NOT NULL, user_id VARCHAR NOT NULL,
+    outcome_id VARCHAR NOT NULL, PRIMARY KEY (id),
+    FOREIGN KEY(event_id) REFERENCES event (id),
+    FOREIGN KEY(user_id) REFERENCES user (id),
+    FOREIGN KEY(outcome_id) REFERENCES outcome (id)
+);
+CREATE TABLE token (
+    token VARCHAR NOT NULL, used BOOLEAN NOT NULL, id VARCHAR NOT NULL,
+    PRIMARY KEY (id)
+);
+INSERT INTO user VALUES ('greg', 99.5, NULL, 'u1', '', 0);
+INSERT INTO event VALUES ('Old event', 'From before migrations',
+    '2026-01-01 10:00:00', '2026-01-01 12:00:00', 'SINGLETON', 2, 0, 0, 'e1');
+INSERT INTO outcome VALUES ('Yes', 1, 0.5, 'e1', 'o1');
+INSERT INTO outcome VALUES ('No', 0, 0.5, 'e1', 'o2');
+INSERT INTO share VALUES ('s1', '2026-01-01 10:30:00', 2, 0.5, 'e1', 'u1', 'o1');
+INSERT INTO token VALUES ('abcd', 0, 't1');
+"""
+
+
+@pytest.fixture(name="engine")
+def engine_fixture(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'migrate.db'}")
+    yield engine
+    engine.dispose()
+
+
+def index_names(engine) -> set[str]:
+    inspector = inspect(engine)
+    return {
+        index["name"]
+        for table in inspector.get_table_names()
+        for index in inspector.get_indexes(table)
+    }
+
+
+def model_index_names() -> set[str]:
+    return {
+        index.name
+        for table in SQLModel.metadata.sorted_tables
+        for index in table.indexes
+    }
+
+
+def load_legacy_schema(engine):
+    with engine.begin() as connection:
+        for statement in LEGACY_SCHEMA.split(";"):
+            if statement.strip():
+                connection.execute(text(statement))
+
+
+def test_fresh_database_gets_every_table_and_index(engine):
+    applied = migrate(engine)
+
+    assert [m.version for m in applied] == [m.version for m in MIGRATIONS]
+    assert model_index_names() <= index_names(engine)
+    # A second start has nothing left to do
+    assert migrate(engine) == []
+
+
+def test_legacy_database_is_upgraded_in_place(engine):
+    load_legacy_schema(engine)
+
+    migrate(engine)
+
+    assert model_index_names() <= index_names(engine)
+    with Session(engine) as session:
+        share = session.exec(select(Share)).one()
+        # A legacy row was a single share bought at its wager
+        assert (share.quantity, share.price, share.tiers) == (1, 0.5, [])
+
+        # Counters are backfilled from the shares already placed
+        event = session.get(Event, "e1")
+        assert (event.share_count, event.participant_count) == (2, 1)
+        assert session.get(Outcome, "o1").total_wagered == 0.5
+
+        # Tokens from before batches never expire and aren't revoked
+        token = session.get(Token, "t1")
+        assert (token.revoked, token.batch_id, token.expires_at) == (False, None, None)
+
+        store = MarketStateStore()
+        store.load_all(session)
+        assert store.get("e1", session).outcome_shares == {"o1": 2, "o2": 0}
+
+
+def test_interrupted_migrations_finish_on_the_next_run(engine):
+    load_legacy_schema(engine)
+    # What pysqlite commits of the fill and version migrations before a crash
+    with engine.begin() as connection:
+        connection.execute(
+            text("ALTER TABLE share ADD COLUMN price FLOAT NOT NULL DEFAULT 0")
+        )
+        connection.execute(
+            text(
+                "ALTER TABLE event ADD COLUMN updated_at TIMESTAMP NOT NULL "
+                f"DEFAULT '{UNSTAMPED}'"
+            )
+        )
+
+    migrate(engine)
+
+    with Session(engine) as session:
+        assert session.exec(select(Share)).one().price == 0.5
+        assert session.get(Event, "e1").updated_at > datetime(2000, 1, 1)
+
+
+def test_migration_lost_to_another_worker_is_skipped(
+    engine, monkeypatch: pytest.MonkeyPatch
+):
+    migrate(engine)
+
+    def add_column_raced(connection):
+        # The other worker adds the column and records the migration first
+        with engine.begin() as other:
+            other.execute(text("ALTER TABLE token ADD COLUMN note VARCHAR"))
+            other.execute(
+                text(
+                    "INSERT INTO schema_migrations VALUES "
+                    "(100, 'add token notes', CURRENT_TIMESTAMP)"
+                )
+            )
+        connection.execute(text("ALTER TABLE token ADD COLUMN note VARCHAR"))
+
+    raced = Migration(100, "add token notes", add_column_raced)
+    monkeypatch.setattr(migrations, "MIGRATIONS", [*MIGRATIONS, raced])
+
+    assert migrate(engine) == []
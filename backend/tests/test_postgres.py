@@ -0,0 +1,97 @@
+"""
+Multi-worker trading against a real PostgreSQL database (make test-postgres).
+
+Runs against TEST_DATABASE_URL if it's set, otherwise against a throwaway
+postgres:16 container started through testcontainers, and is skipped when
+neither is available (no Docker). The database's tables are dropped and
+recreated through the migrations.
+"""
+
+import os
+
+import pytest
+from sqlalchemy import text
+from sqlmodel import Session, SQLModel, create_engine, func, select
+from tests.workers import BETTORS, create_contended_market, run_workers
+
+
+@pytest.fixture(name="database_url", scope="module")
+def database_url_fixture():
+    url = os.environ.get("TEST_DATABASE_URL")
+    if url:
+        yield url
+        return
+    postgres = pytest.importorskip("testcontainers.postgres")
+    try:
+        container = postgres.PostgresContainer("postgres:16-alpine", driver="psycopg")
+        container.start()
+    except Exception as e:  # No Docker daemon to talk to
+        pytest.skip(f"TEST_DATABASE_URL is not set and Docker is unavailable: {e}")
+    try:
+        yield container.get_connection_url()
+    finally:
+        container.stop()
+
+
+@pytest.fixture(name="engine")
+def engine_fixture(database_url, monkeypatch):
+    from poly_party.migrations import migrate
+
+    # The worker processes build their engines from the environment
+    monkeypatch.setenv("DATABASE_URL", database_url)
+    engine = create_engine(database_url)
+
+    def drop_everything():
+        SQLModel.metadata.drop_all(engine)
+        with engine.begin() as connection:
+            connection.execute(text("DROP TABLE IF EXISTS schema_migrations"))
+
+    drop_everything()
+    migrate(engine)
+    yield engine
+    drop_everything()
+    engine.dispose()
+
+
+def test_migrations_run_once_on_postgres(engine):
+    from poly_party.migrations import MIGRATIONS, applied_versions, migrate
+
+    with engine.connect() as connection:
+        assert applied_versions(connection) == {m.version for m in MIGRATIONS}
+    assert migrate(engine) == []
+
+
+def test_workers_share_one_market(engine):
+    from poly_party.counters import verify_counters
+    from poly_party.models import Share
+    from poly_party.pricing import quote_shares
+
+    event_id, yes_id, user_ids = create_contended_market(engine, BETTORS)
+
+    # Every worker buys the same outcome, so the wagers only add up to one
+    # order of the same size if the row lock kept any worker from pricing
+    # against totals another had moved
+    spent, rejected = run_workers(event_id, yes_id, user_ids)
+
+    assert rejected == 0
+    assert spent == pytest.approx(quote_shares(0, 0, 2, BETTORS).total_cost)
+    with Session(engine) as session:
+        assert session.exec(select(func.sum(Share.quantity))).one() == BETTORS
+        assert verify_counters(session) == []
+
+
+def test_one_balance_is_never_overdrawn_by_several_workers(engine):
+    from poly_party.models import Share, User
+
+    # One user bets from every worker at once but can only afford a few
+    event_id, yes_id, (user_id,) = create_contended_market(engine, 1, balance=3.0)
+
+    spent, rejected = run_workers(event_id, yes_id, [user_id] * BETTORS)
+
+    with Session(engine) as session:
+        user = session.get(User, user_id)
+        filled = session.exec(select(func.count(Share.id))).one()
+        assert user.balance >= 0
+        assert user.balance == pytest.approx(3.0 - spent)
+        assert filled + rejected == BETTORS
+        assert 0 < filled < BETTORS
@@ -0,0 +1,124 @@
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+from poly_party.api.events import settle_event
+from poly_party.db import get_async_session
+from poly_party.main import app
+from poly_party.market_state import market_state
+from poly_party.models import Event, User
+from poly_party.price_feed import PriceFeed, Subscriber, merge_updates
+from poly_party.security import create_access_token
+from poly_party.trading import execute_bet
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+from tests.conftest import create_market
+
+
+@pytest.fixture(name="client")
+def client_fixture(session: Session):
+    async_engine = create_async_engine(
+        f"sqlite+aiosqlite:///{session.bind.url.database}", poolclass=NullPool
+    )
+
+    async def get_async_session_override():
+        async with AsyncSession(async_engine, expire_on_commit=False) as session:
+            yield session
+
+    app.dependency_overrides[get_async_session] = get_async_session_override
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+
+def create_watched_market(session: Session) -> tuple[Event, User]:
+    event = create_market(session, "Live Event")
+    bettor = User(username="bettor", hashed_password="", balance=1000)
+    session.add(bettor)
+    session.commit()
+    market_state.get(event.id, session)
+    return event, bettor
+
+
+def test_subscriber_receives_snapshot_updates_and_close(
+    client: TestClient, session: Session
+):
+    event, bettor = create_watched_market(session)
+    yes = event.outcomes[0]
+    token = create_access_token({"sub": bettor.username})
+
+    with client.websocket_connect(f"/events/ws?token={token}") as websocket:
+        websocket.send_json({"action": "subscribe", "event_id": event.id})
+        snapshot = websocket.receive_json()
+        assert snapshot["type"] == "PRICE_SNAPSHOT"
+        assert snapshot["prices"] == {o.id: 0.5 for o in event.outcomes}
+
+        execute_bet(event.id, yes.id, 2, 1.0, session, bettor)
+        execute_bet(event.id, yes.id, 3, 1.0, session, bettor)
+        volume = 0
+        while volume < 5:
+            update = websocket.receive_json()
+            assert update["type"] == "PRICE_UPDATE"
+            volume += update["volume"][yes.id]
+        assert volume == 5
+        assert update["prices"][yes.id] == 0.99
+
+        settle_event(event.id, yes.value, session)
+        assert websocket.receive_json()["type"] == "EVENT_CLOSED"
+
+
+def test_subscribing_loads_events_this_worker_has_not_seen(
+    client: TestClient, session: Session
+):
+    event, bettor = create_watched_market(session)
+    # As if another worker process had created the event
+    market_state.clear()
+    token = create_access_token({"sub": bettor.username})
+
+    with client.websocket_connect(f"/events/ws?token={token}") as websocket:
+        websocket.send_json({"action": "subscribe", "event_id": event.id})
+        snapshot = websocket.receive_json()
+        assert snapshot["type"] == "PRICE_SNAPSHOT"
+        assert snapshot["share_totals"] == {o.id: 0 for o in event.outcomes}
+
+        websocket.send_json({"action": "subscribe", "event_id": "missing"})
+        assert websocket.receive_json()["detail"] == "Event not found"
+
+
+def test_rejects_invalid_token(client: TestClient):
+    with pytest.raises(Exception):
+        with client.websocket_connect("/events/ws?token=bogus") as websocket:
+            websocket.receive_json()
+
+
+def test_slow_subscriber_only_keeps_latest_update():
+    async def scenario():
+        feed = PriceFeed(window=0)
+        subscriber = Subscriber()
+        feed.subscribe(subscriber, "event")
+        for units in range(1, 101):
+            feed._queue(
+                "event",
+                {
+                    "type": "PRICE_UPDATE",
+                    "event_id": "event",
+                    "prices": {"a": units / 100},
+                    "volume": {"a": 1},
+                },
+                immediate=True,
+            )
+        return await subscriber.next_messages()
+
+    messages = asyncio.run(scenario())
+
+    assert len(messages) == 1
+    assert messages[0]["prices"] == {"a": 1.0}
+    assert messages[0]["volume"] == {"a": 100}
+
+
+def test_close_replaces_pending_price_update():
+    update = {"type": "PRICE_UPDATE", "prices": {}, "volume": {"a": 1}}
+    closed = {"type": "EVENT_CLOSED", "winning_outcome_id": "a"}
+
+    assert merge_updates(update, closed) == closed
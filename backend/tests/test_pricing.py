@@ -0,0 +1,69 @@
+import pytest
+from poly_party.pricing import price_ladder, quote_shares
+
+
+def reference_prices(
+    outcome_shares: int, event_shares: int, num_outcomes: int, quantity: int
+):
+    # The original share-by-share loop from calculate_outcome_costs
+    prices = []
+    for _ in range(quantity):
+        if event_shares == 0:
+            price = 1.0 / num_outcomes if num_outcomes else 0.5
+        else:
+            price = outcome_shares / event_shares
+        prices.append(max(0.01, min(price, 0.99)))
+        outcome_shares += 1
+        event_shares += 1
+    return prices
+
+
+@pytest.mark.parametrize(
+    "outcome_shares,event_shares,num_outcomes,quantity",
+    [
+        (0, 0, 2, 1),
+        (0, 0, 3, 50),
+        (0, 0, 200, 5),
+        (0, 10, 2, 1),
+        (0, 500, 2, 20),  # starts pinned to the floor
+        (1, 1000, 4, 5000),  # floor, then curve
+        (3, 7, 2, 2000),  # curve, then ceiling
+        (0, 5000, 2, 1_000_000),  # floor, curve and ceiling
+        (40, 40, 2, 10),  # already pinned to the ceiling
+        (12345, 67890, 5, 250_000),
+    ],
+)
+def test_quote_matches_share_by_share_loop(
+    outcome_shares, event_shares, num_outcomes, quantity
+):
+    expected = reference_prices(outcome_shares, event_shares, num_outcomes, quantity)
+
+    quote = quote_shares(outcome_shares, event_shares, num_outcomes, quantity)
+
+    assert quote.total_cost == pytest.approx(sum(expected), rel=1e-9)
+    assert quote.marginal_price == pytest.approx(expected[0])
+    assert quote.final_price == pytest.approx(expected[-1])
+    assert sum(tier.quantity for tier in quote.tiers) == quantity
+    assert quote.prices is None
+
+
+def test_tiers_mark_clamp_breakpoints():
+    quote = quote_shares(0, 5000, 2, 1_000_000)
+
+    assert [tier.kind for tier in quote.tiers] == ["floor", "curve", "ceiling"]
+    floor, curve, ceiling = quote.tiers
+    assert curve.start == floor.quantity
+    assert ceiling.start == floor.quantity + curve.quantity
+    assert curve.start_price >= 0.01 and curve.end_price <= 0.99
+
+
+def test_price_ladder_is_opt_in():
+    quote = quote_shares(3, 10, 2, 25, include_prices=True)
+
+    assert quote.prices == pytest.approx(reference_prices(3, 10, 2, 25))
+    assert quote.prices == price_ladder(3, 10, 2, 25)
+
+
+def test_quote_rejects_empty_orders():
+    with pytest.raises(ValueError):
+        quote_shares(0, 0, 2, 0)
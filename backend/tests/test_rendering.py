@@ -0,0 +1,31 @@
+from poly_party.rendering import ResponseCache, accepts_gzip
+
+
+def test_cache_serves_only_the_current_version():
+    cache = ResponseCache(max_bytes=1024)
+    cache.put("e1", 2, b"v2")
+
+    assert cache.get("e1", 2).body == b"v2"
+    assert cache.get("e1", 3) is None
+    # A reader that rendered an older version doesn't replace the newer one
+    cache.put("e1", 1, b"v1")
+    assert cache.get("e1", 2).body == b"v2"
+
+
+def test_cache_evicts_least_recently_used_past_its_budget():
+    cache = ResponseCache(max_bytes=10)
+    cache.put("a", 1, b"aaaa")
+    cache.put("b", 1, b"bbbb")
+    cache.get("a", 1)
+    cache.put("c", 1, b"cccc")
+
+    assert cache.get("b", 1) is None
+    assert cache.get("a", 1) is not None
+    assert cache.get("c", 1) is not None
+
+
+def test_accept_encoding_parsing():
+    assert accepts_gzip("gzip, deflate, br")
+    assert accepts_gzip("br;q=1.0, *;q=0.5")
+    assert not accepts_gzip("gzip;q=0")
+    assert not accepts_gzip(None)
@@ -0,0 +1,86 @@
+from collections import defaultdict
+
+import pytest
+from poly_party.candles import RESOLUTIONS
+from poly_party.counters import verify_counters
+from poly_party.engines import engine_for
+from poly_party.models import Candle, Event, Outcome, Share, User
+from poly_party.seeding import seed
+from sqlmodel import Session, SQLModel, create_engine, func, select
+
+
+@pytest.fixture(name="engine")
+def engine_fixture(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'seeded.db'}")
+    SQLModel.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+def test_seeded_data_is_consistent(engine):
+    report = seed(engine, 20, 5, 3, 500, balance=50.0, batch_size=64)
+
+    assert (report.users, report.events, report.outcomes) == (20, 5, 15)
+    with Session(engine) as session:
+        assert session.exec(select(func.count(Share.id))).one() == report.shares
+        assert report.shares > 0
+        assert verify_counters(session) == []
+
+        spent = dict(
+            session.exec(
+                select(Share.user_id, func.sum(Share.wager)).group_by(Share.user_id)
+            ).all()
+        )
+        for user in session.exec(select(User)):
+            assert user.balance == pytest.approx(50.0 - spent.get(user.id, 0.0))
+            assert user.balance >= 0
+
+        event = session.exec(select(Event)).first()
+        outcomes = session.exec(
+            select(Outcome).where(Outcome.event_id == event.id)
+        ).all()
+        prices = engine_for(event.type).prices([o.share_count for o in outcomes], 1)
+        assert sorted(o.cost for o in outcomes) == pytest.approx(sorted(prices))
+
+
+def test_seeded_fills_are_priced_like_trades(engine):
+    seed(engine, 20, 3, 3, 300, batch_size=32)
+
+    with Session(engine) as session:
+        pricing = engine_for(session.exec(select(Event)).first().type)
+        # Seeded outcomes sit at their value's place in the event's list
+        place = {o.id: o.value for o in session.exec(select(Outcome))}
+        totals = defaultdict(lambda: [0, 0, 0])
+        for share in session.exec(select(Share).order_by(Share.timestamp)):
+            index = place[share.outcome_id]
+            quote = pricing.quote(totals[share.event_id], index, share.quantity, 1)
+            assert share.wager == pytest.approx(quote.total_cost)
+            assert share.price == pytest.approx(quote.average_price)
+            assert share.tiers == [tier.model_dump(mode="json") for tier in quote.tiers]
+            totals[share.event_id][index] += share.quantity
+
+
+def test_seeded_fills_have_candles(engine):
+    # Small batches, so candles from one batch merge with the next one's
+    seed(engine, 20, 3, 2, 300, batch_size=32)
+
+    with Session(engine) as session:
+        for outcome in session.exec(select(Outcome)):
+            for resolution in RESOLUTIONS:
+                candles = session.exec(
+                    select(Candle)
+                    .where(Candle.outcome_id == outcome.id)
+                    .where(Candle.resolution == resolution)
+                    .order_by(Candle.bucket_start)
+                ).all()
+                assert sum(c.volume for c in candles) == outcome.share_count
+                if outcome.share_count:
+                    assert candles[-1].close == pytest.approx(outcome.cost)
+
+
+def test_seeding_refuses_a_used_prefix(engine):
+    seed(engine, 2, 1, 2, 10)
+
+    with pytest.raises(ValueError):
+        seed(engine, 2, 1, 2, 10)
+    seed(engine, 2, 1, 2, 10, prefix="again")
@@ -0,0 +1,52 @@
+"""
+Multi-worker trading against one SQLite file, which has no row locks: each
+trade has to take the database's write lock before it reads the counters.
+"""
+
+import pytest
+from sqlmodel import Session, create_engine, func, select
+from tests.workers import BETTORS, create_contended_market, run_workers
+
+
+@pytest.fixture(name="engine")
+def engine_fixture(tmp_path, monkeypatch):
+    from poly_party.migrations import migrate
+
+    # The worker processes build their engines from the environment
+    url = f"sqlite:///{tmp_path / 'workers.db'}"
+    monkeypatch.setenv("DATABASE_URL", url)
+    engine = create_engine(url)
+    migrate(engine)
+    yield engine
+    engine.dispose()
+
+
+def test_workers_share_one_market(engine):
+    from poly_party.counters import verify_counters
+    from poly_party.models import Share
+    from poly_party.pricing import quote_shares
+
+    event_id, yes_id, user_ids = create_contended_market(engine, BETTORS)
+
+    spent, rejected = run_workers(event_id, yes_id, user_ids)
+
+    assert rejected == 0
+    assert spent == pytest.approx(quote_shares(0, 0, 2, BETTORS).total_cost)
+    with Session(engine) as session:
+        assert session.exec(select(func.sum(Share.quantity))).one() == BETTORS
+        assert verify_counters(session) == []
+
+
+def test_one_balance_is_never_overdrawn_by_several_workers(engine):
+    from poly_party.models import Share, User
+
+    event_id, yes_id, (user_id,) = create_contended_market(engine, 1, balance=3.0)
+
+    spent, rejected = run_workers(event_id, yes_id, [user_id] * BETTORS)
+
+    with Session(engine) as session:
+        user = session.get(User, user_id)
+        filled = session.exec(select(func.count(Share.id))).one()
+        assert user.balance == pytest.approx(3.0 - spent)
+        assert filled + rejected == BETTORS
+        assert 0 < filled < BETTORS
@@ -0,0 +1,179 @@
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+from poly_party.api import auth
+from poly_party.db import get_async_session, get_session
+from poly_party.hashing import hashing_pool
+from poly_party.main import app
+from poly_party.models import Token, User
+from poly_party.security import get_current_user
+from poly_party import tokens
+from poly_party.tokens import ALPHABET, draw_codes, mint_tokens
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+from sqlmodel import Session, SQLModel, create_engine, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+
+@pytest.fixture(name="engine")
+def engine_fixture(tmp_path):
+    database_path = tmp_path / "tokens.db"
+    engine = create_engine(f"sqlite:///{database_path}")
+    SQLModel.metadata.create_all(engine)
+    async_engine = create_async_engine(
+        f"sqlite+aiosqlite:///{database_path}", poolclass=NullPool
+    )
+
+    def get_session_override():
+        with Session(engine) as session:
+            yield session
+
+    async def get_async_session_override():
+        async with AsyncSession(async_engine, expire_on_commit=False) as session:
+            yield session
+
+    app.dependency_overrides[get_session] = get_session_override
+    app.dependency_overrides[get_async_session] = get_async_session_override
+    yield engine
+    app.dependency_overrides.clear()
+    hashing_pool.shutdown()
+    engine.dispose()
+
+
+@pytest.fixture(name="admin")
+def admin_fixture(engine):
+    app.dependency_overrides[get_current_user] = lambda: User(
+        username="admin", id="admin", hashed_password="", admin=True
+    )
+    return TestClient(app)
+
+
+def register(client: TestClient, username: str, token: str) -> int:
+    # Sent without a bearer token, so the registration token is checked
+    response = client.post(
+        "/auth/register",
+        json={"username": username, "password": "hunter2", "token": token},
+    )
+    return response.status_code
+
+
+def test_codes_are_distinct():
+    codes = draw_codes(5000, 4)
+
+    assert len(codes) == 5000
+    assert all(len(code) == 4 and set(code) <= set(ALPHABET) for code in codes)
+
+
+def test_minting_draws_again_for_codes_already_issued(
+    engine, monkeypatch: pytest.MonkeyPatch
+):
+    with Session(engine) as session:
+        issued = mint_tokens(session, 50).tokens
+    draws = [set(issued[:30]) | {"fresh1", "fresh2"}]
+
+    def draw_issued_first(count: int, length: int) -> set[str]:
+        # The first draw mostly collides, the rest are random
+        return draws.pop() if draws else draw_codes(count, length)
+
+    monkeypatch.setattr(tokens, "draw_codes", draw_issued_first)
+    with Session(engine) as session:
+        batch = mint_tokens(session, 10)
+        stored = session.exec(select(Token).where(Token.batch_id == batch.batch_id))
+
+        assert len(batch.tokens) == len(set(batch.tokens)) == 10
+        assert {"fresh1", "fresh2"} <= set(batch.tokens)
+        assert not set(batch.tokens) & set(issued)
+        assert {token.token for token in stored} == set(batch.tokens)
+
+
+def test_minting_gives_up_when_every_draw_collides(
+    engine, monkeypatch: pytest.MonkeyPatch
+):
+    with Session(engine) as session:
+        issued = set(mint_tokens(session, 5).tokens)
+    monkeypatch.setattr(tokens, "draw_codes", lambda count, length: issued)
+
+    with Session(engine) as session:
+        with pytest.raises(HTTPException) as error:
+            mint_tokens(session, 1)
+        assert error.value.status_code == 409
+        assert len(session.exec(select(Token)).all()) == 5
+
+
+def test_minted_batch_registers_until_revoked(engine, admin: TestClient):
+    response = admin.post(
+        "/auth/register/tokens",
+        json={"count": 300, "length": 6, "expires_in_minutes": 60},
+    )
+
+    assert response.status_code == 200
+    batch = response.json()
+    assert len(set(batch["tokens"])) == 300
+    assert all(len(token) == 6 for token in batch["tokens"])
+    first, second, third = batch["tokens"][:3]
+
+    revoked = admin.post("/auth/register/tokens/revoke", json={"tokens": [second]})
+    assert revoked.json() == {"revoked": 1}
+    assert register(admin, "early", first) == 200
+    assert register(admin, "late", second) == 403
+
+    revoked = admin.post(
+        "/auth/register/tokens/revoke", json={"batch_id": batch["batch_id"]}
+    )
+    # Neither the used token nor the one already revoked counts again
+    assert revoked.json() == {"revoked": 298}
+    assert register(admin, "later", third) == 403
+
+
+def test_expired_tokens_do_not_register(engine, admin: TestClient):
+    (token,) = admin.post(
+        "/auth/register/tokens", json={"count": 1, "expires_in_minutes": 5}
+    ).json()["tokens"]
+    with Session(engine) as session:
+        stored = session.exec(select(Token).where(Token.token == token)).one()
+        stored.expires_at = datetime.utcnow() - timedelta(minutes=1)
+        session.add(stored)
+        session.commit()
+
+    assert register(admin, "tardy", token) == 403
+
+
+def test_refused_hash_leaves_the_token_unused(
+    engine, admin: TestClient, monkeypatch: pytest.MonkeyPatch
+):
+    (token,) = admin.post("/auth/register/tokens", json={"count": 1}).json()["tokens"]
+
+    async def busy(password: str) -> str:
+        raise HTTPException(status_code=503, detail="Too many logins at once, try again shortly")
+
+    monkeypatch.setattr(auth, "hash_password_async", busy)
+    assert register(admin, "unlucky", token) == 503
+    monkeypatch.undo()
+
+    assert register(admin, "patient", token) == 200
+    assert register(admin, "second", token) == 403
+    with Session(engine) as session:
+        assert session.exec(select(Token).where(Token.token == token)).one().used
+
+
+def test_single_tokens_still_mint_and_survive_revocations(engine, admin: TestClient):
+    single = admin.get("/auth/register/token").json()
+    assert len(single["token"]) == 4 and single["used"] is False
+
+    # Revoking other codes leaves the single token alone
+    assert admin.post(
+        "/auth/register/tokens/revoke", json={"tokens": ["none"]}
+    ).json() == {"revoked": 0}
+    assert admin.post("/auth/register/tokens", json={"count": 1001}).status_code == 400
+    for minutes in (0, -5):
+        assert (
+            admin.post(
+                "/auth/register/tokens",
+                json={"count": 1, "expires_in_minutes": minutes},
+            ).status_code
+            == 400
+        )
+    assert admin.post("/auth/register/tokens/revoke", json={}).status_code == 400
+    assert register(admin, "single", single["token"]) == 200
@@ -0,0 +1,204 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from fastapi import HTTPException
+from poly_party.api.events import settle_event
+from poly_party.db import apply_sqlite_profile
+from poly_party.market_state import MarketStateStore, market_state
+from poly_party.models import BetLeg, Event, Outcome, Share, User
+from poly_party.pricing import quote_shares
+from poly_party.trading import execute_batch, execute_bet
+from sqlmodel import Session, SQLModel, create_engine, func, select
+from tests.conftest import create_market
+
+BETTORS = 200
+
+
+@pytest.fixture(name="engine")
+def engine_fixture(tmp_path):
+    # A real file so every thread gets its own connection, like production
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'stress.db'}",
+        connect_args={"check_same_thread": False},
+    )
+    apply_sqlite_profile(engine)
+    SQLModel.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+def seed(engine, num_events: int) -> tuple[list[Event], list[str]]:
+    with Session(engine) as session:
+        events = [create_market(session, f"Event {i}") for i in range(num_events)]
+        users = [
+            User(username=f"bettor{i}", hashed_password="") for i in range(BETTORS)
+        ]
+        session.add_all(users)
+        session.commit()
+        for event in events:
+            session.refresh(event)
+            _ = event.outcomes
+        return events, [user.id for user in users]
+
+
+def bet(engine, event_id: str, outcome_id: str, user_id: str, quantity: int = 1):
+    with Session(engine) as session:
+        user = session.get(User, user_id)
+        return execute_bet(event_id, outcome_id, quantity, 1.0, session, user).wager
+
+
+def test_concurrent_bettors_on_one_event_lose_no_updates(engine):
+    (event,), user_ids = seed(engine, 1)
+    yes = event.outcomes[0]
+
+    with ThreadPoolExecutor(max_workers=50) as pool:
+        wagers = list(
+            pool.map(lambda user_id: bet(engine, event.id, yes.id, user_id), user_ids)
+        )
+
+    # Serialized fills pay exactly what one order of the same total size costs
+    expected = quote_shares(0, 0, 2, BETTORS)
+    assert sum(wagers) == pytest.approx(expected.total_cost)
+
+    with Session(engine) as session:
+        assert session.exec(select(func.sum(Share.quantity))).one() == BETTORS
+        reloaded = MarketStateStore()
+        reloaded.load_all(session)
+        market = market_state.get(event.id, session)
+        assert market.outcome_shares == reloaded.get(event.id, session).outcome_shares
+        assert session.get(Outcome, yes.id).cost == pytest.approx(expected.next_price)
+
+
+def test_concurrent_bets_across_events_keep_balances(engine):
+    events, user_ids = seed(engine, 4)
+
+    def bet_everywhere(user_id: str):
+        return sum(
+            bet(engine, event.id, event.outcomes[i % 2].id, user_id, quantity=2)
+            for i, event in enumerate(events)
+        )
+
+    with ThreadPoolExecutor(max_workers=50) as pool:
+        spent = dict(zip(user_ids, pool.map(bet_everywhere, user_ids)))
+
+    with Session(engine) as session:
+        for user in session.exec(select(User)).all():
+            assert user.balance == pytest.approx(100 - spent[user.id])
+            wagered = session.exec(
+                select(func.sum(Share.wager)).where(Share.user_id == user.id)
+            ).one()
+            assert wagered == pytest.approx(spent[user.id])
+        assert session.exec(select(func.count(Share.id))).one() == BETTORS * 4
+
+
+def test_no_bet_fills_after_settlement(engine):
+    (event,), user_ids = seed(engine, 1)
+
+    def settle():
+        with Session(engine) as session:
+            settle_event(event.id, 1, session)
+
+    def try_bet(user_id: str):
+        try:
+            bet(engine, event.id, event.outcomes[0].id, user_id)
+        except HTTPException:
+            pass
+
+    with ThreadPoolExecutor(max_workers=50) as pool:
+        futures = [pool.submit(try_bet, user_id) for user_id in user_ids]
+        futures.insert(len(futures) // 2, pool.submit(settle))
+        for future in futures:
+            future.result()
+
+    # Every filled share was paid out: nothing slipped in after settlement
+    with Session(engine) as session:
+        shares = session.exec(select(func.sum(Share.quantity))).one() or 0
+        balances = session.exec(select(func.sum(User.balance))).one()
+        wagered = session.exec(select(func.sum(Share.wager))).one() or 0
+        assert balances == pytest.approx(100 * BETTORS - wagered + shares)
+
+
+def batch(engine, legs: list[tuple[Event, int, int]], user_id: str, limit=1.0):
+    with Session(engine) as session:
+        user = session.get(User, user_id)
+        return execute_batch(
+            [
+                BetLeg(
+                    event_id=event.id,
+                    outcome_id=event.outcomes[outcome].id,
+                    quantity=quantity,
+                    expected_price=limit,
+                )
+                for event, outcome, quantity in legs
+            ],
+            session,
+            user,
+        )
+
+
+def test_batch_costs_what_its_legs_would_in_sequence(engine):
+    (first, second), (user_id, other_id, *_) = seed(engine, 2)
+    legs = [(first, 0, 3), (second, 1, 2), (first, 0, 4), (first, 1, 1)]
+
+    shares = batch(engine, legs, user_id)
+    sequential = [
+        bet(engine, event.id, event.outcomes[outcome].id, other_id, quantity)
+        for event, outcome, quantity in legs
+    ]
+
+    # The second user's bets each priced against the first user's fills
+    assert [share.quantity for share in shares] == [3, 2, 4, 1]
+    with Session(engine) as session:
+        spent = 100 - session.get(User, user_id).balance
+        assert spent == pytest.approx(sum(share.wager for share in shares))
+        assert session.get(Event, first.id).participant_count == 2
+    assert sum(share.wager for share in shares[:3]) < sum(sequential[:3])
+
+
+def test_batch_is_all_or_nothing(engine):
+    (event,), (user_id, *_) = seed(engine, 1)
+    # Cheap enough at first, but the first leg pushes the second past its limit
+    legs = [(event, 0, 1), (event, 0, 1)]
+
+    with pytest.raises(HTTPException) as error:
+        batch(engine, legs, user_id, limit=0.6)
+
+    assert error.value.detail == "Leg 2: Price moved too much (slippage)"
+    with Session(engine) as session:
+        assert session.get(User, user_id).balance == 100
+        assert session.exec(select(func.count(Share.id))).one() == 0
+        assert market_state.get(event.id, session).total_shares == 0
+
+
+def test_crossing_batches_do_not_deadlock(engine):
+    events, user_ids = seed(engine, 2)
+    forward = [(events[0], 0, 1), (events[1], 0, 1)]
+    backward = [(events[1], 1, 1), (events[0], 1, 1)]
+
+    with ThreadPoolExecutor(max_workers=20) as pool:
+        results = list(
+            pool.map(
+                lambda i: batch(engine, forward if i % 2 else backward, user_ids[i]),
+                range(40),
+            )
+        )
+
+    assert sum(len(shares) for shares in results) == 80
+
+
+def test_bets_price_against_fills_from_other_workers(engine):
+    (event,), user_ids = seed(engine, 1)
+    yes = event.outcomes[0]
+    bet(engine, event.id, yes.id, user_ids[0])
+
+    # Another worker process fills 5 more, which this one's market never sees
+    with Session(engine) as session:
+        outcome = session.get(Outcome, yes.id)
+        outcome.share_count += 5
+        session.add(outcome)
+        session.commit()
+
+    wager = bet(engine, event.id, yes.id, user_ids[1])
+
+    assert wager == pytest.approx(quote_shares(6, 6, 2, 1).total_cost)
+    assert market_state.peek(event.id).outcome_shares[yes.id] == 7
@@ -0,0 +1,83 @@
+import pytest
+from poly_party import security
+from poly_party.api.events import settle_event
+from poly_party.models import User
+from poly_party.security import create_access_token, decode_jwt_and_get_user
+from poly_party.trading import execute_bet
+from poly_party.user_cache import TTLCache, user_cache
+from sqlmodel import Session
+from tests.conftest import count_queries, create_market
+
+
+@pytest.fixture(name="user")
+def user_fixture(session: Session) -> User:
+    user = User(username="cached", hashed_password="", balance=100)
+    session.add(user)
+    session.commit()
+    session.refresh(user)
+    return user
+
+
+def test_repeat_requests_skip_verification_and_lookup(
+    session: Session, user: User, monkeypatch
+):
+    token = create_access_token({"sub": user.username})
+    assert decode_jwt_and_get_user(token, session).id == user.id
+
+    decodes = []
+    original_decode = security.jwt.decode
+    monkeypatch.setattr(
+        security.jwt,
+        "decode",
+        lambda *a, **kw: decodes.append(a) or original_decode(*a, **kw),
+    )
+    queries = count_queries(session)
+
+    cached = decode_jwt_and_get_user(token, session)
+
+    assert cached.id == user.id
+    assert decodes == []
+    assert queries == []
+    # A snapshot, so handlers can't write through it by accident
+    assert cached not in session
+
+
+def test_bad_tokens_are_not_cached(session: Session, user: User):
+    with pytest.raises(Exception):
+        decode_jwt_and_get_user("not-a-token", session)
+    assert user_cache.token_subject("not-a-token") is None
+
+
+def test_balance_changes_invalidate_the_cached_user(session: Session, user: User):
+    event = create_market(session)
+    token = create_access_token({"sub": user.username})
+    bettor = decode_jwt_and_get_user(token, session)
+
+    share = execute_bet(event.id, event.outcomes[0].id, 10, 1.0, session, bettor)
+    after_bet = decode_jwt_and_get_user(token, session)
+    assert after_bet.balance == pytest.approx(100 - share.wager)
+
+    settle_event(event.id, 1, session)
+    after_payout = decode_jwt_and_get_user(token, session)
+    assert after_payout.balance == pytest.approx(100 - share.wager + 10)
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    cache = TTLCache(max_size=2)
+    cache.set("a", 1, ttl=60)
+    cache.set("b", 2, ttl=60)
+    cache.get("a")
+    cache.set("c", 3, ttl=60)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+
+def test_ttl_cache_expires_entries():
+    cache = TTLCache(max_size=2)
+    cache.set("gone", 1, ttl=-1)
+    cache.set("kept", 2, ttl=60)
+
+    assert cache.get("gone") is None
+    assert cache.get("kept") == 2
@@ -0,0 +1,122 @@
+import pytest
+from fastapi.testclient import TestClient
+from poly_party.api.events import settle_event
+from poly_party.db import get_async_session
+from poly_party.main import app
+from poly_party.models import User
+from poly_party.security import get_current_user
+from poly_party.trading import execute_bet
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+from tests.conftest import create_market
+
+
+@pytest.fixture(name="bettor")
+def bettor_fixture(session: Session):
+    user = User(username="bettor", hashed_password="")
+    session.add(user)
+    session.commit()
+    session.refresh(user)
+    return user
+
+
+@pytest.fixture(name="client")
+def client_fixture(session: Session, bettor: User):
+    async_engine = create_async_engine(
+        f"sqlite+aiosqlite:///{session.bind.url.database}", poolclass=NullPool
+    )
+
+    async def get_async_session_override():
+        async with AsyncSession(async_engine, expire_on_commit=False) as session:
+            yield session
+
+    app.dependency_overrides[get_async_session] = get_async_session_override
+    app.dependency_overrides[get_current_user] = lambda: User(
+        username=bettor.username, id=bettor.id, hashed_password=""
+    )
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+
+def test_portfolio_groups_fills_into_positions(
+    client: TestClient, session: Session, bettor: User
+):
+    event = create_market(session, "Held")
+    yes, no = event.outcomes
+    first = execute_bet(event.id, yes.id, 2, 1.0, session, bettor)
+    second = execute_bet(event.id, yes.id, 3, 1.0, session, bettor)
+    execute_bet(event.id, no.id, 1, 1.0, session, bettor)
+    session.refresh(yes)
+
+    items = client.get("/users/current/portfolio").json()["items"]
+
+    (position,) = [item for item in items if item["outcome_id"] == yes.id]
+    paid = first.wager + second.wager
+    assert position["event_title"] == "Held"
+    assert position["quantity"] == 5
+    assert position["cost_basis"] == pytest.approx(paid)
+    assert position["average_price"] == pytest.approx(paid / 5)
+    assert position["current_price"] == pytest.approx(yes.cost)
+    assert position["unrealized_pnl"] == pytest.approx(5 * yes.cost - paid)
+    assert len(items) == 2
+
+
+def test_portfolio_leaves_out_settled_events(
+    client: TestClient, session: Session, bettor: User
+):
+    settled = create_market(session, "Settled")
+    held = create_market(session, "Held")
+    execute_bet(settled.id, settled.outcomes[0].id, 2, 1.0, session, bettor)
+    execute_bet(held.id, held.outcomes[0].id, 1, 1.0, session, bettor)
+    settle_event(settled.id, settled.outcomes[0].value, session)
+
+    items = client.get("/users/current/portfolio").json()["items"]
+
+    assert [item["event_id"] for item in items] == [held.id]
+
+
+def test_portfolio_pages(client: TestClient, session: Session, bettor: User):
+    for i in range(3):
+        event = create_market(session, f"Event {i}")
+        execute_bet(event.id, event.outcomes[0].id, 1, 1.0, session, bettor)
+
+    first = client.get(f"/users/{bettor.id}/portfolio", params={"limit": 2}).json()
+    second = client.get(
+        f"/users/{bettor.id}/portfolio",
+        params={"limit": 2, "cursor": first["next_cursor"]},
+    ).json()
+
+    assert len(first["items"]) == 2
+    assert len(second["items"]) == 1
+    assert second["next_cursor"] is None
+    assert client.get("/users/missing/portfolio").status_code == 404
+
+
+def test_leaderboard_ranks_and_revalidates(
+    client: TestClient, session: Session, bettor: User
+):
+    rival = User(username="rival", hashed_password="", balance=150)
+    session.add(rival)
+    session.commit()
+
+    first = client.get("/users/leaderboard", headers={"Accept-Encoding": "identity"})
+    assert [e["username"] for e in first.json()["entries"]] == ["rival", "bettor"]
+    assert first.json()["total"] == 2
+    etag = first.headers["ETag"]
+    assert (
+        client.get("/users/leaderboard", headers={"If-None-Match": etag}).status_code
+        == 304
+    )
+
+    event = create_market(session, "Climb")
+    execute_bet(event.id, event.outcomes[0].id, 2, 1.0, session, bettor)
+
+    page = client.get("/users/leaderboard", headers={"If-None-Match": etag})
+    assert page.status_code == 200
+    holder = page.json()["entries"][1]
+    assert holder["net_worth"] > holder["balance"]
+    rank = client.get("/users/current/rank", params={"ranking": "balance"}).json()
+    assert (rank["rank"], rank["username"]) == (2, "bettor")
+    assert client.post("/users/leaderboard/rebuild").status_code == 403
@@ -0,0 +1,70 @@
+"""
+Trading from several worker processes at once, for the tests that check the
+database keeps them from pricing against each other's stale totals. Each
+process builds its engine from DATABASE_URL, like a server worker.
+"""
+
+import multiprocessing
+from datetime import datetime
+
+from fastapi import HTTPException
+from sqlmodel import Session
+
+WORKERS = 4
+BETTORS = 40
+
+
+def place_bets(
+    event_id: str, outcome_id: str, user_ids: list[str]
+) -> tuple[float, int]:
+    """Runs in its own process with its own market state, like a server worker."""
+    from poly_party.db import engine
+    from poly_party.models import User
+    from poly_party.trading import execute_bet
+
+    spent, rejected = 0.0, 0
+    for user_id in user_ids:
+        with Session(engine) as session:
+            user = session.get(User, user_id)
+            try:
+                spent += execute_bet(event_id, outcome_id, 1, 1.0, session, user).wager
+            except HTTPException:
+                rejected += 1
+    return spent, rejected
+
+
+def run_workers(event_id: str, outcome_id: str, user_ids: list[str]):
+    """Splits the bets over WORKERS processes placing them at the same time."""
+    chunks = [user_ids[i::WORKERS] for i in range(WORKERS)]
+    context = multiprocessing.get_context("spawn")
+    with context.Pool(WORKERS) as pool:
+        results = pool.starmap(
+            place_bets, [(event_id, outcome_id, chunk) for chunk in chunks]
+        )
+    return sum(spent for spent, _ in results), sum(rejected for _, rejected in results)
+
+
+def create_contended_market(engine, bettors: int, balance: float = 100.0):
+    from poly_party.models import Event, Outcome, User, eventType
+
+    with Session(engine) as session:
+        event = Event(
+            title="Contended",
+            description="Bet on from every worker at once",
+            type=eventType.SINGLETON,
+            start_time=datetime.fromisoformat("2026-01-01T10:00:00"),
+            end_time=datetime.fromisoformat("2026-01-01T12:00:00"),
+            value=1,
+            outcomes=[
+                Outcome(description="Yes", value=1),
+                Outcome(description="No", value=0),
+            ],
+        )
+        users = [
+            User(username=f"bettor{i}", hashed_password="", balance=balance)
+            for i in range(bettors)
+        ]
+        session.add(event)
+        session.add_all(users)
+        session.commit()
+        return event.id, event.outcomes[0].id, [user.id for user in users]
@@ -1,4 +1,4 @@
 // This file is auto-generated by @hey-api/openapi-ts
 
-export { closeEventEventsEventIdClosePost, createEventEventsCreatePost, getEventDetailsEventsEventIdGet, getEventsEventsGet, getOutcomeCostsEventsBetCostPost, getUserSharesUsersUserIdSharesGet, getUsersUsersGet, getUserUsersCurrentGet, loginAuthLoginPost, type Options, placeBetEventsBetPost, postIconUsersIconPost, registerNewTokenAuthRegisterTokenGet, registerUserAuthRegisterPost, rootGet } from './sdk.gen';
-export type { BodyCloseEventEventsEventIdClosePost, BodyLoginAuthLoginPost, BodyPlaceBetEventsBetPost, ClientOptions, CloseEventEventsEventIdClosePostData, CloseEventEventsEventIdClosePostError, CloseEventEventsEventIdClosePostErrors, CloseEventEventsEventIdClosePostResponses, CreateEventEventsCreatePostData, CreateEventEventsCreatePostError, CreateEventEventsCreatePostErrors, CreateEventEventsCreatePostResponse, CreateEventEventsCreatePostResponses, Event, EventCreate, EventReadWithShares, EventType, GetEventDetailsEventsEventIdGetData, GetEventDetailsEventsEventIdGetError, GetEventDetailsEventsEventIdGetErrors, GetEventDetailsEventsEventIdGetResponse, GetEventDetailsEventsEventIdGetResponses, GetEventsEventsGetData, GetEventsEventsGetResponse, GetEventsEventsGetResponses, GetOutcomeCostsEventsBetCostPostData, GetOutcomeCostsEventsBetCostPostError, GetOutcomeCostsEventsBetCostPostErrors, GetOutcomeCostsEventsBetCostPostResponse, GetOutcomeCostsEventsBetCostPostResponses, GetUserSharesUsersUserIdSharesGetData, GetUserSharesUsersUserIdSharesGetError, GetUserSharesUsersUserIdSharesGetErrors, GetUserSharesUsersUserIdSharesGetResponse, GetUserSharesUsersUserIdSharesGetResponses, GetUsersUsersGetData, GetUsersUsersGetResponse, GetUsersUsersGetResponses, GetUserUsersCurrentGetData, GetUserUsersCurrentGetResponse, GetUserUsersCurrentGetResponses, HttpValidationError, IconCreate, LoginAuthLoginPostData, LoginAuthLoginPostError, LoginAuthLoginPostErrors, LoginAuthLoginPostResponses, OutcomeBase, OutcomeRead, PlaceBetEventsBetPostData, PlaceBetEventsBetPostError, PlaceBetEventsBetPostErrors, PlaceBetEventsBetPostResponse, PlaceBetEventsBetPostResponses, PostIconUsersIconPostData, PostIconUsersIconPostError, PostIconUsersIconPostErrors, PostIconUsersIconPostResponse, PostIconUsersIconPostResponses, RegisterNewTokenAuthRegisterTokenGetData, RegisterNewTokenAuthRegisterTokenGetResponse, RegisterNewTokenAuthRegisterTokenGetResponses, RegisterUserAuthRegisterPostData, RegisterUserAuthRegisterPostError, RegisterUserAuthRegisterPostErrors, RegisterUserAuthRegisterPostResponse, RegisterUserAuthRegisterPostResponses, RootGetData, RootGetResponses, Share, ShareRead, TokenBase, UserCreate, UserRead, UserReadWithShares, ValidationError } from './types.gen';
+export { closeEventEventsEventIdClosePost, createEventEventsCreatePost, getCurrentPortfolioUsersCurrentPortfolioGet, getCurrentRankUsersCurrentRankGet, getEventCandlesEventsEventIdCandlesGet, getEventDetailsEventsEventIdGet, getEventsEventsGet, getEventSharesEventsEventIdSharesGet, getLeaderboardUsersLeaderboardGet, getOutcomeCostsEventsBetCostPost, getOutcomeQuotesEventsBetQuotesPost, getUserPortfolioUsersUserIdPortfolioGet, getUserSharesUsersUserIdSharesGet, getUsersUsersGet, getUserUsersCurrentGet, loginAuthLoginPost, mintRegistrationTokensAuthRegisterTokensPost, type Options, placeBetEventsBetPost, placeBetsEventsBetBatchPost, postIconUsersIconPost, rebuildEventCountersEventsCountersRebuildPost, rebuildLeaderboardUsersLeaderboardRebuildPost, registerNewTokenAuthRegisterTokenGet, registerUserAuthRegisterPost, revokeRegistrationTokensAuthRegisterTokensRevokePost, rootGet } from './sdk.gen';
+export type { BatchBetRequest, BetLeg, BodyCloseEventEventsEventIdClosePost, BodyLoginAuthLoginPost, BodyPlaceBetEventsBetPost, CandleRead, CandleSeries, ClientOptions, CloseEventEventsEventIdClosePostData, CloseEventEventsEventIdClosePostError, CloseEventEventsEventIdClosePostErrors, CloseEventEventsEventIdClosePostResponses, CounterMismatch, CounterReport, CreateEventEventsCreatePostData, CreateEventEventsCreatePostError, CreateEventEventsCreatePostErrors, CreateEventEventsCreatePostResponse, CreateEventEventsCreatePostResponses, Event, EventCreate, EventReadWithShares, EventSummary, EventSummaryPage, EventType, GetCurrentPortfolioUsersCurrentPortfolioGetData, GetCurrentPortfolioUsersCurrentPortfolioGetError, GetCurrentPortfolioUsersCurrentPortfolioGetErrors, GetCurrentPortfolioUsersCurrentPortfolioGetResponse, GetCurrentPortfolioUsersCurrentPortfolioGetResponses, GetCurrentRankUsersCurrentRankGetData, GetCurrentRankUsersCurrentRankGetError, GetCurrentRankUsersCurrentRankGetErrors, GetCurrentRankUsersCurrentRankGetResponse, GetCurrentRankUsersCurrentRankGetResponses, GetEventCandlesEventsEventIdCandlesGetData, GetEventCandlesEventsEventIdCandlesGetError, GetEventCandlesEventsEventIdCandlesGetErrors, GetEventCandlesEventsEventIdCandlesGetResponse, GetEventCandlesEventsEventIdCandlesGetResponses, GetEventDetailsEventsEventIdGetData, GetEventDetailsEventsEventIdGetError, GetEventDetailsEventsEventIdGetErrors, GetEventDetailsEventsEventIdGetResponse, GetEventDetailsEventsEventIdGetResponses, GetEventsEventsGetData, GetEventsEventsGetError, GetEventsEventsGetErrors, GetEventsEventsGetResponse, GetEventsEventsGetResponses, GetEventSharesEventsEventIdSharesGetData, GetEventSharesEventsEventIdSharesGetError, GetEventSharesEventsEventIdSharesGetErrors, GetEventSharesEventsEventIdSharesGetResponse, GetEventSharesEventsEventIdSharesGetResponses, GetLeaderboardUsersLeaderboardGetData, GetLeaderboardUsersLeaderboardGetError, GetLeaderboardUsersLeaderboardGetErrors, GetLeaderboardUsersLeaderboardGetResponse, GetLeaderboardUsersLeaderboardGetResponses, GetOutcomeCostsEventsBetCostPostData, GetOutcomeCostsEventsBetCostPostError, GetOutcomeCostsEventsBetCostPostErrors, GetOutcomeCostsEventsBetCostPostResponse, GetOutcomeCostsEventsBetCostPostResponses, GetOutcomeQuotesEventsBetQuotesPostData, GetOutcomeQuotesEventsBetQuotesPostError, GetOutcomeQuotesEventsBetQuotesPostErrors, GetOutcomeQuotesEventsBetQuotesPostResponse, GetOutcomeQuotesEventsBetQuotesPostResponses, GetUserPortfolioUsersUserIdPortfolioGetData, GetUserPortfolioUsersUserIdPortfolioGetError, GetUserPortfolioUsersUserIdPortfolioGetErrors, GetUserPortfolioUsersUserIdPortfolioGetResponse, GetUserPortfolioUsersUserIdPortfolioGetResponses, GetUserSharesUsersUserIdSharesGetData, GetUserSharesUsersUserIdSharesGetError, GetUserSharesUsersUserIdSharesGetErrors, GetUserSharesUsersUserIdSharesGetResponse, GetUserSharesUsersUserIdSharesGetResponses, GetUsersUsersGetData, GetUsersUsersGetResponse, GetUsersUsersGetResponses, GetUserUsersCurrentGetData, GetUserUsersCurrentGetResponse, GetUserUsersCurrentGetResponses, HttpValidationError, IconCreate, LeaderboardEntry, LeaderboardPage, LeaderboardRanking, LoginAuthLoginPostData, LoginAuthLoginPostError, LoginAuthLoginPostErrors, LoginAuthLoginPostResponses, MintRegistrationTokensAuthRegisterTokensPostData, MintRegistrationTokensAuthRegisterTokensPostError, MintRegistrationTokensAuthRegisterTokensPostErrors, MintRegistrationTokensAuthRegisterTokensPostResponse, MintRegistrationTokensAuthRegisterTokensPostResponses, OutcomeBase, OutcomeRead, OutcomeSummary, PlaceBetEventsBetPostData, PlaceBetEventsBetPostError, PlaceBetEventsBetPostErrors, PlaceBetEventsBetPostResponse, PlaceBetEventsBetPostResponses, PlaceBetsEventsBetBatchPostData, PlaceBetsEventsBetBatchPostError, PlaceBetsEventsBetBatchPostErrors, PlaceBetsEventsBetBatchPostResponse, PlaceBetsEventsBetBatchPostResponses, PortfolioPage, Position, PostIconUsersIconPostData, PostIconUsersIconPostError, PostIconUsersIconPostErrors, PostIconUsersIconPostResponse, PostIconUsersIconPostResponses, PriceTier, PricingEngine, QuoteRead, QuoteRequest, RebuildEventCountersEventsCountersRebuildPostData, RebuildEventCountersEventsCountersRebuildPostError, RebuildEventCountersEventsCountersRebuildPostErrors, RebuildEventCountersEventsCountersRebuildPostResponse, RebuildEventCountersEventsCountersRebuildPostResponses, RebuildLeaderboardUsersLeaderboardRebuildPostData, RebuildLeaderboardUsersLeaderboardRebuildPostResponse, RebuildLeaderboardUsersLeaderboardRebuildPostResponses, RegisterNewTokenAuthRegisterTokenGetData, RegisterNewTokenAuthRegisterTokenGetResponse, RegisterNewTokenAuthRegisterTokenGetResponses, RegisterUserAuthRegisterPostData, RegisterUserAuthRegisterPostError, RegisterUserAuthRegisterPostErrors, RegisterUserAuthRegisterPostResponse, RegisterUserAuthRegisterPostResponses, RevokeRegistrationTokensAuthRegisterTokensRevokePostData, RevokeRegistrationTokensAuthRegisterTokensRevokePostError, RevokeRegistrationTokensAuthRegisterTokensRevokePostErrors, RevokeRegistrationTokensAuthRegisterTokensRevokePostResponse, RevokeRegistrationTokensAuthRegisterTokensRevokePostResponses, RootGetData, RootGetResponses, SharePage, ShareRead, TokenBase, TokenBatch, TokenMintRequest, TokenRevokeReport, TokenRevokeRequest, UserCreate, UserRead, UserReadWithShares, ValidationError } from './types.gen';
@@ -2,7 +2,7 @@
 
 import { type Client, type Options as Options2, type TDataShape, urlSearchParamsBodySerializer } from './client';
 import { client } from './client.gen';
-import type { CloseEventEventsEventIdClosePostData, CloseEventEventsEventIdClosePostErrors, CloseEventEventsEventIdClosePostResponses, CreateEventEventsCreatePostData, CreateEventEventsCreatePostErrors, CreateEventEventsCreatePostResponses, GetEventDetailsEventsEventIdGetData, GetEventDetailsEventsEventIdGetErrors, GetEventDetailsEventsEventIdGetResponses, GetEventsEventsGetData, GetEventsEventsGetResponses, GetOutcomeCostsEventsBetCostPostData, GetOutcomeCostsEventsBetCostPostErrors, GetOutcomeCostsEventsBetCostPostResponses, GetUserSharesUsersUserIdSharesGetData, GetUserSharesUsersUserIdSharesGetErrors, GetUserSharesUsersUserIdSharesGetResponses, GetUsersUsersGetData, GetUsersUsersGetResponses, GetUserUsersCurrentGetData, GetUserUsersCurrentGetResponses, LoginAuthLoginPostData, LoginAuthLoginPostErrors, LoginAuthLoginPostResponses, PlaceBetEventsBetPostData, PlaceBetEventsBetPostErrors, PlaceBetEventsBetPostResponses, PostIconUsersIconPostData, PostIconUsersIconPostErrors, PostIconUsersIconPostResponses, RegisterNewTokenAuthRegisterTokenGetData, RegisterNewTokenAuthRegisterTokenGetResponses, RegisterUserAuthRegisterPostData, RegisterUserAuthRegisterPostErrors, RegisterUserAuthRegisterPostResponses, RootGetData, RootGetResponses } from './types.gen';
+import type { CloseEventEventsEventIdClosePostData, CloseEventEventsEventIdClosePostErrors, CloseEventEventsEventIdClosePostResponses, CreateEventEventsCreatePostData, CreateEventEventsCreatePostErrors, CreateEventEventsCreatePostResponses, GetCurrentPortfolioUsersCurrentPortfolioGetData, GetCurrentPortfolioUsersCurrentPortfolioGetErrors, GetCurrentPortfolioUsersCurrentPortfolioGetResponses, GetCurrentRankUsersCurrentRankGetData, GetCurrentRankUsersCurrentRankGetErrors, GetCurrentRankUsersCurrentRankGetResponses, GetEventCandlesEventsEventIdCandlesGetData, GetEventCandlesEventsEventIdCandlesGetErrors, GetEventCandlesEventsEventIdCandlesGetResponses, GetEventDetailsEventsEventIdGetData, GetEventDetailsEventsEventIdGetErrors, GetEventDetailsEventsEventIdGetResponses, GetEventsEventsGetData, GetEventsEventsGetErrors, GetEventsEventsGetResponses, GetEventSharesEventsEventIdSharesGetData, GetEventSharesEventsEventIdSharesGetErrors, GetEventSharesEventsEventIdSharesGetResponses, GetLeaderboardUsersLeaderboardGetData, GetLeaderboardUsersLeaderboardGetErrors, GetLeaderboardUsersLeaderboardGetResponses, GetOutcomeCostsEventsBetCostPostData, GetOutcomeCostsEventsBetCostPostErrors, GetOutcomeCostsEventsBetCostPostResponses, GetOutcomeQuotesEventsBetQuotesPostData, GetOutcomeQuotesEventsBetQuotesPostErrors, GetOutcomeQuotesEventsBetQuotesPostResponses, GetUserPortfolioUsersUserIdPortfolioGetData, GetUserPortfolioUsersUserIdPortfolioGetErrors, GetUserPortfolioUsersUserIdPortfolioGetResponses, GetUserSharesUsersUserIdSharesGetData, GetUserSharesUsersUserIdSharesGetErrors, GetUserSharesUsersUserIdSharesGetResponses, GetUsersUsersGetData, GetUsersUsersGetResponses, GetUserUsersCurrentGetData, GetUserUsersCurrentGetResponses, LoginAuthLoginPostData, LoginAuthLoginPostErrors, LoginAuthLoginPostResponses, MintRegistrationTokensAuthRegisterTokensPostData, MintRegistrationTokensAuthRegisterTokensPostErrors, MintRegistrationTokensAuthRegisterTokensPostResponses, PlaceBetEventsBetPostData, PlaceBetEventsBetPostErrors, PlaceBetEventsBetPostResponses, PlaceBetsEventsBetBatchPostData, PlaceBetsEventsBetBatchPostErrors, PlaceBetsEventsBetBatchPostResponses, PostIconUsersIconPostData, PostIconUsersIconPostErrors, PostIconUsersIconPostResponses, RebuildEventCountersEventsCountersRebuildPostData, RebuildEventCountersEventsCountersRebuildPostErrors, RebuildEventCountersEventsCountersRebuildPostResponses, RebuildLeaderboardUsersLeaderboardRebuildPostData, RebuildLeaderboardUsersLeaderboardRebuildPostResponses, RegisterNewTokenAuthRegisterTokenGetData, RegisterNewTokenAuthRegisterTokenGetResponses, RegisterUserAuthRegisterPostData, RegisterUserAuthRegisterPostErrors, RegisterUserAuthRegisterPostResponses, RevokeRegistrationTokensAuthRegisterTokensRevokePostData, RevokeRegistrationTokensAuthRegisterTokensRevokePostErrors, RevokeRegistrationTokensAuthRegisterTokensRevokePostResponses, RootGetData, RootGetResponses } from './types.gen';
 
 export type Options<TData extends TDataShape = TDataShape, ThrowOnError extends boolean = boolean> = Options2<TData, ThrowOnError> & {
     /**
@@ -40,6 +40,36 @@ export const registerNewTokenAuthRegisterTokenGet = <ThrowOnError extends boolea
     ...options
 });
 
+/**
+ * Mint Registration Tokens
+ *
+ * Issues up to 1000 tokens at once, e.g. to print invites before a party.
+ */
+export const mintRegistrationTokensAuthRegisterTokensPost = <ThrowOnError extends boolean = false>(options: Options<MintRegistrationTokensAuthRegisterTokensPostData, ThrowOnError>) => (options.client ?? client).post<MintRegistrationTokensAuthRegisterTokensPostResponses, MintRegistrationTokensAuthRegisterTokensPostErrors, ThrowOnError>({
+    security: [{ scheme: 'bearer', type: 'http' }],
+    url: '/auth/register/tokens',
+    ...options,
+    headers: {
+        'Content-Type': 'application/json',
+        ...options.headers
+    }
+});
+
+/**
+ * Revoke Registration Tokens
+ *
+ * Revokes a minted batch's unused tokens, or the listed ones.
+ */
+export const revokeRegistrationTokensAuthRegisterTokensRevokePost = <ThrowOnError extends boolean = false>(options: Options<RevokeRegistrationTokensAuthRegisterTokensRevokePostData, ThrowOnError>) => (options.client ?? client).post<RevokeRegistrationTokensAuthRegisterTokensRevokePostResponses, RevokeRegistrationTokensAuthRegisterTokensRevokePostErrors, ThrowOnError>({
+    security: [{ scheme: 'bearer', type: 'http' }],
+    url: '/auth/register/tokens/revoke',
+    ...options,
+    headers: {
+        'Content-Type': 'application/json',
+        ...options.headers
+    }
+});
+
 /**
  * Login
  */
@@ -62,6 +92,29 @@ export const getUsersUsersGet = <ThrowOnError extends boolean = false>(options?:
     ...options
 });
 
+/**
+ * Get Leaderboard
+ *
+ * `limit` users from rank `offset + 1` down, by net worth or balance, read
+ * from the in-memory rankings. Pollers get a 304 until a standing changes.
+ */
+export const getLeaderboardUsersLeaderboardGet = <ThrowOnError extends boolean = false>(options?: Options<GetLeaderboardUsersLeaderboardGetData, ThrowOnError>) => (options?.client ?? client).get<GetLeaderboardUsersLeaderboardGetResponses, GetLeaderboardUsersLeaderboardGetErrors, ThrowOnError>({
+    security: [{ scheme: 'bearer', type: 'http' }],
+    url: '/users/leaderboard',
+    ...options
+});
+
+/**
+ * Rebuild Leaderboard
+ *
+ * Reloads both rankings from the database and returns the new top.
+ */
+export const rebuildLeaderboardUsersLeaderboardRebuildPost = <ThrowOnError extends boolean = false>(options?: Options<RebuildLeaderboardUsersLeaderboardRebuildPostData, ThrowOnError>) => (options?.client ?? client).post<RebuildLeaderboardUsersLeaderboardRebuildPostResponses, unknown, ThrowOnError>({
+    security: [{ scheme: 'bearer', type: 'http' }],
+    url: '/users/leaderboard/rebuild',
+    ...options
+});
+
 /**
  * Get User Shares
  */
@@ -80,6 +133,36 @@ export const getUserUsersCurrentGet = <ThrowOnError extends boolean = false>(opt
     ...options
 });
 
+/**
+ * Get Current Rank
+ */
+export const getCurrentRankUsersCurrentRankGet = <ThrowOnError extends boolean = false>(options?: Options<GetCurrentRankUsersCurrentRankGetData, ThrowOnError>) => (options?.client ?? client).get<GetCurrentRankUsersCurrentRankGetResponses, GetCurrentRankUsersCurrentRankGetErrors, ThrowOnError>({
+    security: [{ scheme: 'bearer', type: 'http' }],
+    url: '/users/current/rank',
+    ...options
+});
+
+/**
+ * Get Current Portfolio
+ */
+export const getCurrentPortfolioUsersCurrentPortfolioGet = <ThrowOnError extends boolean = false>(options?: Options<GetCurrentPortfolioUsersCurrentPortfolioGetData, ThrowOnError>) => (options?.client ?? client).get<GetCurrentPortfolioUsersCurrentPortfolioGetResponses, GetCurrentPortfolioUsersCurrentPortfolioGetErrors, ThrowOnError>({
+    security: [{ scheme: 'bearer', type: 'http' }],
+    url: '/users/current/portfolio',
+    ...options
+});
+
+/**
+ * Get User Portfolio
+ *
+ * A user's holdings per open event and outcome, with cost basis, current
+ * price and unrealized P&L, instead of every share row they ever bought.
+ */
+export const getUserPortfolioUsersUserIdPortfolioGet = <ThrowOnError extends boolean = false>(options: Options<GetUserPortfolioUsersUserIdPortfolioGetData, ThrowOnError>) => (options.client ?? client).get<GetUserPortfolioUsersUserIdPortfolioGetResponses, GetUserPortfolioUsersUserIdPortfolioGetErrors, ThrowOnError>({
+    security: [{ scheme: 'bearer', type: 'http' }],
+    url: '/users/{user_id}/portfolio',
+    ...options
+});
+
 /**
  * Post Icon
  */
@@ -95,8 +178,12 @@ export const postIconUsersIconPost = <ThrowOnError extends boolean = false>(opti
 
 /**
  * Get Events
+ *
+ * Lists events newest first as summaries: outcomes with their current
+ * prices and share totals, plus participant counts, but no raw shares.
+ * The page's ETag covers the version of every event on it.
  */
-export const getEventsEventsGet = <ThrowOnError extends boolean = false>(options?: Options<GetEventsEventsGetData, ThrowOnError>) => (options?.client ?? client).get<GetEventsEventsGetResponses, unknown, ThrowOnError>({
+export const getEventsEventsGet = <ThrowOnError extends boolean = false>(options?: Options<GetEventsEventsGetData, ThrowOnError>) => (options?.client ?? client).get<GetEventsEventsGetResponses, GetEventsEventsGetErrors, ThrowOnError>({
     security: [{ scheme: 'bearer', type: 'http' }],
     url: '/events/',
     ...options
@@ -111,6 +198,30 @@ export const getEventDetailsEventsEventIdGet = <ThrowOnError extends boolean = f
     ...options
 });
 
+/**
+ * Get Event Shares
+ *
+ * An event's fills, oldest first, one page at a time.
+ */
+export const getEventSharesEventsEventIdSharesGet = <ThrowOnError extends boolean = false>(options: Options<GetEventSharesEventsEventIdSharesGetData, ThrowOnError>) => (options.client ?? client).get<GetEventSharesEventsEventIdSharesGetResponses, GetEventSharesEventsEventIdSharesGetErrors, ThrowOnError>({
+    security: [{ scheme: 'bearer', type: 'http' }],
+    url: '/events/{event_id}/shares',
+    ...options
+});
+
+/**
+ * Get Event Candles
+ *
+ * Price history per outcome, in `resolution`-second candles from `start`
+ * up to `end` (now by default), or the last `limit` buckets. Buckets
+ * without a fill are left out; the price held at the previous close.
+ */
+export const getEventCandlesEventsEventIdCandlesGet = <ThrowOnError extends boolean = false>(options: Options<GetEventCandlesEventsEventIdCandlesGetData, ThrowOnError>) => (options.client ?? client).get<GetEventCandlesEventsEventIdCandlesGetResponses, GetEventCandlesEventsEventIdCandlesGetErrors, ThrowOnError>({
+    security: [{ scheme: 'bearer', type: 'http' }],
+    url: '/events/{event_id}/candles',
+    ...options
+});
+
 /**
  * Create Event
  */
@@ -137,6 +248,22 @@ export const placeBetEventsBetPost = <ThrowOnError extends boolean = false>(opti
     }
 });
 
+/**
+ * Place Bets
+ *
+ * Places several bets, across outcomes or events, as one all-or-nothing
+ * transaction. Each leg has its own slippage limit, and fails the batch.
+ */
+export const placeBetsEventsBetBatchPost = <ThrowOnError extends boolean = false>(options: Options<PlaceBetsEventsBetBatchPostData, ThrowOnError>) => (options.client ?? client).post<PlaceBetsEventsBetBatchPostResponses, PlaceBetsEventsBetBatchPostErrors, ThrowOnError>({
+    security: [{ scheme: 'bearer', type: 'http' }],
+    url: '/events/bet/batch',
+    ...options,
+    headers: {
+        'Content-Type': 'application/json',
+        ...options.headers
+    }
+});
+
 /**
  * Get Outcome Costs
  */
@@ -146,6 +273,34 @@ export const getOutcomeCostsEventsBetCostPost = <ThrowOnError extends boolean =
     ...options
 });
 
+/**
+ * Get Outcome Quotes
+ *
+ * Quotes many (event, outcome, quantity) orders in one round trip. Every
+ * quote is priced independently against the current market.
+ */
+export const getOutcomeQuotesEventsBetQuotesPost = <ThrowOnError extends boolean = false>(options: Options<GetOutcomeQuotesEventsBetQuotesPostData, ThrowOnError>) => (options.client ?? client).post<GetOutcomeQuotesEventsBetQuotesPostResponses, GetOutcomeQuotesEventsBetQuotesPostErrors, ThrowOnError>({
+    security: [{ scheme: 'bearer', type: 'http' }],
+    url: '/events/bet/quotes',
+    ...options,
+    headers: {
+        'Content-Type': 'application/json',
+        ...options.headers
+    }
+});
+
+/**
+ * Rebuild Event Counters
+ *
+ * Checks every outcome's and event's share counters against the share table
+ * and, unless dry_run is set, recomputes them all from it.
+ */
+export const rebuildEventCountersEventsCountersRebuildPost = <ThrowOnError extends boolean = false>(options?: Options<RebuildEventCountersEventsCountersRebuildPostData, ThrowOnError>) => (options?.client ?? client).post<RebuildEventCountersEventsCountersRebuildPostResponses, RebuildEventCountersEventsCountersRebuildPostErrors, ThrowOnError>({
+    security: [{ scheme: 'bearer', type: 'http' }],
+    url: '/events/counters/rebuild',
+    ...options
+});
+
 /**
  * Close Event
  */
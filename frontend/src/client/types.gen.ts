@@ -4,6 +4,38 @@ export type ClientOptions = {
     baseUrl: 'http://localhost:8051' | (string & {});
 };
 
+/**
+ * BatchBetRequest
+ */
+export type BatchBetRequest = {
+    /**
+     * Legs
+     */
+    legs: Array<BetLeg>;
+};
+
+/**
+ * BetLeg
+ */
+export type BetLeg = {
+    /**
+     * Event Id
+     */
+    event_id: string;
+    /**
+     * Outcome Id
+     */
+    outcome_id: string;
+    /**
+     * Quantity
+     */
+    quantity: number;
+    /**
+     * Expected Price
+     */
+    expected_price: number;
+};
+
 /**
  * Body_close_event_events__event_id__close_post
  */
@@ -58,6 +90,100 @@ export type BodyPlaceBetEventsBetPost = {
     expected_price: number;
 };
 
+/**
+ * CandleRead
+ */
+export type CandleRead = {
+    /**
+     * Bucket Start
+     */
+    bucket_start: string;
+    /**
+     * Open
+     */
+    open: number;
+    /**
+     * High
+     */
+    high: number;
+    /**
+     * Low
+     */
+    low: number;
+    /**
+     * Close
+     */
+    close: number;
+    /**
+     * Volume
+     */
+    volume: number;
+};
+
+/**
+ * CandleSeries
+ */
+export type CandleSeries = {
+    /**
+     * Event Id
+     */
+    event_id: string;
+    /**
+     * Resolution
+     */
+    resolution: number;
+    /**
+     * Outcomes
+     */
+    outcomes?: {
+        [key: string]: Array<CandleRead>;
+    };
+};
+
+/**
+ * CounterMismatch
+ */
+export type CounterMismatch = {
+    /**
+     * Kind
+     */
+    kind: 'event' | 'outcome';
+    /**
+     * Id
+     */
+    id: string;
+    /**
+     * Event Id
+     */
+    event_id: string;
+    /**
+     * Counter
+     */
+    counter: string;
+    /**
+     * Stored
+     */
+    stored: number;
+    /**
+     * Actual
+     */
+    actual: number;
+};
+
+/**
+ * CounterReport
+ */
+export type CounterReport = {
+    /**
+     * Rebuilt
+     */
+    rebuilt: boolean;
+    /**
+     * Mismatches
+     */
+    mismatches?: Array<CounterMismatch>;
+};
+
 /**
  * Event
  */
@@ -91,10 +217,31 @@ export type Event = {
      * Finalized
      */
     finalized?: boolean;
+    pricing_engine?: PricingEngine | null;
     /**
      * Id
      */
     id?: string;
+    /**
+     * Share Count
+     */
+    share_count?: number;
+    /**
+     * Total Wagered
+     */
+    total_wagered?: number;
+    /**
+     * Participant Count
+     */
+    participant_count?: number;
+    /**
+     * Version
+     */
+    version?: number;
+    /**
+     * Updated At
+     */
+    updated_at?: string;
 };
 
 /**
@@ -130,6 +277,7 @@ export type EventCreate = {
      * Finalized
      */
     finalized?: boolean;
+    pricing_engine?: PricingEngine | null;
     /**
      * Outcomes
      */
@@ -169,10 +317,15 @@ export type EventReadWithShares = {
      * Finalized
      */
     finalized?: boolean;
+    pricing_engine?: PricingEngine | null;
     /**
      * Id
      */
     id: string;
+    /**
+     * Version
+     */
+    version?: number;
     /**
      * Outcomes
      */
@@ -183,6 +336,80 @@ export type EventReadWithShares = {
     shares?: Array<ShareRead>;
 };
 
+/**
+ * EventSummary
+ */
+export type EventSummary = {
+    /**
+     * Title
+     */
+    title: string;
+    /**
+     * Description
+     */
+    description: string;
+    /**
+     * Start Time
+     */
+    start_time: string;
+    /**
+     * End Time
+     */
+    end_time: string;
+    type: EventType;
+    /**
+     * Value
+     */
+    value: number;
+    /**
+     * First Share Bonus
+     */
+    first_share_bonus?: number;
+    /**
+     * Finalized
+     */
+    finalized?: boolean;
+    pricing_engine?: PricingEngine | null;
+    /**
+     * Id
+     */
+    id: string;
+    /**
+     * Version
+     */
+    version?: number;
+    /**
+     * Outcomes
+     */
+    outcomes?: Array<OutcomeSummary>;
+    /**
+     * Share Total
+     */
+    share_total?: number;
+    /**
+     * Total Wagered
+     */
+    total_wagered?: number;
+    /**
+     * Participant Count
+     */
+    participant_count?: number;
+};
+
+/**
+ * EventSummaryPage
+ */
+export type EventSummaryPage = {
+    /**
+     * Items
+     */
+    items?: Array<EventSummary>;
+    /**
+     * Next Cursor
+     */
+    next_cursor?: string | null;
+};
+
 /**
  * HTTPValidationError
  */
@@ -207,6 +434,47 @@ export type IconCreate = {
     random: boolean;
 };
 
+/**
+ * LeaderboardEntry
+ */
+export type LeaderboardEntry = {
+    /**
+     * Rank
+     */
+    rank: number;
+    /**
+     * User Id
+     */
+    user_id: string;
+    /**
+     * Username
+     */
+    username: string;
+    /**
+     * Balance
+     */
+    balance: number;
+    /**
+     * Net Worth
+     */
+    net_worth: number;
+};
+
+/**
+ * LeaderboardPage
+ */
+export type LeaderboardPage = {
+    ranking: LeaderboardRanking;
+    /**
+     * Total
+     */
+    total: number;
+    /**
+     * Entries
+     */
+    entries?: Array<LeaderboardEntry>;
+};
+
 /**
  * OutcomeBase
  */
@@ -256,123 +524,369 @@ export type OutcomeRead = {
 };
 
 /**
- * Share
+ * OutcomeSummary
  */
-export type Share = {
-    /**
-     * Id
-     */
-    id?: string;
+export type OutcomeSummary = {
     /**
-     * Timestamp
+     * Description
      */
-    timestamp?: string;
+    description: string;
     /**
      * Value
      */
     value: number;
     /**
-     * Wager
+     * Cost
      */
-    wager: number;
+    cost?: number;
     /**
      * Event Id
      */
-    event_id: string;
+    event_id?: string | null;
     /**
-     * User Id
+     * Id
      */
-    user_id: string;
+    id: string;
     /**
-     * Outcome Id
+     * Share Total
      */
-    outcome_id: string;
-};
-
-/**
- * ShareRead
- */
-export type ShareRead = {
+    share_total?: number;
     /**
-     * Id
+     * Total Wagered
      */
-    id?: string;
+    total_wagered?: number;
     /**
-     * Timestamp
+     * Participant Count
      */
-    timestamp?: string;
+    participant_count?: number;
+};
+
+/**
+ * PortfolioPage
+ */
+export type PortfolioPage = {
     /**
-     * Value
+     * Items
      */
-    value: number;
+    items?: Array<Position>;
     /**
-     * Wager
+     * Next Cursor
      */
-    wager: number;
+    next_cursor?: string | null;
+};
+
+/**
+ * Position
+ *
+ * A user's holding in one outcome of an open event, at its current price.
+ */
+export type Position = {
     /**
      * Event Id
      */
     event_id: string;
     /**
-     * User Id
+     * Event Title
      */
-    user_id: string;
+    event_title: string;
     /**
      * Outcome Id
      */
     outcome_id: string;
-};
-
-/**
- * TokenBase
- */
-export type TokenBase = {
     /**
-     * Token
+     * Outcome Description
      */
-    token: string;
+    outcome_description: string;
     /**
-     * Used
+     * Quantity
      */
-    used?: boolean;
-};
-
-/**
- * UserCreate
- */
-export type UserCreate = {
+    quantity: number;
     /**
-     * Username
+     * Cost Basis
      */
-    username: string;
+    cost_basis: number;
     /**
-     * Balance
+     * Average Price
      */
-    balance?: number;
+    average_price: number;
     /**
-     * Icon Url
+     * Current Price
      */
-    icon_url?: string | null;
+    current_price: number;
     /**
-     * Password
+     * Market Value
      */
-    password: string;
+    market_value: number;
     /**
-     * Token
+     * Unrealized Pnl
      */
-    token: string;
+    unrealized_pnl: number;
 };
 
 /**
- * UserRead
+ * PriceTier
  */
-export type UserRead = {
+export type PriceTier = {
     /**
-     * Username
+     * Kind
      */
-    username: string;
+    kind: 'opening' | 'floor' | 'curve' | 'ceiling';
     /**
-     * Balance
+     * Start
+     */
+    start: number;
+    /**
+     * Quantity
+     */
+    quantity: number;
+    /**
+     * Start Price
+     */
+    start_price: number;
+    /**
+     * End Price
+     */
+    end_price: number;
+    /**
+     * Cost
+     */
+    cost: number;
+};
+
+/**
+ * QuoteRead
+ */
+export type QuoteRead = {
+    /**
+     * Quantity
+     */
+    quantity: number;
+    /**
+     * Total Cost
+     */
+    total_cost: number;
+    /**
+     * Average Price
+     */
+    average_price: number;
+    /**
+     * Marginal Price
+     */
+    marginal_price: number;
+    /**
+     * Final Price
+     */
+    final_price: number;
+    /**
+     * Next Price
+     */
+    next_price: number;
+    /**
+     * Tiers
+     */
+    tiers?: Array<PriceTier>;
+    /**
+     * Prices
+     */
+    prices?: Array<number> | null;
+    /**
+     * Event Id
+     */
+    event_id: string;
+    /**
+     * Outcome Id
+     */
+    outcome_id: string;
+};
+
+/**
+ * QuoteRequest
+ */
+export type QuoteRequest = {
+    /**
+     * Event Id
+     */
+    event_id: string;
+    /**
+     * Outcome Id
+     */
+    outcome_id: string;
+    /**
+     * Quantity
+     */
+    quantity: number;
+};
+
+/**
+ * SharePage
+ */
+export type SharePage = {
+    /**
+     * Items
+     */
+    items?: Array<ShareRead>;
+    /**
+     * Next Cursor
+     */
+    next_cursor?: string | null;
+};
+
+/**
+ * ShareRead
+ */
+export type ShareRead = {
+    /**
+     * Id
+     */
+    id?: string;
+    /**
+     * Timestamp
+     */
+    timestamp?: string;
+    /**
+     * Value
+     */
+    value: number;
+    /**
+     * Quantity
+     */
+    quantity?: number;
+    /**
+     * Wager
+     */
+    wager: number;
+    /**
+     * Price
+     */
+    price: number;
+    /**
+     * Tiers
+     */
+    tiers?: Array<PriceTier>;
+    /**
+     * Event Id
+     */
+    event_id: string;
+    /**
+     * User Id
+     */
+    user_id: string;
+    /**
+     * Outcome Id
+     */
+    outcome_id: string;
+};
+
+/**
+ * TokenBase
+ */
+export type TokenBase = {
+    /**
+     * Token
+     */
+    token: string;
+    /**
+     * Used
+     */
+    used?: boolean;
+};
+
+/**
+ * TokenBatch
+ */
+export type TokenBatch = {
+    /**
+     * Batch Id
+     */
+    batch_id: string;
+    /**
+     * Expires At
+     */
+    expires_at: string | null;
+    /**
+     * Tokens
+     */
+    tokens: Array<string>;
+};
+
+/**
+ * TokenMintRequest
+ */
+export type TokenMintRequest = {
+    /**
+     * Count
+     */
+    count: number;
+    /**
+     * Length
+     */
+    length?: number | null;
+    /**
+     * Expires In Minutes
+     */
+    expires_in_minutes?: number | null;
+};
+
+/**
+ * TokenRevokeReport
+ */
+export type TokenRevokeReport = {
+    /**
+     * Revoked
+     */
+    revoked: number;
+};
+
+/**
+ * TokenRevokeRequest
+ */
+export type TokenRevokeRequest = {
+    /**
+     * Batch Id
+     */
+    batch_id?: string | null;
+    /**
+     * Tokens
+     */
+    tokens?: Array<string>;
+};
+
+/**
+ * UserCreate
+ */
+export type UserCreate = {
+    /**
+     * Username
+     */
+    username: string;
+    /**
+     * Balance
+     */
+    balance?: number;
+    /**
+     * Icon Url
+     */
+    icon_url?: string | null;
+    /**
+     * Password
+     */
+    password: string;
+    /**
+     * Token
+     */
+    token: string;
+};
+
+/**
+ * UserRead
+ */
+export type UserRead = {
+    /**
+     * Username
+     */
+    username: string;
+    /**
+     * Balance
      */
     balance?: number;
     /**
@@ -448,6 +962,16 @@ export type ValidationError = {
  */
 export type EventType = 'over/under' | 'singleton' | 'multiple-choice';
 
+/**
+ * leaderboardRanking
+ */
+export type LeaderboardRanking = 'net-worth' | 'balance';
+
+/**
+ * pricingEngine
+ */
+export type PricingEngine = 'share-ratio' | 'lmsr';
+
 export type RegisterUserAuthRegisterPostData = {
     body: UserCreate;
     path?: never;
@@ -489,6 +1013,56 @@ export type RegisterNewTokenAuthRegisterTokenGetResponses = {
 
 export type RegisterNewTokenAuthRegisterTokenGetResponse = RegisterNewTokenAuthRegisterTokenGetResponses[keyof RegisterNewTokenAuthRegisterTokenGetResponses];
 
+export type MintRegistrationTokensAuthRegisterTokensPostData = {
+    body: TokenMintRequest;
+    path?: never;
+    query?: never;
+    url: '/auth/register/tokens';
+};
+
+export type MintRegistrationTokensAuthRegisterTokensPostErrors = {
+    /**
+     * Validation Error
+     */
+    422: HttpValidationError;
+};
+
+export type MintRegistrationTokensAuthRegisterTokensPostError = MintRegistrationTokensAuthRegisterTokensPostErrors[keyof MintRegistrationTokensAuthRegisterTokensPostErrors];
+
+export type MintRegistrationTokensAuthRegisterTokensPostResponses = {
+    /**
+     * Successful Response
+     */
+    200: TokenBatch;
+};
+
+export type MintRegistrationTokensAuthRegisterTokensPostResponse = MintRegistrationTokensAuthRegisterTokensPostResponses[keyof MintRegistrationTokensAuthRegisterTokensPostResponses];
+
+export type RevokeRegistrationTokensAuthRegisterTokensRevokePostData = {
+    body: TokenRevokeRequest;
+    path?: never;
+    query?: never;
+    url: '/auth/register/tokens/revoke';
+};
+
+export type RevokeRegistrationTokensAuthRegisterTokensRevokePostErrors = {
+    /**
+     * Validation Error
+     */
+    422: HttpValidationError;
+};
+
+export type RevokeRegistrationTokensAuthRegisterTokensRevokePostError = RevokeRegistrationTokensAuthRegisterTokensRevokePostErrors[keyof RevokeRegistrationTokensAuthRegisterTokensRevokePostErrors];
+
+export type RevokeRegistrationTokensAuthRegisterTokensRevokePostResponses = {
+    /**
+     * Successful Response
+     */
+    200: TokenRevokeReport;
+};
+
+export type RevokeRegistrationTokensAuthRegisterTokensRevokePostResponse = RevokeRegistrationTokensAuthRegisterTokensRevokePostResponses[keyof RevokeRegistrationTokensAuthRegisterTokensRevokePostResponses];
+
 export type LoginAuthLoginPostData = {
     body: BodyLoginAuthLoginPost;
     path?: never;
@@ -530,6 +1104,57 @@ export type GetUsersUsersGetResponses = {
 
 export type GetUsersUsersGetResponse = GetUsersUsersGetResponses[keyof GetUsersUsersGetResponses];
 
+export type GetLeaderboardUsersLeaderboardGetData = {
+    body?: never;
+    path?: never;
+    query?: {
+        ranking?: LeaderboardRanking;
+        /**
+         * Offset
+         */
+        offset?: number;
+        /**
+         * Limit
+         */
+        limit?: number;
+    };
+    url: '/users/leaderboard';
+};
+
+export type GetLeaderboardUsersLeaderboardGetErrors = {
+    /**
+     * Validation Error
+     */
+    422: HttpValidationError;
+};
+
+export type GetLeaderboardUsersLeaderboardGetError = GetLeaderboardUsersLeaderboardGetErrors[keyof GetLeaderboardUsersLeaderboardGetErrors];
+
+export type GetLeaderboardUsersLeaderboardGetResponses = {
+    /**
+     * Successful Response
+     */
+    200: LeaderboardPage;
+};
+
+export type GetLeaderboardUsersLeaderboardGetResponse = GetLeaderboardUsersLeaderboardGetResponses[keyof GetLeaderboardUsersLeaderboardGetResponses];
+
+export type RebuildLeaderboardUsersLeaderboardRebuildPostData = {
+    body?: never;
+    path?: never;
+    query?: never;
+    url: '/users/leaderboard/rebuild';
+};
+
+export type RebuildLeaderboardUsersLeaderboardRebuildPostResponses = {
+    /**
+     * Successful Response
+     */
+    200: LeaderboardPage;
+};
+
+export type RebuildLeaderboardUsersLeaderboardRebuildPostResponse = RebuildLeaderboardUsersLeaderboardRebuildPostResponses[keyof RebuildLeaderboardUsersLeaderboardRebuildPostResponses];
+
 export type GetUserSharesUsersUserIdSharesGetData = {
     body?: never;
     path: {
@@ -576,6 +1201,106 @@ export type GetUserUsersCurrentGetResponses = {
 
 export type GetUserUsersCurrentGetResponse = GetUserUsersCurrentGetResponses[keyof GetUserUsersCurrentGetResponses];
 
+export type GetCurrentRankUsersCurrentRankGetData = {
+    body?: never;
+    path?: never;
+    query?: {
+        ranking?: LeaderboardRanking;
+    };
+    url: '/users/current/rank';
+};
+
+export type GetCurrentRankUsersCurrentRankGetErrors = {
+    /**
+     * Validation Error
+     */
+    422: HttpValidationError;
+};
+
+export type GetCurrentRankUsersCurrentRankGetError = GetCurrentRankUsersCurrentRankGetErrors[keyof GetCurrentRankUsersCurrentRankGetErrors];
+
+export type GetCurrentRankUsersCurrentRankGetResponses = {
+    /**
+     * Successful Response
+     */
+    200: LeaderboardEntry;
+};
+
+export type GetCurrentRankUsersCurrentRankGetResponse = GetCurrentRankUsersCurrentRankGetResponses[keyof GetCurrentRankUsersCurrentRankGetResponses];
+
+export type GetCurrentPortfolioUsersCurrentPortfolioGetData = {
+    body?: never;
+    path?: never;
+    query?: {
+        /**
+         * Limit
+         */
+        limit?: number;
+        /**
+         * Cursor
+         */
+        cursor?: string | null;
+    };
+    url: '/users/current/portfolio';
+};
+
+export type GetCurrentPortfolioUsersCurrentPortfolioGetErrors = {
+    /**
+     * Validation Error
+     */
+    422: HttpValidationError;
+};
+
+export type GetCurrentPortfolioUsersCurrentPortfolioGetError = GetCurrentPortfolioUsersCurrentPortfolioGetErrors[keyof GetCurrentPortfolioUsersCurrentPortfolioGetErrors];
+
+export type GetCurrentPortfolioUsersCurrentPortfolioGetResponses = {
+    /**
+     * Successful Response
+     */
+    200: PortfolioPage;
+};
+
+export type GetCurrentPortfolioUsersCurrentPortfolioGetResponse = GetCurrentPortfolioUsersCurrentPortfolioGetResponses[keyof GetCurrentPortfolioUsersCurrentPortfolioGetResponses];
+
+export type GetUserPortfolioUsersUserIdPortfolioGetData = {
+    body?: never;
+    path: {
+        /**
+         * User Id
+         */
+        user_id: string;
+    };
+    query?: {
+        /**
+         * Limit
+         */
+        limit?: number;
+        /**
+         * Cursor
+         */
+        cursor?: string | null;
+    };
+    url: '/users/{user_id}/portfolio';
+};
+
+export type GetUserPortfolioUsersUserIdPortfolioGetErrors = {
+    /**
+     * Validation Error
+     */
+    422: HttpValidationError;
+};
+
+export type GetUserPortfolioUsersUserIdPortfolioGetError = GetUserPortfolioUsersUserIdPortfolioGetErrors[keyof GetUserPortfolioUsersUserIdPortfolioGetErrors];
+
+export type GetUserPortfolioUsersUserIdPortfolioGetResponses = {
+    /**
+     * Successful Response
+     */
+    200: PortfolioPage;
+};
+
+export type GetUserPortfolioUsersUserIdPortfolioGetResponse = GetUserPortfolioUsersUserIdPortfolioGetResponses[keyof GetUserPortfolioUsersUserIdPortfolioGetResponses];
+
 export type PostIconUsersIconPostData = {
     body: IconCreate;
     path?: never;
@@ -604,17 +1329,57 @@ export type PostIconUsersIconPostResponse = PostIconUsersIconPostResponses[keyof
 export type GetEventsEventsGetData = {
     body?: never;
     path?: never;
-    query?: never;
+    query?: {
+        /**
+         * Limit
+         */
+        limit?: number;
+        /**
+         * Cursor
+         */
+        cursor?: string | null;
+        /**
+         * Finalized
+         */
+        finalized?: boolean | null;
+        /**
+         * Type
+         */
+        type?: EventType | null;
+        /**
+         * Starts After
+         */
+        starts_after?: string | null;
+        /**
+         * Starts Before
+         */
+        starts_before?: string | null;
+        /**
+         * Ends After
+         */
+        ends_after?: string | null;
+        /**
+         * Ends Before
+         */
+        ends_before?: string | null;
+    };
     url: '/events/';
 };
 
+export type GetEventsEventsGetErrors = {
+    /**
+     * Validation Error
+     */
+    422: HttpValidationError;
+};
+
+export type GetEventsEventsGetError = GetEventsEventsGetErrors[keyof GetEventsEventsGetErrors];
+
 export type GetEventsEventsGetResponses = {
     /**
-     * Response Get Events Events  Get
-     *
      * Successful Response
      */
-    200: Array<EventReadWithShares>;
+    200: EventSummaryPage;
 };
 
 export type GetEventsEventsGetResponse = GetEventsEventsGetResponses[keyof GetEventsEventsGetResponses];
@@ -649,6 +1414,96 @@ export type GetEventDetailsEventsEventIdGetResponses = {
 
 export type GetEventDetailsEventsEventIdGetResponse = GetEventDetailsEventsEventIdGetResponses[keyof GetEventDetailsEventsEventIdGetResponses];
 
+export type GetEventSharesEventsEventIdSharesGetData = {
+    body?: never;
+    path: {
+        /**
+         * Event Id
+         */
+        event_id: string;
+    };
+    query?: {
+        /**
+         * Limit
+         */
+        limit?: number;
+        /**
+         * Cursor
+         */
+        cursor?: string | null;
+    };
+    url: '/events/{event_id}/shares';
+};
+
+export type GetEventSharesEventsEventIdSharesGetErrors = {
+    /**
+     * Validation Error
+     */
+    422: HttpValidationError;
+};
+
+export type GetEventSharesEventsEventIdSharesGetError = GetEventSharesEventsEventIdSharesGetErrors[keyof GetEventSharesEventsEventIdSharesGetErrors];
+
+export type GetEventSharesEventsEventIdSharesGetResponses = {
+    /**
+     * Successful Response
+     */
+    200: SharePage;
+};
+
+export type GetEventSharesEventsEventIdSharesGetResponse = GetEventSharesEventsEventIdSharesGetResponses[keyof GetEventSharesEventsEventIdSharesGetResponses];
+
+export type GetEventCandlesEventsEventIdCandlesGetData = {
+    body?: never;
+    path: {
+        /**
+         * Event Id
+         */
+        event_id: string;
+    };
+    query?: {
+        /**
+         * Resolution
+         */
+        resolution?: number;
+        /**
+         * Outcome Id
+         */
+        outcome_id?: string | null;
+        /**
+         * Start
+         */
+        start?: string | null;
+        /**
+         * End
+         */
+        end?: string | null;
+        /**
+         * Limit
+         */
+        limit?: number;
+    };
+    url: '/events/{event_id}/candles';
+};
+
+export type GetEventCandlesEventsEventIdCandlesGetErrors = {
+    /**
+     * Validation Error
+     */
+    422: HttpValidationError;
+};
+
+export type GetEventCandlesEventsEventIdCandlesGetError = GetEventCandlesEventsEventIdCandlesGetErrors[keyof GetEventCandlesEventsEventIdCandlesGetErrors];
+
+export type GetEventCandlesEventsEventIdCandlesGetResponses = {
+    /**
+     * Successful Response
+     */
+    200: CandleSeries;
+};
+
+export type GetEventCandlesEventsEventIdCandlesGetResponse = GetEventCandlesEventsEventIdCandlesGetResponses[keyof GetEventCandlesEventsEventIdCandlesGetResponses];
+
 export type CreateEventEventsCreatePostData = {
     body: EventCreate;
     path?: never;
@@ -701,15 +1556,40 @@ export type PlaceBetEventsBetPostError = PlaceBetEventsBetPostErrors[keyof Place
 
 export type PlaceBetEventsBetPostResponses = {
     /**
-     * Response Place Bet Events Bet Post
-     *
      * Successful Response
      */
-    200: Array<Share>;
+    200: ShareRead;
 };
 
 export type PlaceBetEventsBetPostResponse = PlaceBetEventsBetPostResponses[keyof PlaceBetEventsBetPostResponses];
 
+export type PlaceBetsEventsBetBatchPostData = {
+    body: BatchBetRequest;
+    path?: never;
+    query?: never;
+    url: '/events/bet/batch';
+};
+
+export type PlaceBetsEventsBetBatchPostErrors = {
+    /**
+     * Validation Error
+     */
+    422: HttpValidationError;
+};
+
+export type PlaceBetsEventsBetBatchPostError = PlaceBetsEventsBetBatchPostErrors[keyof PlaceBetsEventsBetBatchPostErrors];
+
+export type PlaceBetsEventsBetBatchPostResponses = {
+    /**
+     * Response Place Bets Events Bet Batch Post
+     *
+     * Successful Response
+     */
+    200: Array<ShareRead>;
+};
+
+export type PlaceBetsEventsBetBatchPostResponse = PlaceBetsEventsBetBatchPostResponses[keyof PlaceBetsEventsBetBatchPostResponses];
+
 export type GetOutcomeCostsEventsBetCostPostData = {
     body?: never;
     path?: never;
@@ -726,6 +1606,10 @@ export type GetOutcomeCostsEventsBetCostPostData = {
          * Outcome Id
          */
         outcome_id: string;
+        /**
+         * Include Prices
+         */
+        include_prices?: boolean;
     };
     url: '/events/bet/cost';
 };
@@ -741,15 +1625,75 @@ export type GetOutcomeCostsEventsBetCostPostError = GetOutcomeCostsEventsBetCost
 
 export type GetOutcomeCostsEventsBetCostPostResponses = {
     /**
-     * Response Get Outcome Costs Events Bet Cost Post
-     *
      * Successful Response
      */
-    200: Array<number>;
+    200: QuoteRead;
 };
 
 export type GetOutcomeCostsEventsBetCostPostResponse = GetOutcomeCostsEventsBetCostPostResponses[keyof GetOutcomeCostsEventsBetCostPostResponses];
 
+export type GetOutcomeQuotesEventsBetQuotesPostData = {
+    body: Array<QuoteRequest>;
+    path?: never;
+    query?: {
+        /**
+         * Include Prices
+         */
+        include_prices?: boolean;
+    };
+    url: '/events/bet/quotes';
+};
+
+export type GetOutcomeQuotesEventsBetQuotesPostErrors = {
+    /**
+     * Validation Error
+     */
+    422: HttpValidationError;
+};
+
+export type GetOutcomeQuotesEventsBetQuotesPostError = GetOutcomeQuotesEventsBetQuotesPostErrors[keyof GetOutcomeQuotesEventsBetQuotesPostErrors];
+
+export type GetOutcomeQuotesEventsBetQuotesPostResponses = {
+    /**
+     * Response Get Outcome Quotes Events Bet Quotes Post
+     *
+     * Successful Response
+     */
+    200: Array<QuoteRead>;
+};
+
+export type GetOutcomeQuotesEventsBetQuotesPostResponse = GetOutcomeQuotesEventsBetQuotesPostResponses[keyof GetOutcomeQuotesEventsBetQuotesPostResponses];
+
+export type RebuildEventCountersEventsCountersRebuildPostData = {
+    body?: never;
+    path?: never;
+    query?: {
+        /**
+         * Dry Run
+         */
+        dry_run?: boolean;
+    };
+    url: '/events/counters/rebuild';
+};
+
+export type RebuildEventCountersEventsCountersRebuildPostErrors = {
+    /**
+     * Validation Error
+     */
+    422: HttpValidationError;
+};
+
+export type RebuildEventCountersEventsCountersRebuildPostError = RebuildEventCountersEventsCountersRebuildPostErrors[keyof RebuildEventCountersEventsCountersRebuildPostErrors];
+
+export type RebuildEventCountersEventsCountersRebuildPostResponses = {
+    /**
+     * Successful Response
+     */
+    200: CounterReport;
+};
+
+export type RebuildEventCountersEventsCountersRebuildPostResponse = RebuildEventCountersEventsCountersRebuildPostResponses[keyof RebuildEventCountersEventsCountersRebuildPostResponses];
+
 export type CloseEventEventsEventIdClosePostData = {
     body: BodyCloseEventEventsEventIdClosePost;
     path: {